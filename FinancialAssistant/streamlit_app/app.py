@@ -6,6 +6,8 @@ from graph.work_flow import create_workflow
 from typing import Any
 from pydantic import SecretStr
 from methods.memory_manager import MemoryManager
+from methods.warm_up import start_warm_up
+from methods.streaming import AnswerStream, streaming_from_env
 from consts.consts import (
     STATE_MESSAGES, STATE_SELECTED_PROVIDER, STATE_CONFIG,
     PROVIDER_GROQ, PROVIDER_OPENAI, PROVIDER_ANTHROPIC,
@@ -102,18 +104,36 @@ def set_api_keys():
         else:
             st.sidebar.error(MSG_ENTER_BOTH_KEYS)
 
-def get_graph_response(compiled_graph: Any, prompt: str, fmp_api_key: SecretStr, thread_id: int, user_id: str):
-    result = compiled_graph.invoke({
+def _graph_input(prompt: str, user_id: str) -> dict:
+    return {
         KEY_REQUEST: prompt,
         "user_id": user_id  # Pass the user_id in the state
-    }, config={"configurable": {
+    }
+
+def _graph_config(fmp_api_key: SecretStr, thread_id: int, user_id: str) -> dict:
+    return {"configurable": {
         "thread_id": str(thread_id),
         "user_id": user_id,  # Also pass the user_id in the config
         KEY_FMP_API_KEY: fmp_api_key,
-    }})
+    }}
+
+def get_graph_response(compiled_graph: Any, prompt: str, fmp_api_key: SecretStr, thread_id: int, user_id: str):
+    result = compiled_graph.invoke(_graph_input(prompt, user_id), config=_graph_config(fmp_api_key, thread_id, user_id))
 
     return result['final_answer']
 
+def stream_graph_response(compiled_graph: Any, prompt: str, fmp_api_key: SecretStr, thread_id: int, user_id: str):
+    """
+    Writes the answer into the current chat message as it is produced, then replaces it with the final answer.
+    """
+    stream = AnswerStream(compiled_graph, _graph_input(prompt, user_id), _graph_config(fmp_api_key, thread_id, user_id))
+    placeholder = st.empty()
+    with placeholder.container():
+        st.write_stream(stream)
+    response = stream.final_answer or "Can not provide an answer"
+    placeholder.markdown(response)
+    return response
+
 # import debugpy
 def main():
 
@@ -135,6 +155,8 @@ def main():
         if st.session_state.config:
             if 'compiled_graph' not in st.session_state:
                 llm = get_llm(st.session_state.config)
+                # Once per process: open connections and load the watchlist into the FMP cache
+                start_warm_up(llm, st.session_state.config.fmp_api_key)
                 compiled_graph = create_workflow(llm)
                 st.session_state.compiled_graph = compiled_graph
                 st.session_state.thread_id = 1
@@ -160,14 +182,24 @@ def main():
 
                 # Get and display assistant response
                 with st.chat_message(ROLE_ASSISTANT):
-                    response = get_graph_response(
-                        st.session_state.compiled_graph,
-                        prompt,
-                        st.session_state.config.fmp_api_key,
-                        st.session_state.thread_id,
-                        st.session_state.user_id
-                    )
-                    st.markdown(response)
+                    if streaming_from_env():
+                        # Tokens and report sections appear as the graph produces them
+                        response = stream_graph_response(
+                            st.session_state.compiled_graph,
+                            prompt,
+                            st.session_state.config.fmp_api_key,
+                            st.session_state.thread_id,
+                            st.session_state.user_id
+                        )
+                    else:
+                        response = get_graph_response(
+                            st.session_state.compiled_graph,
+                            prompt,
+                            st.session_state.config.fmp_api_key,
+                            st.session_state.thread_id,
+                            st.session_state.user_id
+                        )
+                        st.markdown(response)
                     st.session_state.messages.append({
                         KEY_ROLE: ROLE_ASSISTANT,
                         KEY_CONTENT: response
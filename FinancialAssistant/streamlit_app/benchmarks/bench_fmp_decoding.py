@@ -0,0 +1,84 @@
+"""
+Micro-benchmark for decoding FMP payloads.
+
+Compares the previous path (json.loads of the whole body, then Pydantic
+validation of the full rows) with the fast path used by the FMP clients
+(methods.fmp_json: orjson when available plus field projection).
+Run it from the streamlit_app directory:
+
+    python -m benchmarks.bench_fmp_decoding
+"""
+
+import json
+import timeit
+from classes.company_financials import CompanyFinancials, PROFILE_FIELDS
+from classes.income_statement import IncomeStatement, INCOME_STATEMENT_FIELDS
+from classes.stock_price import StockPrice, QUOTE_FIELDS
+from methods.fmp_json import JSON_DECODER, decode_payload
+
+REPEAT = 5
+NUMBER = 2000
+
+
+def profile_body() -> bytes:
+    """A profile response with the multi-kilobyte description FMP sends."""
+    row = {
+        "symbol": "AAPL", "companyName": "Apple Inc.", "mktCap": 3382912250000,
+        "industry": "Consumer Electronics", "sector": "Technology",
+        "website": "https://www.apple.com", "beta": 1.24, "price": 222.5,
+        "description": "Apple Inc. designs, manufactures, and markets smartphones. " * 60,
+    }
+    row.update({f"extra{i}": f"value {i}" for i in range(25)})
+    return json.dumps([row]).encode()
+
+
+def income_statement_body(years: int = 30) -> bytes:
+    """An annual income statement response with the usual ~35 fields per period."""
+    rows = []
+    for i in range(years):
+        row = {
+            "date": f"{2023 - i}-09-30", "revenue": 383285000000 - i * 1e9,
+            "grossProfit": 169148000000, "netIncome": 96995000000, "ebitda": 125820000000,
+            "eps": 6.16, "epsdiluted": 6.13, "link": "https://www.sec.gov/Archives/edgar/data/320193/",
+        }
+        row.update({f"metric{j}": 1234567.89 * j for j in range(28)})
+        rows.append(row)
+    return json.dumps(rows).encode()
+
+
+def quote_body() -> bytes:
+    """A quote response as returned by the quote-order endpoint."""
+    return json.dumps([{
+        "symbol": "AAPL", "name": "Apple Inc.", "price": 222.5, "changesPercentage": -0.1212,
+        "change": -0.27, "dayLow": 221.91, "dayHigh": 224.03, "yearHigh": 237.23,
+        "yearLow": 164.08, "marketCap": 3382912250000, "priceAvg50": 223.0692,
+        "priceAvg200": 195.382, "exchange": "NASDAQ", "volume": 35396922,
+        "avgVolume": 57548506, "open": 223.58, "previousClose": 222.77, "eps": 6.57,
+        "pe": 33.87, "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+        "sharesOutstanding": 15204100000, "timestamp": 1726257601,
+    }]).encode()
+
+
+CASES = [
+    ("profile", profile_body(), PROFILE_FIELDS, CompanyFinancials),
+    ("income-statement", income_statement_body(), INCOME_STATEMENT_FIELDS, IncomeStatement),
+    ("quote-order", quote_body(), QUOTE_FIELDS, StockPrice),
+]
+
+
+def best_of(fn) -> float:
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(fn, repeat=REPEAT, number=NUMBER)) / NUMBER * 1e6
+
+
+def main() -> None:
+    print(f"decoder: {JSON_DECODER}, best of {REPEAT} x {NUMBER} calls")
+    print(f"{'endpoint':<18}{'bytes':>8}{'before us':>12}{'after us':>12}{'speed-up':>10}")
+    for name, body, fields, model in CASES:
+        before = best_of(lambda: model(**json.loads(body)[0]))
+        after = best_of(lambda: model(**decode_payload(body, fields)[0]))
+        print(f"{name:<18}{len(body):>8}{before:>12.1f}{after:>12.1f}{before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Micro-benchmark for building the financial data models from FMP payloads.
+
+Compares the previous path (Model(**row) on every fetch) with model_construct
+and with methods.model_builder: one TypeAdapter call per batch, and reuse of
+the model built for a cached row. Run it from the streamlit_app directory:
+
+    python -m benchmarks.bench_model_construction
+"""
+
+import timeit
+from datetime import datetime
+from classes.stock_price import StockPrice
+from methods.model_builder import ModelBuilder
+
+REPEAT = 5
+BATCH_SIZE = 500
+
+ROW = {
+    "symbol": "AAPL", "price": 222.5, "volume": 35396922, "priceAvg50": 223.07,
+    "priceAvg200": 195.38, "eps": 6.57, "pe": 33.87,
+    "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+}
+ROWS = [dict(ROW, symbol=f"S{i}") for i in range(BATCH_SIZE)]
+
+
+def best_of(fn, number: int) -> float:
+    """Return the best time per call in microseconds."""
+    return min(timeit.repeat(fn, repeat=REPEAT, number=number)) / number * 1e6
+
+
+def construct(row: dict) -> StockPrice:
+    """model_construct skips validation, so the datetime has to be parsed by hand."""
+    return StockPrice.model_construct(
+        **dict(row, earningsAnnouncement=datetime.fromisoformat(row["earningsAnnouncement"]))
+    )
+
+
+def main() -> None:
+    builder = ModelBuilder(StockPrice)
+    builder.build("AAPL", ROW)
+    single = [
+        ("StockPrice(**row)", lambda: StockPrice(**ROW)),
+        ("model_construct", lambda: construct(ROW)),
+        ("builder, cache hit", lambda: builder.build("AAPL", ROW)),
+    ]
+    batch = [
+        ("StockPrice(**row) loop", lambda: [StockPrice(**row) for row in ROWS]),
+        ("model_construct loop", lambda: [construct(row) for row in ROWS]),
+        ("builder.build_many", lambda: builder.build_many(ROWS)),
+    ]
+    print(f"single quote, best of {REPEAT}")
+    for name, fn in single:
+        print(f"  {name:<26}{best_of(fn, 20000):>10.2f} us")
+    print(f"batch of {BATCH_SIZE} quotes, best of {REPEAT}")
+    for name, fn in batch:
+        print(f"  {name:<26}{best_of(fn, 50):>10.0f} us")
+
+
+if __name__ == "__main__":
+    main()
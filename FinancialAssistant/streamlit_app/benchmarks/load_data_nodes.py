@@ -0,0 +1,71 @@
+"""
+Offline load test of the financial data nodes against the FMP emulator.
+
+Starts the emulator with the given latency and fault rates, points the
+fetchers at it and runs the three report data nodes for many symbols from
+concurrent workers, then prints latency percentiles and the emulator's
+request counts. Run it from the streamlit_app directory:
+
+    python -m benchmarks.load_data_nodes --symbols 200 --workers 16 --latency-ms 80 --throttle-rate 0.01
+"""
+
+import argparse
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+from pydantic import SecretStr
+from fmp_emulator import FMPEmulator, FaultConfig
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--symbols", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rounds", type=int, default=2, help="passes over the symbols; later ones hit the cache")
+    parser.add_argument("--latency-ms", type=float, default=80.0)
+    parser.add_argument("--jitter-ms", type=float, default=40.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    faults = FaultConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, retry_after=0.5, seed=0,
+    )
+    with FMPEmulator(faults=faults) as emulator:
+        # The shared client and cache read their settings on first use
+        os.environ["FMP_BASE_URL"] = emulator.base_url
+        os.environ.setdefault("FMP_CACHE_PATH", "")
+        # The emulator has no quota; raise FMP_RATE_LIMIT_* to mimic a real plan
+        os.environ.setdefault("FMP_RATE_LIMIT_PER_MINUTE", "1000000")
+        os.environ.setdefault("FMP_RATE_LIMIT_BURST", "1000")
+        from graph.nodes.financial_data_nodes import (
+            get_stock_price_node, get_income_statement_node, get_company_financials_node
+        )
+
+        config = {"configurable": {"fmp_api_key": SecretStr("emulator")}}
+        symbols = [f"S{i:04d}" for i in range(args.symbols)]
+
+        def report(symbol: str) -> float:
+            started = time.perf_counter()
+            state = {"symbol": symbol}
+            for node in (get_stock_price_node, get_income_statement_node, get_company_financials_node):
+                node(state, config)
+            return (time.perf_counter() - started) * 1000
+
+        for round_number in range(1, args.rounds + 1):
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=args.workers) as executor:
+                latencies = np.array(list(executor.map(report, symbols)))
+            elapsed = time.perf_counter() - started
+            p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+            print(
+                f"round {round_number}: {len(symbols) / elapsed:.1f} reports/s, "
+                f"p50 {p50:.0f} ms, p95 {p95:.0f} ms, p99 {p99:.0f} ms"
+            )
+        print("emulator requests:", dict(emulator.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
+from methods.llm_cache import cached_chain
 
 """# **Chat chain**"""
 class ChatResult(BaseModel):
@@ -24,6 +25,7 @@ chat_prompt = ChatPromptTemplate.from_messages(
 def create_chat_chain(llm):
   """
   Creates a chat chain using the given LLM.
+  The response is asked for as plain text, so it can be streamed to the UI as it is generated.
   """
-  return chat_prompt | llm.with_structured_output(ChatResult)
+  return cached_chain("chat", chat_prompt, llm, ChatResult, text_field="response")
 
@@ -1,4 +1,5 @@
 from langchain_core.prompts import ChatPromptTemplate
+from methods.llm_cache import cached_chain
 from pydantic import BaseModel, Field
 from consts.consts import UNKNOWN
 
@@ -22,5 +23,5 @@ def create_extraction_chain(llm):
     """
     Creates an extraction chain using the given LLM.
     """
-    extraction_chain = extraction_prompt | llm.with_structured_output(Extraction)
+    extraction_chain = cached_chain("extraction", extraction_prompt, llm, Extraction)
     return extraction_chain
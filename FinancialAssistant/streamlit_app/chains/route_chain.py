@@ -1,13 +1,14 @@
 from pydantic import BaseModel, Field
 from typing import Literal
 from langchain_core.prompts import ChatPromptTemplate
+from methods.llm_cache import cached_chain
 
 """# **Router Chain**"""
 class RouterResult(BaseModel):
     """
     The result of the router chain.
     """
-    route: Literal['income_statement', 'report', 'company_financials', 'stock_price', "chat"] = Field(
+    route: Literal['income_statement', 'report', 'company_financials', 'stock_price', 'price_history', "chat"] = Field(
         description="LLM's decision the route to take"
     )
 
@@ -18,6 +19,7 @@ You are a highly knowledgeable Financial Assistant, designed to analyze and cate
 - **report**
 - **company_financials**
 - **stock_price**
+- **price_history**
 - **chat**
 
 If the intent isn't clear or doesn't match any specific category, use **chat**.
@@ -32,25 +34,33 @@ If there is a conversation summary available, use it to provide context for unde
    - "Show me the latest price for Microsoft."
      **stock_price**
 
-2. **Income Statement Requests**
+   Use **stock_price** for the current price; questions about performance over a period go to **price_history**.
+
+2. **Price History Requests**
+   - "How has Apple performed over the last 6 months?"
+     **price_history**
+   - "What was Tesla's return over the past two years?"
+     **price_history**
+
+3. **Income Statement Requests**
    - "What is the income statement of Apple?"
      **income_statement**
    - "Give me the gross profit of Tesla for last year."
      **income_statement**
 
-3. **Company Financials Requests**
+4. **Company Financials Requests**
    - "What are the financials for Google?"
      **company_financials**
    - "Show me Apple's financial position."
      **company_financials**
 
-4. **Report Requests**
+5. **Report Requests**
    - "Tell me about Apple's business."
      **report**
    - "Can you provide an overview of Amazon?"
      **report**
 
-5. **Chat Requests (unclear or conversational)**
+6. **Chat Requests (unclear or conversational)**
    - "What do you think of Apple?"
      **chat**
    - "Any thoughts on the tech market?"
@@ -68,4 +78,4 @@ def create_route_chain(llm):
   """
   Creates a route chain using the given LLM.
   """
-  return route_prompt | llm.with_structured_output(RouterResult)
+  return cached_chain("route", route_prompt, llm, RouterResult)
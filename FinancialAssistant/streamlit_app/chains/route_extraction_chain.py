@@ -0,0 +1,36 @@
+from pydantic import BaseModel, Field
+from typing import Literal
+from langchain_core.prompts import ChatPromptTemplate
+from methods.llm_cache import cached_chain
+from chains.route_chain import system_route
+from consts.consts import UNKNOWN
+
+"""# **Route and extraction chain**"""
+class RouteExtraction(BaseModel):
+    """
+    The result of the combined route and extraction chain.
+    """
+    route: Literal['income_statement', 'report', 'company_financials', 'stock_price', 'price_history', "chat"] = Field(
+        description="LLM's decision the route to take"
+    )
+    symbol: str = Field(description=f"The stock market symbol of the company the request is about, or {UNKNOWN}")
+    confidence: float = Field(description="How certain the symbol is, from 0 (a guess) to 1 (named in the request or summary)")
+
+system_route_extraction = system_route + f"""
+Besides the category, return the stock market symbol of the company the request is about, solely based on the user's request and the conversation summary. Do not make anything up and do not return symbols of companies the user did not ask about. When the request asks about a company mentioned in the summary ("What about their income statement?"), return that company's symbol. When you do not know the symbol, or the category is **chat**, reply {UNKNOWN} in UPPER case.
+
+Also return your confidence in the symbol, from 0 to 1: 1 when the request or the summary names the company or its symbol, lower when you are inferring it.
+"""
+
+route_extraction_prompt = ChatPromptTemplate.from_messages(
+     [
+        ("system", system_route_extraction),
+        ("human", "Conversation summary: {conversation_summary}\n\nUser request: {request}"),
+    ]
+)
+
+def create_route_extraction_chain(llm):
+  """
+  Creates a chain that routes a request and extracts its symbol in one LLM call.
+  """
+  return cached_chain("route_extraction", route_extraction_prompt, llm, RouteExtraction)
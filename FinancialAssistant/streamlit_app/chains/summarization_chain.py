@@ -7,6 +7,8 @@ It uses a specialized prompt to generate concise summaries of financial conversa
 
 from pydantic import BaseModel, Field
 from langchain_core.prompts import ChatPromptTemplate
+from methods.llm_cache import cached_chain
+from consts.consts import SUMMARY_MAX_TOKENS
 
 
 class SummarizationResult(BaseModel):
@@ -16,12 +18,13 @@ class SummarizationResult(BaseModel):
     summary: str = Field(description="Summarized conversation")
 
 
-def create_summarization_chain(llm):
+def create_summarization_chain(llm, max_words: int = SUMMARY_MAX_TOKENS * 3 // 5):
     """
     Creates a chain for summarizing conversations using the modern chain approach.
 
     Args:
         llm: The language model to use for summarization
+        max_words: Length the summary is asked to stay under
 
     Returns:
         A chain that takes conversation and existing summary as input and returns a summary
@@ -39,6 +42,8 @@ def create_summarization_chain(llm):
 
     The conversation will include metadata about the request type and any financial symbols involved.
     This information is important to include in your summary.
+
+    Keep the summary under {max_words} words; when it would be longer, shorten the oldest details first.
     """
 
     summarization_prompt = ChatPromptTemplate.from_messages(
@@ -46,7 +51,7 @@ def create_summarization_chain(llm):
             ("system", system_template),
             ("human", "Previous summary: <previous_summary>{existing_summary}</previous_summary>\n\nConversation:\n<conversation>\n{conversation}\n</conversation>\n\nProvide an updated summary that incorporates both the previous summary and this new conversation. Focus on financial symbols, request types, and specific data that was provided.")
         ]
-    )
+    ).partial(max_words=str(max_words))
 
-    # Create the chain using the pipe operator
-    return summarization_prompt | llm.with_structured_output(SummarizationResult)
+    # Create the chain, served from the LLM cache when it is enabled for summaries
+    return cached_chain("summarization", summarization_prompt, llm, SummarizationResult)
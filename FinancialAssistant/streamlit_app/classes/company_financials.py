@@ -1,6 +1,12 @@
 from pydantic import BaseModel, Field, SecretStr
+import httpx
 import requests
 from typing import Union
+from consts.consts import FMP_ENDPOINT_PROFILE, PRIORITY_INTERACTIVE
+from methods.fmp_cache import get_fmp_cache
+from methods.fmp_client import get_fmp_client, get_async_fmp_client
+from methods.fmp_json import payload_fields
+from methods.model_builder import ModelBuilder
 
 class CompanyFinancials(BaseModel):
     """
@@ -15,20 +21,38 @@ class CompanyFinancials(BaseModel):
     beta:float = Field(description="The beta of the company")
     price:float = Field(description="The price of the company")
 
-def get_company_financials(symbol, api_key: SecretStr) -> Union[CompanyFinancials, None]:
+# Only these keys are kept from the profile payload, which also carries a long description
+PROFILE_FIELDS = payload_fields(CompanyFinancials)
+COMPANY_FINANCIALS_BUILDER = ModelBuilder(CompanyFinancials)
+
+def get_company_financials(symbol, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[CompanyFinancials, None]:
     """
     Fetch basic financial information for the given company symbol such as the industry, the sector, the name of the company, and the market capitalization.
     """
     try:
-      url = f"https://financialmodelingprep.com/api/v3/profile/{symbol}?apikey={api_key.get_secret_value()}"
-      response = requests.get(url)
-      data = response.json()
-      financials = CompanyFinancials(**data[0])
+      data = get_fmp_cache().get_or_fetch(
+        FMP_ENDPOINT_PROFILE, symbol,
+        lambda: get_fmp_client().get_json(f"{FMP_ENDPOINT_PROFILE}/{symbol}", api_key, priority=priority, fields=PROFILE_FIELDS))
+      financials = COMPANY_FINANCIALS_BUILDER.build(symbol.upper(), data[0])
       return financials
-    except (IndexError, KeyError):
+    except (IndexError, KeyError, requests.RequestException):
+        print ("Error:",f"Could not fetch financials for symbol: {symbol}")
+        return None
+
+async def aget_company_financials(symbol, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[CompanyFinancials, None]:
+    """
+    Async variant of get_company_financials that does not block a worker thread on network I/O.
+    """
+    try:
+      data = await get_fmp_cache().aget_or_fetch(
+        FMP_ENDPOINT_PROFILE, symbol,
+        lambda: get_async_fmp_client().get_json(f"{FMP_ENDPOINT_PROFILE}/{symbol}", api_key, priority=priority, fields=PROFILE_FIELDS))
+      return COMPANY_FINANCIALS_BUILDER.build(symbol.upper(), data[0])
+    except (IndexError, KeyError, httpx.HTTPError):
         print ("Error:",f"Could not fetch financials for symbol: {symbol}")
         return None
 
+
 ## DATA PROVIDED BY THIS ENDPOINT:
 # [{'symbol': 'AAPL',
 #   'price': 222.5,
@@ -1,7 +1,13 @@
 from pydantic import BaseModel, Field, SecretStr
 from datetime import date
+import httpx
 import requests
-from typing import Union
+from typing import Any, Union
+from consts.consts import FMP_ENDPOINT_INCOME_STATEMENT, FMP_PERIOD_ANNUAL, PRIORITY_INTERACTIVE
+from methods.fmp_cache import get_fmp_cache
+from methods.fmp_client import get_fmp_client, get_async_fmp_client
+from methods.fmp_json import payload_fields
+from methods.model_builder import ModelBuilder
 class IncomeStatement(BaseModel):
     date_field: date = Field(alias='date', description="The date of the income statement")
     revenue:float = Field(description="The revenue of the company")
@@ -11,21 +17,58 @@ class IncomeStatement(BaseModel):
     eps:float = Field(description="The EPS of the company")
     eps_diluted:float = Field(alias='epsdiluted', description="The EPS diluted of the company")
 
+# Every period is kept for the history, but only with the fields the model reads
+INCOME_STATEMENT_FIELDS = payload_fields(IncomeStatement)
+INCOME_STATEMENT_BUILDER = ModelBuilder(IncomeStatement)
 
-def get_income_statement(symbol:str, api_key:SecretStr) -> Union[IncomeStatement, None]:
+def fetch_income_statement_payload(symbol:str, api_key:SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Any:
+    """
+    Return every annual period FMP has for the symbol, served from the shared cache when possible.
+    """
+    return get_fmp_cache().get_or_fetch(
+      FMP_ENDPOINT_INCOME_STATEMENT, symbol,
+      lambda: get_fmp_client().get_json(
+        f"{FMP_ENDPOINT_INCOME_STATEMENT}/{symbol}", api_key,
+        params={"period": FMP_PERIOD_ANNUAL}, priority=priority,
+        fields=INCOME_STATEMENT_FIELDS),
+      period=FMP_PERIOD_ANNUAL)
+
+async def afetch_income_statement_payload(symbol:str, api_key:SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Any:
+    """
+    Async variant of fetch_income_statement_payload.
+    """
+    return await get_fmp_cache().aget_or_fetch(
+      FMP_ENDPOINT_INCOME_STATEMENT, symbol,
+      lambda: get_async_fmp_client().get_json(
+        f"{FMP_ENDPOINT_INCOME_STATEMENT}/{symbol}", api_key,
+        params={"period": FMP_PERIOD_ANNUAL}, priority=priority,
+        fields=INCOME_STATEMENT_FIELDS),
+      period=FMP_PERIOD_ANNUAL)
+
+def get_income_statement(symbol:str, api_key:SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[IncomeStatement, None]:
     """
     Fetch last income statement for the given company symbol such as revenue, gross profit, net income, EBITDA, EPS.
     """
     try:
-      url = f"https://financialmodelingprep.com/api/v3/income-statement/{symbol}?period=annual&apikey={api_key.get_secret_value()}"
-      response = requests.get(url)
-      data = response.json()
-      financials = IncomeStatement(**data[0])
+      data = fetch_income_statement_payload(symbol, api_key, priority)
+      financials = INCOME_STATEMENT_BUILDER.build(symbol.upper(), data[0])
       return financials
-    except (IndexError, KeyError):
+    except (IndexError, KeyError, requests.RequestException):
         print ("Error:",f"Could not fetch financials for symbol: {symbol}")
         return None
 
+async def aget_income_statement(symbol:str, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[IncomeStatement, None]:
+    """
+    Async variant of get_income_statement that does not block a worker thread on network I/O.
+    """
+    try:
+      data = await afetch_income_statement_payload(symbol, api_key, priority)
+      return INCOME_STATEMENT_BUILDER.build(symbol.upper(), data[0])
+    except (IndexError, KeyError, httpx.HTTPError):
+        print ("Error:",f"Could not fetch financials for symbol: {symbol}")
+        return None
+
+
 ## DATA PROVIDED BY THIS ENDPOINT:
 # {'date': '2023-09-30',
 #   'symbol': 'AAPL',
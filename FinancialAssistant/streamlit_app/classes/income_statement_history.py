@@ -0,0 +1,174 @@
+import httpx
+import numpy as np
+import requests
+from pydantic import SecretStr
+from typing import Any, Optional, Union
+from classes.income_statement import IncomeStatement, fetch_income_statement_payload, afetch_income_statement_payload
+from consts.consts import PRIORITY_INTERACTIVE
+
+# FMP payload keys of the fields kept per period, mapped to the IncomeStatement field names
+HISTORY_FIELDS = {
+    'revenue': 'revenue',
+    'grossProfit': 'gross_profit',
+    'netIncome': 'net_income',
+    'ebitda': 'ebitda',
+    'eps': 'eps',
+    'epsdiluted': 'eps_diluted',
+}
+DAYS_PER_YEAR = 365.25
+TREND_FLAT_THRESHOLD = 0.01  # annual rate below which a trend is reported as flat
+
+
+class IncomeStatementHistory:
+    """
+    All periods of a company's income statements stored column by column.
+
+    Dates are kept as a datetime64[D] array in ascending order and every field is a
+    float64 array aligned with it, so analytics are computed with vectorized NumPy
+    operations. Missing values are stored as NaN.
+    """
+
+    def __init__(self, symbol: str, dates: np.ndarray, columns: dict[str, np.ndarray]):
+        order = np.argsort(dates)
+        self.symbol = symbol
+        self.dates = dates[order]
+        self.columns = {name: values[order] for name, values in columns.items()}
+
+    @classmethod
+    def from_payload(cls, symbol: str, rows: list[dict[str, Any]]) -> "IncomeStatementHistory":
+        """
+        Build the history from the rows returned by the FMP income-statement endpoint.
+        """
+        rows = [row for row in rows if row.get('date')]
+        dates = np.array([row['date'] for row in rows], dtype='datetime64[D]')
+        columns = {
+            name: np.array([np.nan if row.get(key) is None else row[key] for row in rows], dtype=np.float64)
+            for key, name in HISTORY_FIELDS.items()
+        }
+        return cls(symbol, dates, columns)
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def latest(self) -> IncomeStatement:
+        """
+        Return the most recent period as an IncomeStatement.
+        """
+        values = {name: float(column[-1]) for name, column in self.columns.items()}
+        return IncomeStatement(date=self.dates[-1].item(), **{
+            key: values[name] for key, name in HISTORY_FIELDS.items()
+        })
+
+    def years(self) -> np.ndarray:
+        """
+        Return the time of every period in years since the first one.
+        """
+        return (self.dates - self.dates[0]).astype(np.float64) / DAYS_PER_YEAR
+
+    def yoy_growth(self, field: str) -> np.ndarray:
+        """
+        Return the period-over-period growth of a field; the first period is NaN.
+        Growth from a zero or negative base is undefined and reported as NaN.
+        """
+        values = self.columns[field]
+        growth = np.full(values.shape, np.nan)
+        previous = values[:-1]
+        np.divide(values[1:] - previous, previous, out=growth[1:], where=previous > 0)
+        return growth
+
+    def margin(self, field: str) -> np.ndarray:
+        """
+        Return a field as a fraction of revenue for every period.
+        """
+        revenue = self.columns['revenue']
+        margins = np.full(revenue.shape, np.nan)
+        np.divide(self.columns[field], revenue, out=margins, where=revenue > 0)
+        return margins
+
+    def cagr(self, field: str) -> float:
+        """
+        Return the compound annual growth rate of a field from the first to the last period.
+        """
+        values = self.columns[field]
+        span = self.years()[-1] if len(self) else 0.0
+        if span <= 0 or not (values[0] > 0 and values[-1] > 0):
+            return float('nan')
+        return float((values[-1] / values[0]) ** (1.0 / span) - 1.0)
+
+    def trend(self, field: str) -> float:
+        """
+        Return the annual growth rate of a log-linear fit over all positive periods.
+        """
+        values = self.columns[field]
+        positive = values > 0
+        if positive.sum() < 2:
+            return float('nan')
+        slope = np.polyfit(self.years()[positive], np.log(values[positive]), 1)[0]
+        return float(np.expm1(slope))
+
+    def summary(self) -> Optional[dict[str, Any]]:
+        """
+        Return the headline analytics used by the reports, or None with fewer than two periods.
+        """
+        if len(self) < 2:
+            return None
+        return {
+            'first_date': self.dates[0].item(),
+            'last_date': self.dates[-1].item(),
+            'periods': len(self),
+            'revenue_growth': float(self.yoy_growth('revenue')[-1]),
+            'net_income_growth': float(self.yoy_growth('net_income')[-1]),
+            'eps_growth': float(self.yoy_growth('eps_diluted')[-1]),
+            'gross_margin': self.margin('gross_profit')[-2:].tolist(),
+            'net_margin': self.margin('net_income')[-2:].tolist(),
+            'ebitda_margin': self.margin('ebitda')[-2:].tolist(),
+            'revenue_cagr': self.cagr('revenue'),
+            'net_income_cagr': self.cagr('net_income'),
+            'revenue_trend': self.trend('revenue'),
+            'net_income_trend': self.trend('net_income'),
+        }
+
+
+def describe_trend(rate: float) -> str:
+    """
+    Describe an annual trend rate in words.
+    """
+    if np.isnan(rate):
+        return 'n/a'
+    if rate > TREND_FLAT_THRESHOLD:
+        return f'rising ({rate:.1%} per year)'
+    if rate < -TREND_FLAT_THRESHOLD:
+        return f'falling ({rate:.1%} per year)'
+    return 'flat'
+
+
+def _history_from_payload(symbol: str, data: Any) -> Union[IncomeStatementHistory, None]:
+    if not isinstance(data, list) or not data:
+        print ("Error:",f"Could not fetch income statement history for symbol: {symbol}")
+        return None
+    history = IncomeStatementHistory.from_payload(symbol, data)
+    return history if len(history) else None
+
+def get_income_statement_history(symbol: str, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[IncomeStatementHistory, None]:
+    """
+    Fetch all annual income statements for the given symbol. This uses the same cached
+    payload as get_income_statement, so it costs no extra FMP call.
+    """
+    try:
+      return _history_from_payload(symbol, fetch_income_statement_payload(symbol, api_key, priority))
+    except requests.RequestException:
+        print ("Error:",f"Could not fetch income statement history for symbol: {symbol}")
+        return None
+
+async def aget_income_statement_history(symbol: str, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[IncomeStatementHistory, None]:
+    """
+    Async variant of get_income_statement_history.
+    """
+    try:
+      return _history_from_payload(symbol, await afetch_income_statement_payload(symbol, api_key, priority))
+    except httpx.HTTPError:
+        print ("Error:",f"Could not fetch income statement history for symbol: {symbol}")
+        return None
@@ -0,0 +1,240 @@
+import re
+import httpx
+import numpy as np
+import requests
+from pydantic import SecretStr
+from typing import Any, Optional, Union
+from consts.consts import (
+    FMP_ENDPOINT_HISTORICAL_PRICE, PRICE_HISTORY_BACKFILL_YEARS, PRICE_HISTORY_DEFAULT_MONTHS, PRIORITY_INTERACTIVE
+)
+from methods.fmp_client import get_fmp_client, get_async_fmp_client
+from methods.indicators import get_indicator_engine
+from methods.price_store import DATE_COLUMN, PRICE_COLUMNS, Bars, PriceStore, get_price_store
+
+DAYS_PER_MONTH = 30.4375
+TRADING_DAYS_PER_YEAR = 252
+MAX_MONTHS = PRICE_HISTORY_BACKFILL_YEARS * 12
+
+_NUMBER_WORDS = {
+    'a': 1, 'an': 1, 'one': 1, 'two': 2, 'three': 3, 'four': 4, 'five': 5, 'six': 6,
+    'seven': 7, 'eight': 8, 'nine': 9, 'ten': 10, 'eleven': 11, 'twelve': 12, 'eighteen': 18,
+}
+_UNIT_MONTHS = {'day': 1 / DAYS_PER_MONTH, 'week': 7 / DAYS_PER_MONTH, 'month': 1, 'year': 12}
+_PERIOD_PATTERN = re.compile(
+    r'\b(\d+|' + '|'.join(_NUMBER_WORDS) + r')[\s-]*(day|week|month|year)s?\b', re.IGNORECASE
+)
+_SINGLE_UNIT_PATTERN = re.compile(r'\b(?:last|past|this)\s+(week|month|year)\b', re.IGNORECASE)
+_YTD_PATTERN = re.compile(r'\b(?:ytd|year[\s-]to[\s-]date)\b', re.IGNORECASE)
+
+
+class PriceHistory:
+    """
+    Daily OHLCV bars of a symbol over a period, stored column by column.
+
+    The columns are views into the memory-mapped price store, oldest bar first, so
+    building a history copies no data and every analytic is a vectorized NumPy operation.
+    """
+
+    def __init__(self, symbol: str, dates: np.ndarray, columns: dict[str, np.ndarray], months: float):
+        self.symbol = symbol
+        self.dates = dates
+        self.columns = columns
+        self.months = months
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def __getitem__(self, field: str) -> np.ndarray:
+        return self.columns[field]
+
+    def total_return(self) -> float:
+        """
+        Return the change of the close from the first to the last bar.
+        """
+        close = self.columns['close']
+        if len(close) < 2 or close[0] <= 0:
+            return float('nan')
+        return float(close[-1] / close[0] - 1.0)
+
+    def annualized_return(self) -> float:
+        """
+        Return the total return expressed per year.
+        """
+        span = (self.dates[-1] - self.dates[0]).astype(np.float64) / 365.25 if len(self) else 0.0
+        total = self.total_return()
+        if span <= 0 or np.isnan(total):
+            return float('nan')
+        return float((1.0 + total) ** (1.0 / span) - 1.0)
+
+    def summary(self) -> Optional[dict[str, Any]]:
+        """
+        Return the headline figures of the period, or None with fewer than two bars.
+        """
+        if len(self) < 2:
+            return None
+        high, low = self.columns['high'], self.columns['low']
+        return {
+            'first_date': self.dates[0].item(),
+            'last_date': self.dates[-1].item(),
+            'sessions': len(self),
+            'first_close': float(self.columns['close'][0]),
+            'last_close': float(self.columns['close'][-1]),
+            'total_return': self.total_return(),
+            'annualized_return': self.annualized_return(),
+            'high': float(high.max()),
+            'high_date': self.dates[int(high.argmax())].item(),
+            'low': float(low.min()),
+            'low_date': self.dates[int(low.argmin())].item(),
+            'average_volume': float(self.columns['volume'].mean()),
+        }
+
+
+def months_from_request(request: Optional[str], today: np.datetime64, default: float = PRICE_HISTORY_DEFAULT_MONTHS) -> float:
+    """
+    Read the period a request asks about, e.g. "over the last 6 months", "past two years" or
+    "year to date", in months. Periods are kept between a week and the stored backfill.
+    """
+    if not request:
+        return default
+    if (match := _PERIOD_PATTERN.search(request)):
+        count = match.group(1).lower()
+        number = int(count) if count.isdigit() else _NUMBER_WORDS[count]
+        months = number * _UNIT_MONTHS[match.group(2).lower()]
+    elif _YTD_PATTERN.search(request):
+        months = (today - today.astype('datetime64[Y]').astype('datetime64[D]')).astype(np.float64) / DAYS_PER_MONTH
+    elif (match := _SINGLE_UNIT_PATTERN.search(request)):
+        months = _UNIT_MONTHS[match.group(1).lower()]
+    else:
+        return default
+    return min(max(months, 7 / DAYS_PER_MONTH), MAX_MONTHS)
+
+
+def period_start(today: np.datetime64, months: float) -> np.datetime64:
+    """
+    Return the first date of a period of months ending today.
+    """
+    return today - np.timedelta64(int(round(months * DAYS_PER_MONTH)), 'D')
+
+
+def describe_period(months: float) -> str:
+    """
+    Describe a period of months in words, e.g. "6 months" or "2 years".
+    """
+    days = months * DAYS_PER_MONTH
+    if days < 28:
+        weeks = max(1, round(days / 7))
+        return f"{weeks} week{'s' if weeks != 1 else ''}"
+    if months >= 12 and round(months) % 12 == 0:
+        years = round(months) // 12
+        return f"{years} year{'s' if years != 1 else ''}"
+    rounded = max(1, round(months))
+    return f"{rounded} month{'s' if rounded != 1 else ''}"
+
+
+def bars_from_payload(data: Any) -> Bars:
+    """
+    Convert a historical-price-full payload into (dates, columns) arrays. Prices are adjusted
+    for splits and dividends: open, high and low are scaled like adjClose is to close.
+    """
+    rows = data.get('historical', []) if isinstance(data, dict) else []
+    rows = [row for row in rows if row.get('date') and row.get('close') is not None]
+    dates = np.array([row['date'] for row in rows], dtype='datetime64[D]')
+    columns = {
+        name: np.array([np.nan if row.get(name) is None else row[name] for row in rows], dtype=np.float64)
+        for name in PRICE_COLUMNS
+    }
+    adjusted = np.array([row.get('adjClose') or row['close'] for row in rows], dtype=np.float64)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        factor = np.where(columns['close'] > 0, adjusted / columns['close'], 1.0)
+    for name in ('open', 'high', 'low', 'close'):
+        columns[name] = columns[name] * factor
+    return dates, columns
+
+
+def _history_params(start: Optional[np.datetime64], store: PriceStore) -> dict[str, str]:
+    if start is None:
+        start = store.today() - np.timedelta64(int(PRICE_HISTORY_BACKFILL_YEARS * 365.25), 'D')
+    return {'from': str(start)}
+
+
+def fetch_price_bars(symbol: str, api_key: SecretStr, start: Optional[np.datetime64], priority: int = PRIORITY_INTERACTIVE) -> Bars:
+    """
+    Download the daily bars of a symbol from start on, or the full backfill when start is None.
+    """
+    data = get_fmp_client().get_json(
+        f"{FMP_ENDPOINT_HISTORICAL_PRICE}/{symbol}", api_key,
+        params=_history_params(start, get_price_store()), priority=priority)
+    return bars_from_payload(data)
+
+async def afetch_price_bars(symbol: str, api_key: SecretStr, start: Optional[np.datetime64], priority: int = PRIORITY_INTERACTIVE) -> Bars:
+    """
+    Async variant of fetch_price_bars.
+    """
+    data = await get_async_fmp_client().get_json(
+        f"{FMP_ENDPOINT_HISTORICAL_PRICE}/{symbol}", api_key,
+        params=_history_params(start, get_price_store()), priority=priority)
+    return bars_from_payload(data)
+
+
+def get_stored_indicators(symbol: str) -> Union[dict[str, float], None]:
+    """
+    Return the latest technical indicators of a symbol computed from the bars already in the
+    price store, or None if it has none. This never calls FMP.
+    """
+    close = get_price_store().columns(symbol)['close']
+    if len(close) == 0:
+        return None
+    return get_indicator_engine().update(symbol, close)
+
+def _history_from_store(symbol: str, months: float) -> Union[PriceHistory, None]:
+    store = get_price_store()
+    bars = store.slice(symbol, start=period_start(store.today(), months))
+    if len(bars[DATE_COLUMN]) == 0:
+        print ("Error:",f"Could not fetch price history for symbol: {symbol}")
+        return None
+    dates = bars.pop(DATE_COLUMN)
+    return PriceHistory(symbol.upper(), dates, bars, months)
+
+def get_price_history(symbol: str, api_key: SecretStr, months: float = PRICE_HISTORY_DEFAULT_MONTHS, priority: int = PRIORITY_INTERACTIVE) -> Union[PriceHistory, None]:
+    """
+    Return the daily bars of the last months for the given symbol from the local price store,
+    first downloading any bars after the last stored date. When FMP cannot be reached the
+    stored bars are still served.
+    """
+    try:
+      get_price_store().refresh(symbol, lambda start: fetch_price_bars(symbol, api_key, start, priority))
+    except (ValueError, requests.RequestException):
+        print ("Error:",f"Could not refresh price history for symbol: {symbol}")
+    return _history_from_store(symbol, months)
+
+async def aget_price_history(symbol: str, api_key: SecretStr, months: float = PRICE_HISTORY_DEFAULT_MONTHS, priority: int = PRIORITY_INTERACTIVE) -> Union[PriceHistory, None]:
+    """
+    Async variant of get_price_history.
+    """
+    try:
+      await get_price_store().arefresh(symbol, lambda start: afetch_price_bars(symbol, api_key, start, priority))
+    except (ValueError, httpx.HTTPError):
+        print ("Error:",f"Could not refresh price history for symbol: {symbol}")
+    return _history_from_store(symbol, months)
+
+## DATA PROVIDED BY THIS ENDPOINT (newest bar first):
+#{
+#  "symbol": "AAPL",
+#  "historical": [
+#    {
+#      "date": "2024-10-18",
+#      "open": 236.18,
+#      "high": 236.18,
+#      "low": 234.01,
+#      "close": 235.00,
+#      "adjClose": 235.00,
+#      "volume": 46431472,
+#      "unadjustedVolume": 46431472,
+#      "change": -1.18,
+#      "changePercent": -0.49961,
+#      "vwap": 235.06,
+#      "label": "October 18, 24",
+#      "changeOverTime": -0.0049961
+#    }
+#  ]
+#}
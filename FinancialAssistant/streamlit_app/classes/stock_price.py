@@ -1,7 +1,19 @@
-from pydantic import BaseModel, Field, SecretStr
+from pydantic import BaseModel, Field, SecretStr, ValidationError
+import asyncio
+import httpx
+import math
 import requests
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import Union
+from typing import Any, Iterable, Union
+from consts.consts import (
+    FMP_ENDPOINT_QUOTE, FMP_QUOTE_BATCH_SIZE, FMP_BATCH_CONCURRENCY,
+    PRIORITY_INTERACTIVE, PRIORITY_BATCH
+)
+from methods.fmp_cache import get_fmp_cache
+from methods.fmp_client import get_fmp_client, get_async_fmp_client
+from methods.fmp_json import payload_fields
+from methods.model_builder import ModelBuilder
 
 class StockPrice(BaseModel):
     symbol:str = Field(description="The symbol of the company")
@@ -12,21 +24,125 @@ class StockPrice(BaseModel):
     eps:float = Field(description="The EPS of the company")
     pe:float = Field(description="The PE of the company")
     earningsAnnouncement:datetime = Field(description="The earnings announcement of the company")
+
+QUOTE_FIELDS = payload_fields(StockPrice)
+STOCK_PRICE_BUILDER = ModelBuilder(StockPrice)
+
 # Define the functions that will fetch financial data
-def get_stock_price(symbol:str, api_key: SecretStr) -> Union[StockPrice, None]:
+def get_stock_price(symbol:str, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[StockPrice, None]:
     """
     Fetch the current stock price for the given symbol, the current volume, the average price 50d and 200d, EPS, PE and the next earnings Announcement.
     """
     try:
-      url = f"https://financialmodelingprep.com/api/v3/quote-order/{symbol}?apikey={api_key.get_secret_value()}"
-      response = requests.get(url)
-      data = response.json()
-      stock_price = StockPrice(**data[0])
+      data = get_fmp_cache().get_or_fetch(
+        FMP_ENDPOINT_QUOTE, symbol,
+        lambda: get_fmp_client().get_json(f"{FMP_ENDPOINT_QUOTE}/{symbol}", api_key, priority=priority, fields=QUOTE_FIELDS))
+      stock_price = STOCK_PRICE_BUILDER.build(symbol.upper(), data[0])
       return stock_price
-    except (IndexError, KeyError):
+    except (IndexError, KeyError, requests.RequestException):
         print ("Error:",f"Could not fetch price for symbol: {symbol}")
         return None
 
+async def aget_stock_price(symbol:str, api_key: SecretStr, priority: int = PRIORITY_INTERACTIVE) -> Union[StockPrice, None]:
+    """
+    Async variant of get_stock_price that does not block a worker thread on network I/O.
+    """
+    try:
+      data = await get_fmp_cache().aget_or_fetch(
+        FMP_ENDPOINT_QUOTE, symbol,
+        lambda: get_async_fmp_client().get_json(f"{FMP_ENDPOINT_QUOTE}/{symbol}", api_key, priority=priority, fields=QUOTE_FIELDS))
+      return STOCK_PRICE_BUILDER.build(symbol.upper(), data[0])
+    except (IndexError, KeyError, httpx.HTTPError):
+        print ("Error:",f"Could not fetch price for symbol: {symbol}")
+        return None
+
+def split_batches(symbols: list[str], batch_size: int = FMP_QUOTE_BATCH_SIZE) -> list[list[str]]:
+    """
+    Split symbols into the fewest batches of at most batch_size, with sizes as even as possible.
+    """
+    if not symbols:
+        return []
+    count = math.ceil(len(symbols) / batch_size)
+    size = math.ceil(len(symbols) / count)
+    return [symbols[i:i + size] for i in range(0, len(symbols), size)]
+
+def _normalize_symbols(symbols: Iterable[str]) -> list[str]:
+    """Upper-case and de-duplicate symbols, keeping their order."""
+    return list(dict.fromkeys(symbol.strip().upper() for symbol in symbols if symbol and symbol.strip()))
+
+def _collect_quotes(rows: Any, prices: dict[str, StockPrice]) -> None:
+    """Cache each quote row of a batch response and add the valid ones to prices."""
+    if not isinstance(rows, list):
+        return
+    cache = get_fmp_cache()
+    for row, stock_price in STOCK_PRICE_BUILDER.build_many(rows):
+        symbol = stock_price.symbol.upper()
+        cache.set(FMP_ENDPOINT_QUOTE, symbol, [row])
+        STOCK_PRICE_BUILDER.remember(symbol, row, stock_price)
+        prices[symbol] = stock_price
+
+def _cached_quotes(symbols: list[str], prices: dict[str, StockPrice]) -> list[str]:
+    """Fill prices from the cache and return the symbols that still have to be fetched."""
+    cache = get_fmp_cache()
+    missing = []
+    for symbol in symbols:
+        data = cache.get(FMP_ENDPOINT_QUOTE, symbol)
+        try:
+          prices[symbol] = STOCK_PRICE_BUILDER.build(symbol, data[0])
+        except (TypeError, IndexError, KeyError, ValidationError):
+          missing.append(symbol)
+    return missing
+
+def get_stock_prices(
+    symbols: Iterable[str], api_key: SecretStr, batch_size: int = FMP_QUOTE_BATCH_SIZE,
+    priority: int = PRIORITY_BATCH,
+) -> dict[str, StockPrice]:
+    """
+    Fetch quotes for many symbols using comma-separated batch requests issued concurrently.
+    Symbols FMP does not know are left out of the result. Requests default to the batch
+    priority so that interactive lookups are served first when the rate limit is tight.
+    """
+    prices: dict[str, StockPrice] = {}
+    batches = split_batches(_cached_quotes(_normalize_symbols(symbols), prices), batch_size)
+    if not batches:
+        return prices
+
+    def fetch(batch: list[str]) -> Any:
+        try:
+          return get_fmp_client().get_json(f"{FMP_ENDPOINT_QUOTE}/{','.join(batch)}", api_key, priority=priority, fields=QUOTE_FIELDS)
+        except requests.RequestException:
+          print ("Error:",f"Could not fetch prices for symbols: {','.join(batch)}")
+          return None
+
+    with ThreadPoolExecutor(max_workers=min(len(batches), FMP_BATCH_CONCURRENCY)) as executor:
+        for rows in executor.map(fetch, batches):
+            _collect_quotes(rows, prices)
+    return prices
+
+async def aget_stock_prices(
+    symbols: Iterable[str], api_key: SecretStr, batch_size: int = FMP_QUOTE_BATCH_SIZE,
+    priority: int = PRIORITY_BATCH,
+) -> dict[str, StockPrice]:
+    """
+    Async variant of get_stock_prices that overlaps the batch requests on the running event loop.
+    """
+    prices: dict[str, StockPrice] = {}
+    batches = split_batches(_cached_quotes(_normalize_symbols(symbols), prices), batch_size)
+    semaphore = asyncio.Semaphore(FMP_BATCH_CONCURRENCY)
+
+    async def fetch(batch: list[str]) -> Any:
+        async with semaphore:
+            try:
+              return await get_async_fmp_client().get_json(f"{FMP_ENDPOINT_QUOTE}/{','.join(batch)}", api_key, priority=priority, fields=QUOTE_FIELDS)
+            except httpx.HTTPError:
+              print ("Error:",f"Could not fetch prices for symbols: {','.join(batch)}")
+              return None
+
+    for rows in await asyncio.gather(*(fetch(batch) for batch in batches)):
+        _collect_quotes(rows, prices)
+    return prices
+
+
 ## DATA PROVIDED BY THIS ENDPOINT:
 # [{'symbol': 'AAPL',
 #   'name': 'Apple Inc.',
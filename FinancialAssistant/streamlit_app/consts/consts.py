@@ -17,6 +17,126 @@ MODEL_GROQ = "llama-3.3-70b-versatile"
 MODEL_OPENAI = "gpt-4o-mini"
 MODEL_ANTHROPIC = "claude-3-sonnet-20240229"
 
+# Financial Modeling Prep API
+FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
+FMP_ENDPOINT_PROFILE = "profile"
+FMP_ENDPOINT_INCOME_STATEMENT = "income-statement"
+FMP_ENDPOINT_QUOTE = "quote-order"
+FMP_ENDPOINT_HISTORICAL_PRICE = "historical-price-full"
+FMP_ENDPOINT_STOCK_LIST = "stock/list"
+FMP_CONNECT_TIMEOUT = 3.05  # seconds
+FMP_READ_TIMEOUT = 10.0  # seconds
+FMP_MAX_RETRIES = 2
+FMP_RETRY_BACKOFF = 0.3  # seconds, doubled on every retry
+FMP_POOL_MAXSIZE = 20  # connections kept alive per host
+FMP_PERIOD_ANNUAL = "annual"
+FMP_QUOTE_BATCH_SIZE = 100  # maximum symbols per comma-separated quote request
+FMP_BATCH_CONCURRENCY = 8  # batch requests in flight at once
+
+# FMP rate limiting
+FMP_RATE_LIMIT_PER_MINUTE = 300  # calls per minute allowed by the FMP plan
+FMP_RATE_LIMIT_BURST = 10  # calls that may be made back to back
+FMP_INTERACTIVE_RESERVE = 0.2  # fraction of the burst kept for interactive calls
+FMP_RETRY_AFTER_DEFAULT = 1.0  # seconds to pause on a 429 without Retry-After
+
+# FMP failure isolation: a circuit breaker per endpoint and optional hedged requests
+FMP_BREAKER_FAILURE_RATE = 0.5  # failure rate over the window that opens the circuit
+FMP_BREAKER_MIN_CALLS = 5  # calls in the window before the failure rate is considered
+FMP_BREAKER_WINDOW = 30.0  # seconds of outcomes kept per endpoint
+FMP_BREAKER_OPEN_SECONDS = 30.0  # how long an open circuit fails fast before probing again
+FMP_HEDGE_PERCENTILE = 95  # latency percentile after which a second request is sent
+FMP_HEDGE_MIN_SAMPLES = 20  # latencies needed before hedging starts
+FMP_HEDGE_MIN_DELAY = 0.05  # seconds, lower bound of the hedging delay
+FMP_HEDGE_WINDOW = 200  # most recent latencies kept per endpoint
+
+# Request priority classes, lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 1
+PRIORITY_BACKGROUND = 2
+
+# FMP response cache: time to live per endpoint, in seconds
+FMP_CACHE_TTL = {
+    FMP_ENDPOINT_QUOTE: 15,
+    FMP_ENDPOINT_PROFILE: 6 * 60 * 60,
+    FMP_ENDPOINT_INCOME_STATEMENT: 3 * 24 * 60 * 60,
+}
+FMP_CACHE_MAX_SIZE = 2048  # entries across all endpoints
+FMP_DISK_CACHE_PATH = ".cache/fmp_cache.sqlite3"  # set FMP_CACHE_PATH="" to disable
+
+# Stale-while-revalidate: how long past its TTL an entry may still be served while it is refreshed
+FMP_CACHE_MAX_STALENESS = {
+    FMP_ENDPOINT_QUOTE: 60,
+    FMP_ENDPOINT_PROFILE: 24 * 60 * 60,
+    FMP_ENDPOINT_INCOME_STATEMENT: 7 * 24 * 60 * 60,
+}
+FMP_REFRESH_AHEAD = 0.2  # fraction of the TTL left at which hot entries are refreshed
+FMP_REFRESH_INTERVAL = 5.0  # seconds between sweeps for hot entries
+FMP_REFRESH_WORKERS = 2  # background refreshes running at once
+FMP_HOT_WINDOW = 5 * 60  # seconds over which accesses are counted
+FMP_HOT_MIN_HITS = 3  # accesses within the window that make a symbol hot
+
+# Startup warm-up: symbols whose data is fetched before traffic arrives
+FMP_WATCHLIST_ENV = "FMP_WATCHLIST"  # comma-separated symbols
+FMP_WATCHLIST_FILE_ENV = "FMP_WATCHLIST_FILE"  # path to a file with one symbol per line
+
+# Daily price store: memory-mapped OHLCV columns per symbol, refreshed incrementally
+PRICE_STORE_PATH = ".cache/prices"  # set FMP_PRICE_STORE_PATH to move it
+PRICE_STORE_REFRESH_INTERVAL = 60 * 60  # seconds between checks of a symbol for new bars
+PRICE_STORE_ADJUSTMENT_TOLERANCE = 0.005  # change of a stored close, as a fraction, taken as a split or dividend adjustment
+PRICE_HISTORY_BACKFILL_YEARS = 5  # years of bars downloaded the first time a symbol is seen
+PRICE_HISTORY_DEFAULT_MONTHS = 12  # period shown when the request does not name one
+
+# Technical indicators computed from the stored daily closes
+INDICATOR_SMA_WINDOWS = (20, 50, 200)  # trading days
+INDICATOR_EMA_SPANS = (20, 50)  # trading days
+INDICATOR_RSI_PERIOD = 14
+INDICATOR_MACD = (12, 26, 9)  # fast span, slow span, signal span
+INDICATOR_VOLATILITY_WINDOW = 20  # trading days of log returns, annualized
+
+# Rule-based fast path ahead of the LLM router
+FAST_ROUTER_MIN_SCORE = 3.0  # score the best route needs to be taken without the LLM
+FAST_ROUTER_MIN_MARGIN = 2.0  # lead the best route needs over the runner-up
+
+# Local symbol resolution ahead of the extraction LLM
+SYMBOL_LIST_PATH = "data/symbols.csv"  # relative to streamlit_app; set SYMBOL_LIST_PATH to use another list
+SYMBOL_FUZZY_MIN_SIMILARITY = 0.65  # trigram similarity a misspelt name needs to match
+SYMBOL_FUZZY_MIN_COVERAGE = 0.8  # share of the name's length a misspelt phrase must cover
+SYMBOL_FUZZY_MIN_MARGIN = 0.1  # lead the best fuzzy match needs over the next company
+
+# Shared LLM clients
+LLM_CLIENT_IDLE_TIMEOUT = 30 * 60  # seconds a client no session asked for is kept by the registry
+LLM_HTTP_POOL_MAXSIZE = 20  # pooled connections per client
+LLM_HTTP_KEEPALIVE_EXPIRY = 60.0  # seconds an idle pooled connection is kept open
+
+# Exact-match cache of LLM chain results
+LLM_CACHE_MAX_SIZE = 1024  # entries across all chains
+LLM_CACHE_TTL = 24 * 60 * 60  # seconds; bounds how long a chat answer can be repeated
+LLM_CACHE_PATH = ".cache/llm_cache.sqlite3"  # set LLM_CACHE_PATH="" to keep the cache in memory only
+LLM_CACHE_CHAINS = ("route", "route_extraction", "extraction", "chat")  # set LLM_CACHE_CHAINS to override; "" disables
+
+# Semantic cache of chat answers
+SEMANTIC_CACHE_MIN_SIMILARITY = 0.5  # cosine similarity a cached question needs to be compared word by word
+SEMANTIC_CACHE_TTL = 6 * 60 * 60  # seconds a chat answer is reused
+SEMANTIC_CACHE_MAX_SIZE = 512  # answers kept; the least recently used is evicted first
+SEMANTIC_CACHE_SCOPE = "user"  # "user" reuses a user's own answers, "global" shares them between users
+SEMANTIC_CACHE_DIMENSIONS = 4096  # buckets of the hashed n-gram vectors
+
+# Background conversation summarization
+SUMMARY_QUEUE_WORKERS = 2  # summaries written at once, each for a different user; 0 summarizes inline
+
+# When and how much to summarize
+SUMMARY_EVERY_N_TURNS = 3  # turns collected before they are summarized together
+SUMMARY_TOKEN_BUDGET = 1200  # estimated tokens of unsummarized turns that trigger a summary earlier
+SUMMARY_MAX_TOKENS = 400  # hard cap on the stored summary
+SUMMARY_TURN_MAX_CHARS = 800  # compressed answer of one turn, as sent to the summarization chain
+
+# Streaming answers into the UI
+STREAM_RESPONSES = True  # set STREAM_RESPONSES=0 to render answers only once the graph has finished
+
+# Combined routing and symbol extraction in one LLM call
+COMBINED_ROUTING_ENABLED = False  # set COMBINED_ROUTING=1 to enable
+COMBINED_ROUTING_MIN_CONFIDENCE = 0.8  # confidence a symbol needs to skip the extraction node
+
 # Node names
 NODE_EXTRACTION = 'Extraction'
 NODE_STOCK_PRICE = 'StockPrice'
@@ -32,6 +152,7 @@ NODE_SYMBOL_EXTRACTION_ALONE = 'SymbolExtractionAlone'
 NODE_STOCK_PRICE_STAND_ALONE = 'StockPriceStandAlone'
 NODE_INCOME_STATEMENT_STAND_ALONE = 'IncomeStatementStandAlone'
 NODE_COMPANY_FINANCIALS_STAND_ALONE = 'CompanyFinancialsStandAlone'
+NODE_PRICE_HISTORY_STAND_ALONE = 'PriceHistoryStandAlone'
 NODE_CHAT = 'ChatNode'
 NODE_FINAL_ANSWER = 'FinalAnswer'
 NODE_SUMMARIZE = 'SummarizeNode'
@@ -65,6 +186,7 @@ KEY_CONFIG = "configurable"
 KEY_COMPANY_FINANCIALS = "company_financials"
 KEY_INCOME_STATEMENT = "income_statement"
 KEY_STOCK_PRICE = "stock_price"
+KEY_PRICE_HISTORY = "price_history"
 KEY_DATE = "date"
 KEY_COMPANY_NAME = "companyName"
 KEY_MARKET_CAP = "marketCap"
@@ -0,0 +1,8 @@
+"""
+Offline stand-in for the Financial Modeling Prep API, for load tests and benchmarks.
+"""
+
+from fmp_emulator.fixtures import FixtureStore
+from fmp_emulator.server import FMPEmulator, FaultConfig
+
+__all__ = ["FixtureStore", "FMPEmulator", "FaultConfig"]
@@ -0,0 +1,78 @@
+"""
+Command line entry point for the FMP emulator.
+
+Serve the fixtures (then set FMP_BASE_URL=http://127.0.0.1:8765/api/v3):
+
+    python -m fmp_emulator serve --port 8765 --latency-ms 80 --jitter-ms 40 --throttle-rate 0.01
+
+Record real responses as fixtures (needs FINANCIAL_MODELING_PREP_API_KEY):
+
+    python -m fmp_emulator record AAPL MSFT NVDA
+"""
+
+import argparse
+import os
+from pathlib import Path
+from pydantic import SecretStr
+from consts.consts import FMP_PERIOD_ANNUAL
+from fmp_emulator.fixtures import ENDPOINTS, FIXTURES_DIR, FixtureStore
+from fmp_emulator.server import FMPEmulator, FaultConfig
+
+
+def serve(args: argparse.Namespace) -> None:
+    faults = FaultConfig(
+        latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate, retry_after=args.retry_after, seed=args.seed,
+    )
+    store = FixtureStore(args.fixtures, synthesize=not args.recorded_only)
+    emulator = FMPEmulator(store, faults, host=args.host, port=args.port)
+    print(f"Serving FMP fixtures from {args.fixtures}, set FMP_BASE_URL={emulator.base_url}")
+    try:
+        emulator.serve_forever()
+    except KeyboardInterrupt:
+        emulator.stop()
+
+
+def record(args: argparse.Namespace) -> None:
+    from methods.fmp_client import FMPClient
+
+    api_key = SecretStr(os.environ["FINANCIAL_MODELING_PREP_API_KEY"])
+    client = FMPClient.from_env()
+    store = FixtureStore(args.fixtures, synthesize=False)
+    for symbol in args.symbols:
+        for endpoint in ENDPOINTS:
+            params = {"period": FMP_PERIOD_ANNUAL} if endpoint == "income-statement" else None
+            payload = client.get_json(f"{endpoint}/{symbol.upper()}", api_key, params=params)
+            if isinstance(payload, list) and payload:
+                print("Recorded", store.record(endpoint, symbol, payload))
+            else:
+                print("Error:", f"No {endpoint} data for {symbol}: {payload}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m fmp_emulator", description="Local stand-in for the FMP API")
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="fixtures directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = commands.add_parser("serve", help="serve the fixtures over HTTP")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    serve_parser.add_argument("--latency-ms", type=float, default=0.0)
+    serve_parser.add_argument("--jitter-ms", type=float, default=0.0)
+    serve_parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of 500 responses")
+    serve_parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of 429 responses")
+    serve_parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After sent with 429s")
+    serve_parser.add_argument("--seed", type=int, default=None)
+    serve_parser.add_argument("--recorded-only", action="store_true", help="do not synthesize missing symbols")
+    serve_parser.set_defaults(func=serve)
+
+    record_parser = commands.add_parser("record", help="record real FMP responses as fixtures")
+    record_parser.add_argument("symbols", nargs="+")
+    record_parser.set_defaults(func=record)
+
+    args = parser.parse_args()
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
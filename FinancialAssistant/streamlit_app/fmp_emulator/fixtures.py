@@ -0,0 +1,162 @@
+"""
+Fixture store for the FMP emulator.
+
+Recorded responses live in <directory>/<endpoint>/<SYMBOL>.json, exactly as
+FMP returned them. Symbols without a recording can be synthesized from the
+AAPL recording: numbers are scaled by a factor derived from the symbol, so
+every symbol gets its own stable payload and load tests can use thousands
+of tickers. Income statements are synthesized for several years so the
+history analytics have something to work on, and daily prices are a
+random walk that ends at the symbol's quote.
+"""
+
+import json
+import math
+import random
+import threading
+import zlib
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, Optional
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+TEMPLATE_SYMBOL = "AAPL"
+SYNTHETIC_YEARS = 10
+ENDPOINTS = ("profile", "income-statement", "quote-order")
+HISTORICAL_PRICE_ENDPOINT = "historical-price-full"
+SYNTHETIC_DAILY_VOLATILITY = 0.018
+
+# Numbers that do not grow with the size of the company
+_UNSCALED_FIELDS = {"beta", "changesPercentage", "timestamp"}
+
+
+class FixtureStore:
+    """
+    Serves recorded FMP payloads, synthesizing the ones that were not recorded.
+
+    Args:
+        directory: Root directory of the recorded fixtures
+        synthesize: Whether to make up payloads for symbols without a recording
+    """
+
+    def __init__(self, directory: Path | str = FIXTURES_DIR, synthesize: bool = True):
+        self.directory = Path(directory)
+        self.synthesize = synthesize
+        self._loaded: dict[tuple[str, str], Optional[list[dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str, symbol: str) -> Optional[list[dict[str, Any]]]:
+        """
+        Return the payload for a symbol, or None if there is neither a recording nor a synthetic one.
+        """
+        symbol = symbol.upper()
+        key = (endpoint, symbol)
+        with self._lock:
+            if key in self._loaded:
+                return self._loaded[key]
+        payload = self._load(endpoint, symbol)
+        if payload is None and self.synthesize:
+            payload = self._synthesize(endpoint, symbol)
+        with self._lock:
+            self._loaded[key] = payload
+        return payload
+
+    def _load(self, endpoint: str, symbol: str) -> Optional[list[dict[str, Any]]]:
+        path = self.directory / endpoint / f"{symbol}.json"
+        if not path.is_file():
+            return None
+        with open(path, encoding="utf-8") as file:
+            return json.load(file)
+
+    def _synthesize(self, endpoint: str, symbol: str) -> Optional[list[dict[str, Any]]]:
+        template = self._load(endpoint, TEMPLATE_SYMBOL)
+        if not template or endpoint not in ENDPOINTS:
+            return None
+        rng = random.Random(zlib.crc32(symbol.encode()))
+        scale = rng.uniform(0.01, 1.5)
+        row = _scaled(template[0], scale, symbol)
+        if endpoint == "profile":
+            row["companyName"] = f"{symbol} Inc."
+            row["website"] = f"https://www.{symbol.lower()}.example"
+        if endpoint == "quote-order":
+            row["name"] = f"{symbol} Inc."
+        if endpoint != "income-statement":
+            return [row]
+        return _income_statement_history(row, rng)
+
+    def price_history(self, symbol: str, start: Optional[date], end: Optional[date]) -> Optional[dict[str, Any]]:
+        """
+        Return daily bars from start to end in the historical-price-full format, newest first.
+        The bars are a random walk over weekdays, seeded by the symbol, ending at its quote.
+        """
+        quote = self.get("quote-order", symbol)
+        if not quote:
+            return None
+        symbol = symbol.upper()
+        end = end or date.today()
+        start = start or end.replace(year=end.year - SYNTHETIC_YEARS)
+        rng = random.Random(zlib.crc32(f"{symbol}:{end.isoformat()}".encode()))
+        close = float(quote[0]["price"])
+        volume = float(quote[0].get("volume") or 1_000_000)
+        rows = []
+        day = end
+        while day >= start:
+            if day.weekday() < 5:
+                move = rng.gauss(0.0, SYNTHETIC_DAILY_VOLATILITY)
+                open_ = close * math.exp(-move)
+                rows.append({
+                    "date": day.isoformat(),
+                    "open": round(open_, 2),
+                    "high": round(max(open_, close) * (1 + abs(rng.gauss(0.0, 0.005))), 2),
+                    "low": round(min(open_, close) * (1 - abs(rng.gauss(0.0, 0.005))), 2),
+                    "close": round(close, 2),
+                    "volume": int(volume * rng.uniform(0.6, 1.4)),
+                })
+                close = open_ * math.exp(rng.gauss(0.0, SYNTHETIC_DAILY_VOLATILITY / 4))
+            day -= timedelta(days=1)
+        return {"symbol": symbol, "historical": rows}
+
+    def record(self, endpoint: str, symbol: str, payload: list[dict[str, Any]]) -> Path:
+        """
+        Save a real FMP response as the recording for a symbol.
+        """
+        path = self.directory / endpoint / f"{symbol.upper()}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(payload, file, indent=2)
+            file.write("\n")
+        with self._lock:
+            self._loaded.pop((endpoint, symbol.upper()), None)
+        return path
+
+    def symbols(self, endpoint: str) -> list[str]:
+        """Return the symbols that have a recording for an endpoint."""
+        return sorted(path.stem for path in (self.directory / endpoint).glob("*.json"))
+
+
+def _scaled(row: dict[str, Any], scale: float, symbol: str) -> dict[str, Any]:
+    """Copy a row for another symbol, scaling every number that is not a ratio or a flag."""
+    scaled = {}
+    for key, value in row.items():
+        if key == "symbol":
+            scaled[key] = symbol
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            unscaled = key in _UNSCALED_FIELDS or "ratio" in key.lower()
+            scaled[key] = value if unscaled else type(value)(value * scale)
+        else:
+            scaled[key] = value
+    return scaled
+
+
+def _income_statement_history(latest: dict[str, Any], rng: random.Random) -> list[dict[str, Any]]:
+    """Build SYNTHETIC_YEARS annual statements ending at latest, most recent first like FMP."""
+    rows = [latest]
+    last_date = date.fromisoformat(latest["date"])
+    for years_back in range(1, SYNTHETIC_YEARS):
+        previous = rows[-1]
+        shrink = 1.0 / (1.0 + rng.uniform(-0.05, 0.15))
+        row = _scaled(previous, shrink, latest["symbol"])
+        row["date"] = last_date.replace(year=last_date.year - years_back).isoformat()
+        row["calendarYear"] = str(last_date.year - years_back)
+        rows.append(row)
+    return rows
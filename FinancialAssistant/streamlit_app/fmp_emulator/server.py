@@ -0,0 +1,179 @@
+"""
+Local stand-in for the FMP API.
+
+Serves /api/v3/profile/<SYMBOL>, /api/v3/income-statement/<SYMBOL>,
+/api/v3/quote-order/<SYMBOLS> (comma-separated) and
+/api/v3/historical-price-full/<SYMBOL>?from=&to= from a FixtureStore, with
+configurable latency, server errors and 429 responses. Point the fetchers at
+it by setting FMP_BASE_URL to FMPEmulator.base_url before the first request.
+"""
+
+import json
+import random
+import socket
+import threading
+import time
+from collections import Counter
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional
+from urllib.parse import parse_qs, urlsplit
+from fmp_emulator.fixtures import HISTORICAL_PRICE_ENDPOINT, FixtureStore
+
+API_PREFIX = "/api/v3"
+BATCH_ENDPOINTS = {"quote-order"}
+
+
+@dataclass
+class FaultConfig:
+    """
+    Faults injected into the emulator's responses.
+
+    Args:
+        latency_ms: Delay added to every response
+        jitter_ms: Random extra delay of up to this many milliseconds
+        error_rate: Fraction of requests answered with a 500
+        throttle_rate: Fraction of requests answered with a 429
+        retry_after: Retry-After seconds sent with a 429
+        seed: Seed of the random generator, for reproducible runs
+    """
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    retry_after: float = 1.0
+    seed: Optional[int] = None
+
+
+class FMPEmulator:
+    """
+    Threaded HTTP server emulating the FMP endpoints used by the fetchers.
+
+    Args:
+        store: Fixtures to serve
+        faults: Faults to inject
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one
+    """
+
+    def __init__(
+        self,
+        store: Optional[FixtureStore] = None,
+        faults: Optional[FaultConfig] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.store = store or FixtureStore()
+        self.faults = faults or FaultConfig()
+        self.requests: Counter = Counter()
+        self._random = random.Random(self.faults.seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """The value to use for FMP_BASE_URL."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}{API_PREFIX}"
+
+    def start(self) -> "FMPEmulator":
+        """Serve requests on a background thread."""
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fmp-emulator", daemon=True)
+        self._thread.start()
+        return self
+
+    def serve_forever(self) -> None:
+        """Serve requests on the calling thread until interrupted."""
+        self._server.serve_forever()
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._thread is not None:
+            self._server.shutdown()
+            self._thread = None
+        self._server.server_close()
+
+    def __enter__(self) -> "FMPEmulator":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def respond(self, path: str, query: dict[str, list[str]]) -> tuple[int, dict[str, str], Any]:
+        """
+        Compute the status, extra headers and JSON body for a request.
+        """
+        self._delay()
+        parts = path[len(API_PREFIX):].strip("/").split("/") if path.startswith(API_PREFIX) else []
+        endpoint = parts[0] if parts else ""
+        with self._lock:
+            self.requests[endpoint] += 1
+            roll = self._random.random()
+        if len(parts) != 2:
+            return 404, {}, {"Error Message": f"Unknown endpoint: {path}"}
+        if not query.get("apikey"):
+            return 401, {}, {"Error Message": "Invalid API KEY. Please retry or visit our documentation."}
+        if roll < self.faults.throttle_rate:
+            with self._lock:
+                self.requests["429"] += 1
+            return 429, {"Retry-After": f"{self.faults.retry_after:g}"}, {"Error Message": "Limit Reach"}
+        if roll < self.faults.throttle_rate + self.faults.error_rate:
+            with self._lock:
+                self.requests["500"] += 1
+            return 500, {}, {"Error Message": "Internal Server Error"}
+        if endpoint == HISTORICAL_PRICE_ENDPOINT:
+            start, end = (query.get(name, [None])[0] for name in ("from", "to"))
+            history = self.store.price_history(
+                parts[1], date.fromisoformat(start) if start else None, date.fromisoformat(end) if end else None
+            )
+            return 200, {}, history or {}
+        symbols = parts[1].split(",") if endpoint in BATCH_ENDPOINTS else [parts[1]]
+        rows: list[Any] = []
+        for symbol in symbols:
+            rows.extend(self.store.get(endpoint, symbol) or [])
+        return 200, {}, rows
+
+    def _delay(self) -> None:
+        delay = self.faults.latency_ms
+        if self.faults.jitter_ms:
+            with self._lock:
+                delay += self._random.uniform(0, self.faults.jitter_ms)
+        if delay > 0:
+            time.sleep(delay / 1000.0)
+
+
+def _handler_for(emulator: FMPEmulator) -> type[BaseHTTPRequestHandler]:
+    """Create a request handler class bound to an emulator."""
+
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self) -> None:
+            super().setup()
+            # Headers and body are written separately; without this Nagle adds ~40 ms per response
+            self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+        def do_GET(self) -> None:
+            url = urlsplit(self.path)
+            status, headers, body = emulator.respond(url.path, parse_qs(url.query))
+            data = json.dumps(body).encode()
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_HEAD(self) -> None:
+            self.send_response(200)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+
+        def log_message(self, format: str, *args: Any) -> None:
+            pass
+
+    return Handler
@@ -12,7 +12,12 @@ from graph.nodes.extraction_node import create_symbol_extraction_node
 from graph.nodes.financial_data_nodes import (
     get_income_statement_node,
     get_company_financials_node,
-    get_stock_price_node
+    get_stock_price_node,
+    get_price_history_node,
+    aget_income_statement_node,
+    aget_company_financials_node,
+    aget_stock_price_node,
+    aget_price_history_node
 )
 
 # Chat node
@@ -26,6 +31,7 @@ from graph.nodes.utility_nodes import (
     error_node,
     is_there_symbol,
     where_to,
+    where_to_combined,
     where_to_alone,
     final_answer_node
 )
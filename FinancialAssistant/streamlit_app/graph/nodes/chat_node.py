@@ -8,6 +8,8 @@ from graph.state.graph_state import GraphState
 from graph.state.internal_state import InternalState
 from chains.chat_chain import ChatResult, create_chat_chain
 from consts.consts import KEY_REQUEST, KEY_CHAT_RESPONSE
+from methods.semantic_cache import get_semantic_cache
+from methods.summary_policy import get_summary_policy
 from methods.util import get_memory_manager, get_user_id
 
 def create_chat_node(llm):
@@ -21,14 +23,23 @@ def create_chat_node(llm):
       # Get the user ID from the config if available
       user_id = get_user_id(config)
 
-      # Get conversation summary using the store parameter
-      summary = mem_store.get_conversation_summary(user_id) or ""
+      # Questions answered recently, in any wording, are served without the LLM
+      semantic_cache = get_semantic_cache()
+      request = state.get(KEY_REQUEST)
+      answer = semantic_cache.get(request, user_id)
+      if answer is not None:
+        return {KEY_CHAT_RESPONSE: answer}
+
+      # Get conversation summary using the store parameter, with the turns it does not cover yet
+      summary = get_summary_policy().context(user_id, mem_store.get_conversation_summary(user_id))
 
       # Pass the summary as a separate property
+      # The config carries the callbacks that stream the response tokens
       result: ChatResult = chain.invoke({
-          "request": state.get(KEY_REQUEST),
+          "request": request,
           "conversation_summary": summary
-      })
+      }, config)
 
+      semantic_cache.set(request, result.response, user_id)
       return {KEY_CHAT_RESPONSE: result.response}
   return chat_node
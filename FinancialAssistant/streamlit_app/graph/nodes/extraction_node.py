@@ -9,6 +9,7 @@ from graph.state.internal_state import InternalState
 from chains.extraction_chain import Extraction, create_extraction_chain
 from methods.memory_manager import MemoryManager
 from consts.consts import UNKNOWN, KEY_SYMBOL
+from methods.symbol_index import get_symbol_index
 from methods.util import get_memory_manager, get_user_id
 
 def create_symbol_extraction_node(llm):
@@ -18,11 +19,17 @@ def create_symbol_extraction_node(llm):
     print('symbol_extraction_node')
     print('State', state)
     symbol = UNKNOWN
-    try:
-      result: Extraction = chain.invoke(state.get('request'))
-      symbol = result.symbol
-    except Exception as e:
-      print('Error:', e)
+    # Tickers and well-known company names are resolved locally; only unclear requests reach the LLM
+    local_symbol = get_symbol_index().resolve(state.get('request'))
+    if local_symbol is not None:
+      print('Symbol resolved locally:', local_symbol)
+      symbol = local_symbol
+    else:
+      try:
+        result: Extraction = chain.invoke(state.get('request'))
+        symbol = result.symbol
+      except Exception as e:
+        print('Error:', e)
 
     # If symbol is unknown, try to get the last used symbol
     if symbol == UNKNOWN:
@@ -5,21 +5,35 @@ Financial data nodes for the Financial Assistant application.
 from langchain_core.runnables.config import RunnableConfig
 from graph.state.graph_state import GraphState
 from graph.state.internal_state import InternalState
-from classes.income_statement import IncomeStatement, get_income_statement
-from classes.company_financials import CompanyFinancials, get_company_financials
-from classes.stock_price import StockPrice, get_stock_price
-from methods.generate_methods import generate_markdown_financials, generate_markdown_income_statement, generate_markdown_stock_price
-from consts.consts import UNKNOWN, KEY_SYMBOL, KEY_INCOME_STATEMENT, KEY_COMPANY_FINANCIALS, KEY_STOCK_PRICE
+from classes.income_statement_history import IncomeStatementHistory, get_income_statement_history, aget_income_statement_history
+from classes.company_financials import CompanyFinancials, get_company_financials, aget_company_financials
+from classes.stock_price import StockPrice, get_stock_price, aget_stock_price
+from classes.price_history import PriceHistory, get_price_history, aget_price_history, get_stored_indicators, months_from_request
+from methods.price_store import get_price_store
+from methods.circuit_breaker import get_fmp_circuit_breakers
+from methods.generate_methods import generate_markdown_financials, generate_markdown_income_statement, generate_markdown_income_statement_trends, generate_markdown_stock_price, generate_markdown_price_history, generate_markdown_indicators, generate_markdown_unavailable
+from consts.consts import (
+  UNKNOWN, KEY_SYMBOL, KEY_REQUEST, KEY_INCOME_STATEMENT, KEY_COMPANY_FINANCIALS, KEY_STOCK_PRICE, KEY_PRICE_HISTORY,
+  FMP_ENDPOINT_INCOME_STATEMENT, FMP_ENDPOINT_PROFILE, FMP_ENDPOINT_QUOTE, FMP_ENDPOINT_HISTORICAL_PRICE
+)
 from methods.util import get_fmp_api_key
 
+def _unavailable(endpoint: str, what: str) -> str | None:
+  """
+  Returns a degraded-service message when no data was obtained because the endpoint's circuit is open.
+  Cached entries are still served by the FMP cache, so this is only reached when there is nothing to show.
+  """
+  breaker = get_fmp_circuit_breakers().get(endpoint)
+  return generate_markdown_unavailable(what, breaker.retry_in()) if breaker.is_open() else None
+
 def get_income_statement_node(state: InternalState, config: RunnableConfig)->InternalState:
   symbol = state.get(KEY_SYMBOL, UNKNOWN)
   print('get_income_statement_node')
   print('Symbol:', symbol)
-  income_statement: IncomeStatement | None = get_income_statement(symbol, get_fmp_api_key(config))
-  if income_statement is None:
-    return {KEY_INCOME_STATEMENT: None}
-  result = generate_markdown_income_statement(income_statement)
+  history: IncomeStatementHistory | None = get_income_statement_history(symbol, get_fmp_api_key(config))
+  if history is None:
+    return {KEY_INCOME_STATEMENT: _unavailable(FMP_ENDPOINT_INCOME_STATEMENT, "Income Statement")}
+  result = generate_markdown_income_statement(history.latest()) + generate_markdown_income_statement_trends(history)
   return {KEY_INCOME_STATEMENT: result}
 
 def get_company_financials_node(state: InternalState, config: RunnableConfig)->InternalState:
@@ -28,7 +42,7 @@ def get_company_financials_node(state: InternalState, config: RunnableConfig)->I
   print('Symbol:', symbol)
   info: CompanyFinancials | None= get_company_financials(symbol, get_fmp_api_key(config))
   if info is None:
-    return {KEY_COMPANY_FINANCIALS: None}
+    return {KEY_COMPANY_FINANCIALS: _unavailable(FMP_ENDPOINT_PROFILE, "Company Overview")}
   result = generate_markdown_financials(info)
   return {KEY_COMPANY_FINANCIALS: result}
 
@@ -38,6 +52,73 @@ def get_stock_price_node(state: InternalState, config: RunnableConfig)->Internal
   print('Symbol:', symbol)
   stock_price: StockPrice | None= get_stock_price(symbol, get_fmp_api_key(config))
   if stock_price is None:
-    return {KEY_STOCK_PRICE: None}
-  result = generate_markdown_stock_price(stock_price)
+    return {KEY_STOCK_PRICE: _unavailable(FMP_ENDPOINT_QUOTE, "Stock Price Information")}
+  result = generate_markdown_stock_price(stock_price) + generate_markdown_indicators(get_stored_indicators(symbol))
+  return {KEY_STOCK_PRICE: result}
+
+def get_price_history_node(state: GraphState, config: RunnableConfig)->InternalState:
+  """
+  Answers how a symbol has performed over the period named in the request from the local price store.
+  """
+  symbol = state.get(KEY_SYMBOL, UNKNOWN)
+  print('get_price_history_node')
+  print('Symbol:', symbol)
+  months = months_from_request(state.get(KEY_REQUEST), get_price_store().today())
+  price_history: PriceHistory | None = get_price_history(symbol, get_fmp_api_key(config), months)
+  if price_history is None:
+    return {KEY_PRICE_HISTORY: _unavailable(FMP_ENDPOINT_HISTORICAL_PRICE, "Price History")}
+  result = generate_markdown_price_history(price_history) + generate_markdown_indicators(get_stored_indicators(symbol))
+  return {KEY_PRICE_HISTORY: result}
+
+async def aget_income_statement_node(state: InternalState, config: RunnableConfig)->InternalState:
+  """
+  Async variant of get_income_statement_node, used when the graph runs under ainvoke/astream.
+  """
+  symbol = state.get(KEY_SYMBOL, UNKNOWN)
+  print('aget_income_statement_node')
+  print('Symbol:', symbol)
+  history: IncomeStatementHistory | None = await aget_income_statement_history(symbol, get_fmp_api_key(config))
+  if history is None:
+    return {KEY_INCOME_STATEMENT: _unavailable(FMP_ENDPOINT_INCOME_STATEMENT, "Income Statement")}
+  result = generate_markdown_income_statement(history.latest()) + generate_markdown_income_statement_trends(history)
+  return {KEY_INCOME_STATEMENT: result}
+
+async def aget_company_financials_node(state: InternalState, config: RunnableConfig)->InternalState:
+  """
+  Async variant of get_company_financials_node, used when the graph runs under ainvoke/astream.
+  """
+  symbol = state.get(KEY_SYMBOL, UNKNOWN)
+  print('aget_company_financials_node')
+  print('Symbol:', symbol)
+  info: CompanyFinancials | None = await aget_company_financials(symbol, get_fmp_api_key(config))
+  if info is None:
+    return {KEY_COMPANY_FINANCIALS: _unavailable(FMP_ENDPOINT_PROFILE, "Company Overview")}
+  result = generate_markdown_financials(info)
+  return {KEY_COMPANY_FINANCIALS: result}
+
+async def aget_stock_price_node(state: InternalState, config: RunnableConfig)->InternalState:
+  """
+  Async variant of get_stock_price_node, used when the graph runs under ainvoke/astream.
+  """
+  symbol = state.get(KEY_SYMBOL, UNKNOWN)
+  print('aget_stock_price_node')
+  print('Symbol:', symbol)
+  stock_price: StockPrice | None = await aget_stock_price(symbol, get_fmp_api_key(config))
+  if stock_price is None:
+    return {KEY_STOCK_PRICE: _unavailable(FMP_ENDPOINT_QUOTE, "Stock Price Information")}
+  result = generate_markdown_stock_price(stock_price) + generate_markdown_indicators(get_stored_indicators(symbol))
   return {KEY_STOCK_PRICE: result}
+
+async def aget_price_history_node(state: GraphState, config: RunnableConfig)->InternalState:
+  """
+  Async variant of get_price_history_node, used when the graph runs under ainvoke/astream.
+  """
+  symbol = state.get(KEY_SYMBOL, UNKNOWN)
+  print('aget_price_history_node')
+  print('Symbol:', symbol)
+  months = months_from_request(state.get(KEY_REQUEST), get_price_store().today())
+  price_history: PriceHistory | None = await aget_price_history(symbol, get_fmp_api_key(config), months)
+  if price_history is None:
+    return {KEY_PRICE_HISTORY: _unavailable(FMP_ENDPOINT_HISTORICAL_PRICE, "Price History")}
+  result = generate_markdown_price_history(price_history) + generate_markdown_indicators(get_stored_indicators(symbol))
+  return {KEY_PRICE_HISTORY: result}
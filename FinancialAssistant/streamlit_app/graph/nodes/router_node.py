@@ -2,35 +2,79 @@
 Router node for the Financial Assistant application.
 """
 
+import re
 from langchain_core.runnables.config import RunnableConfig
 from langgraph.store.base import BaseStore
 from graph.state.graph_state import GraphState
 from graph.state.internal_state import InternalState
 from chains.route_chain import RouterResult, create_route_chain
-from consts.consts import KEY_REQUEST_CATEGORY
+from chains.route_extraction_chain import RouteExtraction, create_route_extraction_chain
+from consts.consts import KEY_REQUEST_CATEGORY, KEY_SYMBOL, UNKNOWN, COMBINED_ROUTING_MIN_CONFIDENCE
+from methods.fast_router import get_fast_router
+from methods.symbol_index import get_symbol_index
+from methods.summary_policy import get_summary_policy
 from methods.util import get_memory_manager, get_user_id
 
-def create_get_route_node(llm):
+_SYMBOL_PATTERN = re.compile(r"^[A-Z0-9][A-Z0-9.\-]{0,9}$")
+
+def confident_symbol(result: RouteExtraction, min_confidence: float = COMBINED_ROUTING_MIN_CONFIDENCE) -> str:
+  """
+  Returns the symbol of a combined route and extraction result, or UNKNOWN when the route
+  needs no symbol or the LLM was not sure enough of it to skip the extraction node.
+  """
+  symbol = (result.symbol or "").strip().upper()
+  if result.route == 'chat' or result.confidence < min_confidence or not _SYMBOL_PATTERN.match(symbol):
+    return UNKNOWN
+  return symbol
+
+def create_get_route_node(llm, combined: bool = False):
+  """
+  Creates the router node.
+
+  With combined set, the node routes and extracts the symbol in one LLM call and also
+  writes the symbol to the state: a confident symbol lets the graph skip the extraction
+  node, UNKNOWN sends the request through it as usual.
+  """
   print('create_get_route_node')
-  chain = create_route_chain(llm)
+  chain = create_route_extraction_chain(llm) if combined else create_route_chain(llm)
 
   def get_route_node(state: GraphState, config: RunnableConfig, store: BaseStore)->InternalState:
     print('router_node')
     print('State', state)
+    request = state.get('request')
+    # Always overwrite the symbol in combined mode, so one left in the state by an earlier turn is not reused
+    local_symbol = (get_symbol_index().resolve(request) or UNKNOWN) if combined else None
+
+    # Unmistakable requests are routed locally, saving an LLM round trip
+    fast_router = get_fast_router()
+    route = fast_router.classify(request)
+    if route is not None:
+      print('request_category:', route, '(fast path)')
+      if combined:
+        return {KEY_REQUEST_CATEGORY: route, KEY_SYMBOL: local_symbol if route != 'chat' else UNKNOWN}
+      return {KEY_REQUEST_CATEGORY: route}
 
     mem_store = get_memory_manager(store)
     # Get the user ID from the config if available
     user_id = get_user_id(config)
 
-    # Get conversation summary using the store parameter
-    summary = mem_store.get_conversation_summary(user_id) or ""
+    # Get conversation summary using the store parameter, with the turns it does not cover yet
+    summary = get_summary_policy().context(user_id, mem_store.get_conversation_summary(user_id))
 
     # Pass the summary as a separate property
-    result: RouterResult = chain.invoke({
-        "request": state.get('request'),
+    result: RouterResult | RouteExtraction = chain.invoke({
+        "request": request,
         "conversation_summary": summary
     })
 
+    fast_router.record_llm_route(result.route)
     print('request_category:', result.route)
+    if combined:
+      # A symbol the local index resolved is preferred over the LLM's
+      symbol = UNKNOWN if result.route == 'chat' else (
+        local_symbol if local_symbol != UNKNOWN else confident_symbol(result)
+      )
+      print('symbol:', symbol, f'(LLM: {result.symbol}, confidence {result.confidence:.2f})')
+      return {KEY_REQUEST_CATEGORY: result.route, KEY_SYMBOL: symbol}
     return {KEY_REQUEST_CATEGORY:result.route}
   return get_route_node
@@ -2,7 +2,11 @@
 Summarization Node for Financial Assistant.
 
 This module provides a node for summarizing conversations and updating memory
-in the Financial Assistant workflow.
+in the Financial Assistant workflow. The summary is written by a background
+task queue after the answer has been returned, one task at a time per user,
+so the user never waits for the summarization LLM call and summaries never
+race; the next turn reads the latest completed summary. A SummaryPolicy
+decides when turns are summarized and how much of them reaches the LLM.
 """
 
 from langgraph.store.base import BaseStore
@@ -10,27 +14,33 @@ from graph.state.graph_state import GraphState
 from chains.summarization_chain import create_summarization_chain
 from methods.memory_manager import MemoryManager
 from langchain_core.runnables.config import RunnableConfig
+from typing import Optional
+from methods.summary_policy import SummaryPolicy, get_summary_policy
+from methods.task_queue import KeyedTaskQueue, get_summary_queue
 from methods.util import get_memory_manager, get_user_id
 
 
-def create_summarization_node(llm):
+def create_summarization_node(llm, queue: Optional[KeyedTaskQueue] = None, policy: Optional[SummaryPolicy] = None):
     """
     Creates a node for summarizing conversations and updating memory.
-    This node should be placed right before the final answer node.
+    This node should be placed right after the final answer node.
 
     Args:
         llm: The language model to use for summarization
-        memory_manager: The memory manager instance (not used directly in the node)
+        queue: Queue running the summaries; defaults to the process-wide one
+        policy: Decides when to summarize and compresses the turns; defaults to the process-wide one
 
     Returns:
         A function that takes state, config, and store and returns updated state
     """
+    policy = policy or get_summary_policy()
     # Create the summarization chain
-    summarization_chain = create_summarization_chain(llm)
+    summarization_chain = create_summarization_chain(llm, max_words=policy.max_summary_words)
 
     def summarization_node(state: GraphState, config: RunnableConfig, store: BaseStore):
         """
-        Summarizes the conversation and updates the summary in the memory manager.
+        Records the turn and the last symbol, and queues the update of the conversation
+        summary when the policy says the recorded turns are due.
 
         Args:
             state: The current state of the graph
@@ -45,40 +55,43 @@ def create_summarization_node(llm):
         # Get the user ID from the config if available
         user_id = get_user_id(config)
         mem_store = get_memory_manager(store)
-        # Get existing summary using the store parameter
-        existing_summary = mem_store.get_conversation_summary(user_id) or "No previous summary available."
 
-        # Format the conversation for summarization
-        request = state.get('request', 'No request')
-        final_answer = state.get('final_answer', 'No answer')
-        request_category = state.get('request_category', 'unknown')
-        symbol = state.get('symbol', 'UNKNOWN')
-
-        # Build a conversation string with metadata
-        conversation = f"User: {request}\n"
-        conversation += f"Request Type: {request_category.replace('_', ' ').title()}\n"
-
-        # Add symbol information if available and relevant
-        if symbol != 'UNKNOWN' and request_category != 'chat':
-            conversation += f"Company Symbol: {symbol}\n"
-
-        # Add the final answer which already contains all outputs
-        conversation += f"Assistant: {final_answer}\n"
-
-        # Prepare inputs for the summarization chain
-        chain_inputs = {
-            "existing_summary": existing_summary,
-            "conversation": conversation
-        }
-
-        # Generate the summary
-        result = summarization_chain.invoke(chain_inputs)
-        summary = result.summary
-
-        # Update the summary in memory using the store parameter
-        mem_store.update_conversation_summary(user_id, summary)
-
-        # If there's a symbol in the state, update the last symbol using the store parameter
+        # Record the turn, with the answer compressed into compact facts
+        turn = policy.format_turn(
+            state.get('request', 'No request'),
+            state.get('request_category', 'unknown'),
+            state.get('symbol', 'UNKNOWN'),
+            state.get('final_answer', 'No answer'),
+        )
+        due = policy.add_turn(user_id, turn)
+
+        if due:
+            # The turns are claimed now, so turns arriving while this summary runs go to the next one
+            claim, turns = policy.claim(user_id)
+
+            def summarize():
+                # Read the summary when the task runs, so it includes the user's previous turns
+                existing_summary = mem_store.get_conversation_summary(user_id) or "No previous summary available."
+
+                # Prepare inputs for the summarization chain
+                chain_inputs = {
+                    "existing_summary": existing_summary,
+                    "conversation": "\n".join(turns)
+                }
+
+                # Generate the summary; if that fails the turns go to the next summary instead
+                try:
+                    result = summarization_chain.invoke(chain_inputs)
+                    # Update the summary in memory using the store parameter
+                    mem_store.update_conversation_summary(user_id, policy.cap_summary(result.summary))
+                except Exception:
+                    policy.release(user_id, claim)
+                    raise
+                policy.mark_summarized(user_id, claim)
+
+            (queue or get_summary_queue()).submit(user_id, summarize)
+
+        # The next turn may need the symbol before the summary is done, so it is stored right away
         symbol = state.get("symbol")
         if symbol and symbol != "UNKNOWN":
             mem_store.update_last_symbol(user_id, symbol)
@@ -6,7 +6,7 @@ from graph.state.graph_state import GraphState
 from graph.state.internal_state import InternalState
 from consts.consts import (
     UNKNOWN, KEY_SYMBOL, KEY_ERROR, KEY_REQUEST_CATEGORY, 
-    KEY_INCOME_STATEMENT, KEY_COMPANY_FINANCIALS, KEY_STOCK_PRICE, 
+    KEY_INCOME_STATEMENT, KEY_COMPANY_FINANCIALS, KEY_STOCK_PRICE, KEY_PRICE_HISTORY,
     KEY_CHAT_RESPONSE, KEY_REPORT_MD, KEY_FINAL_ANSWER
 )
 
@@ -41,6 +41,16 @@ def where_to(state: GraphState) -> str | None:
         return 'chat'
     return 'alone'
 
+def where_to_combined(state: GraphState) -> str | None:
+    """
+    Determines which path to take when the router also extracted the symbol: requests with
+    a known symbol go straight to their data nodes, the others through symbol extraction.
+    """
+    route = where_to(state)
+    if route == 'chat' or not is_there_symbol(state):
+        return route
+    return 'report_ready' if route == 'report' else state.get(KEY_REQUEST_CATEGORY)
+
 def where_to_alone(state: InternalState)-> str | None:
     """Determines which standalone node to use."""
     symbol = state.get(KEY_SYMBOL, UNKNOWN)
@@ -75,6 +85,13 @@ def final_answer_node(state: InternalState)-> GraphState:
             result_data = state.get(KEY_STOCK_PRICE) or ""
             symbol: str = state.get(KEY_SYMBOL) or UNKNOWN
             result = f"# Stock Price for ({symbol}) \n" + result_data
+    elif category == 'price_history':
+        if KEY_ERROR in state:
+            result = state[KEY_ERROR]
+        else:
+            result_data = state.get(KEY_PRICE_HISTORY) or ""
+            symbol: str = state.get(KEY_SYMBOL) or UNKNOWN
+            result = f"# Price history for ({symbol}) \n" + result_data
     elif category == 'chat':
         result = state.get(KEY_CHAT_RESPONSE) or "No response available"
     elif category == 'report':
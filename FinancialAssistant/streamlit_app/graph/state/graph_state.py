@@ -9,6 +9,7 @@ class GraphState(TypedDict, total=False):
         income_statement: The income statement of the company.
         company_financials: The company financials of the company.
         stock_price: The stock price of the company.
+        price_history: The price performance of the company over the requested period.
         report_md: The markdown report of the company.
         extraction_chain: The extraction chain of the company.
         chat_chain: The chat chain of the company.
@@ -23,6 +24,7 @@ class GraphState(TypedDict, total=False):
   income_statement: str
   company_financials: str
   stock_price: str
+  price_history: str
   report_md: str
   # extraction_chain: Any
   # chat_chain: Any
@@ -9,6 +9,7 @@ class InternalState(TypedDict, total=False):
         income_statement: The income statement of the company.
         company_financials: The company financials of the company.
         stock_price: The stock price of the company.
+        price_history: The price performance of the company over the requested period.
         report_md: The markdown report of the company.
         error: The error message of the company.
         request_category: The request category of the company.
@@ -19,6 +20,7 @@ class InternalState(TypedDict, total=False):
   income_statement: Optional[str]
   company_financials: Optional[str]
   stock_price: Optional[str]
+  price_history: Optional[str]
   report_md: Optional[str]
   error: Optional[str]
   chat_response: Optional[str]
@@ -11,6 +11,9 @@ except ImportError:
     streamlit_app_dir = current_dir.parent
     sys.path.insert(0, str(streamlit_app_dir))
 
+import os
+from typing import Optional
+from langchain_core.runnables import RunnableLambda
 from langgraph.graph import END, StateGraph
 from langgraph.checkpoint.memory import MemorySaver
 from consts.consts import (
@@ -18,39 +21,65 @@ from consts.consts import (
     NODE_COMPANY_FINANCIALS, NODE_ERROR, NODE_REPORT, NODE_PASS,
     NODE_ROUTER, NODE_SYMBOL_EXTRACTION_REPORT, NODE_SYMBOL_EXTRACTION_ALONE,
     NODE_STOCK_PRICE_STAND_ALONE, NODE_INCOME_STATEMENT_STAND_ALONE,
-    NODE_COMPANY_FINANCIALS_STAND_ALONE, NODE_CHAT, NODE_FINAL_ANSWER, NODE_GENERATE_REPORT,
-    NODE_SUMMARIZE  # Added summarize node constant
+    NODE_COMPANY_FINANCIALS_STAND_ALONE, NODE_PRICE_HISTORY_STAND_ALONE, NODE_CHAT, NODE_FINAL_ANSWER, NODE_GENERATE_REPORT,
+    NODE_SUMMARIZE,  # Added summarize node constant
+    COMBINED_ROUTING_ENABLED
 )
 from graph.state.graph_state import GraphState
 from graph.nodes import (
     get_income_statement_node, get_company_financials_node, get_stock_price_node,
+    aget_income_statement_node, aget_company_financials_node, aget_stock_price_node,
+    get_price_history_node, aget_price_history_node,
     error_node, generate_markdown_report_node, is_there_symbol,
-    create_get_route_node, create_chat_node, where_to, where_to_alone,
+    create_get_route_node, create_chat_node, where_to, where_to_combined, where_to_alone,
     final_answer_node, create_symbol_extraction_node, create_summarization_node
 )
 from methods.memory_manager import MemoryManager
 
-def create_workflow(llm):
+def combined_routing_from_env() -> bool:
+    """Whether COMBINED_ROUTING asks for the router to extract the symbol as well."""
+    value = os.environ.get("COMBINED_ROUTING")
+    return COMBINED_ROUTING_ENABLED if value is None else value == "1"
+
+def create_workflow(llm, combined_routing: Optional[bool] = None):
+    """
+    Creates the compiled graph.
+
+    Args:
+        llm: The language model of the chains
+        combined_routing: Route and extract the symbol in one LLM call, skipping the extraction
+            node when the symbol is confident; defaults to the COMBINED_ROUTING environment variable
+    """
+    if combined_routing is None:
+        combined_routing = combined_routing_from_env()
+
     # Create a global memory manager instance
     memory_manager = MemoryManager()
 
     workflow = StateGraph(GraphState)
 
     # Add nodes to workflow
-    workflow.add_node(NODE_ROUTER, create_get_route_node(llm),)
+    workflow.add_node(NODE_ROUTER, create_get_route_node(llm, combined=combined_routing),)
     workflow.add_node(NODE_SYMBOL_EXTRACTION_REPORT, create_symbol_extraction_node(llm))
     workflow.add_node(NODE_SYMBOL_EXTRACTION_ALONE, create_symbol_extraction_node(llm))
     workflow.add_node(NODE_CHAT, create_chat_node(llm))
     workflow.add_node(NODE_SUMMARIZE, create_summarization_node(llm))
 
+    # Data nodes run the sync fetchers under invoke/stream and the async ones under ainvoke/astream
+    income_statement_node = RunnableLambda(get_income_statement_node, afunc=aget_income_statement_node)
+    company_financials_node = RunnableLambda(get_company_financials_node, afunc=aget_company_financials_node)
+    stock_price_node = RunnableLambda(get_stock_price_node, afunc=aget_stock_price_node)
+    price_history_node = RunnableLambda(get_price_history_node, afunc=aget_price_history_node)
+
     # Add other existing nodes
     workflow.add_node(NODE_PASS, lambda state: state)
-    workflow.add_node(NODE_INCOME_STATEMENT, get_income_statement_node)
-    workflow.add_node(NODE_COMPANY_FINANCIALS, get_company_financials_node)
-    workflow.add_node(NODE_STOCK_PRICE, get_stock_price_node)
-    workflow.add_node(NODE_INCOME_STATEMENT_STAND_ALONE, get_income_statement_node)
-    workflow.add_node(NODE_COMPANY_FINANCIALS_STAND_ALONE, get_company_financials_node)
-    workflow.add_node(NODE_STOCK_PRICE_STAND_ALONE, get_stock_price_node)
+    workflow.add_node(NODE_INCOME_STATEMENT, income_statement_node)
+    workflow.add_node(NODE_COMPANY_FINANCIALS, company_financials_node)
+    workflow.add_node(NODE_STOCK_PRICE, stock_price_node)
+    workflow.add_node(NODE_INCOME_STATEMENT_STAND_ALONE, income_statement_node)
+    workflow.add_node(NODE_COMPANY_FINANCIALS_STAND_ALONE, company_financials_node)
+    workflow.add_node(NODE_STOCK_PRICE_STAND_ALONE, stock_price_node)
+    workflow.add_node(NODE_PRICE_HISTORY_STAND_ALONE, price_history_node)
     workflow.add_node(NODE_FINAL_ANSWER, final_answer_node)
     workflow.add_node(NODE_GENERATE_REPORT, generate_markdown_report_node)
     workflow.add_node(NODE_ERROR, error_node)
@@ -58,11 +87,24 @@ def create_workflow(llm):
     # Set entry point
     workflow.set_entry_point(NODE_ROUTER)
 
-    workflow.add_conditional_edges(NODE_ROUTER, where_to,  path_map={
-        'report': NODE_SYMBOL_EXTRACTION_REPORT,
-        'alone': NODE_SYMBOL_EXTRACTION_ALONE,
-        'chat': NODE_CHAT
-    })
+    if combined_routing:
+        # The router already wrote the symbol; only requests without a confident one are extracted again
+        workflow.add_conditional_edges(NODE_ROUTER, where_to_combined,  path_map={
+            'report': NODE_SYMBOL_EXTRACTION_REPORT,
+            'alone': NODE_SYMBOL_EXTRACTION_ALONE,
+            'chat': NODE_CHAT,
+            'report_ready': NODE_PASS,
+            'income_statement': NODE_INCOME_STATEMENT_STAND_ALONE,
+            'company_financials': NODE_COMPANY_FINANCIALS_STAND_ALONE,
+            'stock_price': NODE_STOCK_PRICE_STAND_ALONE,
+            'price_history': NODE_PRICE_HISTORY_STAND_ALONE,
+        })
+    else:
+        workflow.add_conditional_edges(NODE_ROUTER, where_to,  path_map={
+            'report': NODE_SYMBOL_EXTRACTION_REPORT,
+            'alone': NODE_SYMBOL_EXTRACTION_ALONE,
+            'chat': NODE_CHAT
+        })
 
     workflow.add_conditional_edges(NODE_SYMBOL_EXTRACTION_REPORT, is_there_symbol, {True:NODE_PASS, False: NODE_ERROR})
     workflow.add_conditional_edges(NODE_SYMBOL_EXTRACTION_ALONE, where_to_alone, {
@@ -70,6 +112,7 @@ def create_workflow(llm):
         'income_statement': NODE_INCOME_STATEMENT_STAND_ALONE,
         'company_financials': NODE_COMPANY_FINANCIALS_STAND_ALONE,
         'stock_price': NODE_STOCK_PRICE_STAND_ALONE,
+        'price_history': NODE_PRICE_HISTORY_STAND_ALONE,
         })
 
     # workflow.add_conditional_edges(ROUTER, lambda x: x['request_category'],  path_map={
@@ -97,6 +140,7 @@ def create_workflow(llm):
     workflow.add_edge(NODE_INCOME_STATEMENT_STAND_ALONE,NODE_FINAL_ANSWER)
     workflow.add_edge(NODE_COMPANY_FINANCIALS_STAND_ALONE,NODE_FINAL_ANSWER)
     workflow.add_edge(NODE_STOCK_PRICE_STAND_ALONE,NODE_FINAL_ANSWER)
+    workflow.add_edge(NODE_PRICE_HISTORY_STAND_ALONE,NODE_FINAL_ANSWER)
     workflow.add_edge(NODE_CHAT,NODE_FINAL_ANSWER)
 
     # Add summarization node before END
@@ -112,10 +156,9 @@ def create_workflow(llm):
     return app
 
 
-def _create_llm_for_server():
-    """Create LLM using existing config system for LangGraph server"""
+def _create_config_for_server():
+    """Load the config of the first LLM provider with valid keys in the environment"""
     from utils.config_loader import create_config_from_env
-    from methods.util import get_llm
     import os
     from consts.consts import PROVIDER_GROQ
 
@@ -135,7 +178,7 @@ def _create_llm_for_server():
         config = create_config_from_env(provider)
         if config is not None:
             print(f"Successfully loaded configuration for {provider}")
-            return get_llm(config)
+            return config
     
     # If no provider worked, show helpful error message
     raise ValueError(
@@ -147,8 +190,20 @@ def _create_llm_for_server():
     )
 
 
+def _create_llm_for_server():
+    """Create LLM using existing config system for LangGraph server"""
+    from methods.util import get_llm
+    return get_llm(_create_config_for_server())
+
+
 # Entry point for LangGraph server
 def create_graph():
     """Factory function for LangGraph server using existing config system"""
-    llm = _create_llm_for_server()
-    return create_workflow(llm)
\ No newline at end of file
+    from methods.util import get_llm
+    from methods.warm_up import start_warm_up
+
+    config = _create_config_for_server()
+    llm = get_llm(config)
+    # Open connections and load the watchlist into the FMP cache while the server starts
+    start_warm_up(llm, config.fmp_api_key)
+    return create_workflow(llm)
@@ -0,0 +1,98 @@
+"""
+Background refresher for the FMP response cache.
+
+Refreshes are run on a small pool of worker threads at background priority,
+so they never compete with interactive requests for the rate limit. A sweep
+thread periodically asks the cache for hot entries that are about to expire.
+"""
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+from consts.consts import FMP_REFRESH_INTERVAL, FMP_REFRESH_WORKERS, PRIORITY_BACKGROUND
+from methods.rate_limiter import priority_floor
+
+
+class CacheRefresher:
+    """
+    Runs cache refreshes in the background, at most one per key at a time.
+
+    Args:
+        workers: Refreshes running at once; 0 runs them inline in the caller, e.g. in tests
+        interval: Seconds between sweeps for entries to refresh ahead of expiry
+    """
+
+    def __init__(self, workers: int = FMP_REFRESH_WORKERS, interval: float = FMP_REFRESH_INTERVAL):
+        self.workers = workers
+        self.interval = interval
+        self.completed = 0
+        self.failed = 0
+        self._pending: set[Hashable] = set()
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._sweeper: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+
+    def submit(self, key: Hashable, refresh: Callable[[], Any]) -> bool:
+        """
+        Schedule refresh() for key unless a refresh for it is already pending.
+
+        Returns:
+            True if the refresh was scheduled
+        """
+        with self._lock:
+            if key in self._pending:
+                return False
+            self._pending.add(key)
+            if self.workers > 0 and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="fmp-refresh")
+            executor = self._executor
+        if executor is None:
+            self._run(key, refresh)
+        else:
+            executor.submit(self._run, key, refresh)
+        return True
+
+    def _run(self, key: Hashable, refresh: Callable[[], Any]) -> None:
+        try:
+            with priority_floor(PRIORITY_BACKGROUND):
+                refresh()
+            with self._lock:
+                self.completed += 1
+        except Exception as e:
+            print ("Error:",f"Could not refresh {key}: {e}")
+            with self._lock:
+                self.failed += 1
+        finally:
+            with self._lock:
+                self._pending.discard(key)
+
+    def start(self, sweep: Callable[[], Any]) -> None:
+        """
+        Call sweep() every interval seconds on a daemon thread; does nothing if already started.
+        """
+        with self._lock:
+            if self._sweeper is not None or self.interval <= 0:
+                return
+            self._sweeper = threading.Thread(target=self._sweep_loop, args=(sweep,), name="fmp-sweep", daemon=True)
+            self._sweeper.start()
+
+    def _sweep_loop(self, sweep: Callable[[], Any]) -> None:
+        while not self._stopped.wait(self.interval):
+            try:
+                sweep()
+            except Exception as e:
+                print ("Error:",f"Cache sweep failed: {e}")
+
+    def pending(self) -> int:
+        """Return the number of refreshes scheduled or running."""
+        with self._lock:
+            return len(self._pending)
+
+    def stop(self) -> None:
+        """Stop sweeping and wait for running refreshes to finish."""
+        self._stopped.set()
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
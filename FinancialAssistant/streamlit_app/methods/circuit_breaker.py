@@ -0,0 +1,178 @@
+"""
+Per-endpoint circuit breakers for the Financial Modeling Prep API.
+
+Each FMP endpoint has a breaker that records the outcome of every request
+over a sliding window. When the failure rate crosses the threshold the
+circuit opens and requests to that endpoint fail fast with CircuitOpenError
+instead of waiting for timeouts. After a cool-down one probe request is let
+through (half-open); its outcome closes the circuit or opens it again.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Optional
+import httpx
+import requests
+from consts.consts import (
+    FMP_BREAKER_FAILURE_RATE, FMP_BREAKER_MIN_CALLS, FMP_BREAKER_WINDOW, FMP_BREAKER_OPEN_SECONDS
+)
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(requests.RequestException, httpx.HTTPError):
+    """
+    Raised instead of calling an endpoint whose circuit is open.
+
+    It derives from both requests.RequestException and httpx.HTTPError, so
+    the sync and async fetchers handle it like any other network failure.
+    """
+
+    def __init__(self, endpoint: str, retry_in: float):
+        requests.RequestException.__init__(self, f"FMP {endpoint} is unavailable, retry in {retry_in:.0f}s")
+        self.endpoint = endpoint
+        self.retry_in = retry_in
+
+
+class CircuitBreaker:
+    """
+    Thread-safe circuit breaker over a sliding window of request outcomes.
+
+    Args:
+        failure_rate: Failure rate within the window that opens the circuit
+        min_calls: Calls within the window before the failure rate is considered
+        window: Seconds of outcomes kept
+        open_seconds: Seconds the circuit stays open before a probe is allowed
+        clock: Function returning the current time in seconds
+    """
+
+    def __init__(
+        self,
+        failure_rate: float = FMP_BREAKER_FAILURE_RATE,
+        min_calls: int = FMP_BREAKER_MIN_CALLS,
+        window: float = FMP_BREAKER_WINDOW,
+        open_seconds: float = FMP_BREAKER_OPEN_SECONDS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_rate = failure_rate
+        self.min_calls = min_calls
+        self.window = window
+        self.open_seconds = open_seconds
+        self.clock = clock
+        self.state = STATE_CLOSED
+        self.opened_at = 0.0
+        self.rejected = 0
+        self._outcomes: deque[tuple[float, bool]] = deque()
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        """
+        Return whether a request may be sent now; an open circuit lets one probe through after the cool-down.
+        """
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return True
+            if self.state == STATE_OPEN and self.clock() - self.opened_at >= self.open_seconds:
+                self.state = STATE_HALF_OPEN
+            if self.state == STATE_HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            self.rejected += 1
+            return False
+
+    def retry_in(self) -> float:
+        """Return the seconds until the circuit lets a probe through."""
+        with self._lock:
+            if self.state == STATE_CLOSED:
+                return 0.0
+            return max(0.0, self.opened_at + self.open_seconds - self.clock())
+
+    def is_open(self) -> bool:
+        """Return whether requests are currently being rejected."""
+        with self._lock:
+            return self.state != STATE_CLOSED
+
+    def record_success(self) -> None:
+        """Record a successful request; a successful probe closes the circuit."""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self.state = STATE_CLOSED
+                self._probing = False
+                self._outcomes.clear()
+            self._record(True)
+
+    def record_failure(self) -> None:
+        """Record a failed request, opening the circuit when the failure rate is too high."""
+        with self._lock:
+            if self.state == STATE_HALF_OPEN:
+                self._open()
+                return
+            self._record(False)
+            failures = sum(1 for _, ok in self._outcomes if not ok)
+            if len(self._outcomes) >= self.min_calls and failures / len(self._outcomes) >= self.failure_rate:
+                self._open()
+
+    def _record(self, ok: bool) -> None:
+        now = self.clock()
+        self._outcomes.append((now, ok))
+        while self._outcomes and self._outcomes[0][0] <= now - self.window:
+            self._outcomes.popleft()
+
+    def _open(self) -> None:
+        self.state = STATE_OPEN
+        self.opened_at = self.clock()
+        self._probing = False
+        self._outcomes.clear()
+
+
+class CircuitBreakers:
+    """
+    One CircuitBreaker per FMP endpoint, created on first use.
+    """
+
+    def __init__(self, factory: Callable[[], CircuitBreaker] = CircuitBreaker):
+        self.factory = factory
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, endpoint: str) -> CircuitBreaker:
+        """Return the breaker of an endpoint."""
+        with self._lock:
+            breaker = self._breakers.get(endpoint)
+            if breaker is None:
+                breaker = self._breakers[endpoint] = self.factory()
+            return breaker
+
+    def clear(self) -> None:
+        """Forget every breaker, closing all circuits."""
+        with self._lock:
+            self._breakers.clear()
+
+    def stats(self) -> dict[str, dict[str, float]]:
+        """Return the state, rejected calls and remaining open time of every endpoint."""
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {
+            endpoint: {"state": breaker.state, "rejected": breaker.rejected, "retry_in": breaker.retry_in()}
+            for endpoint, breaker in breakers.items()
+        }
+
+
+_breakers: Optional[CircuitBreakers] = None
+_breakers_lock = threading.Lock()
+
+
+def get_fmp_circuit_breakers() -> CircuitBreakers:
+    """
+    Return the process-wide FMP circuit breakers, shared by the sync and async clients.
+    """
+    global _breakers
+    if _breakers is None:
+        with _breakers_lock:
+            if _breakers is None:
+                _breakers = CircuitBreakers()
+    return _breakers
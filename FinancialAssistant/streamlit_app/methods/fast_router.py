@@ -0,0 +1,192 @@
+"""
+Rule-based fast path for request routing.
+
+Most requests name what they want in so many words ("AAPL stock price",
+"income statement of Tesla"), and sending those to the LLM router costs a
+full round trip for an answer a few regular expressions can give. FastRouter
+scores a request against a weighted lexicon for every route and only decides
+when one route clearly wins and, for a data route, the request names a company
+("What is EBITDA?" is a chat question); everything else, including anything
+that needs the conversation summary to be understood, falls back to the LLM
+route chain.
+Decisions are counted so the share handled locally can be monitored.
+"""
+
+import os
+import re
+import threading
+from collections import Counter
+from typing import Optional
+from consts.consts import FAST_ROUTER_MIN_SCORE, FAST_ROUTER_MIN_MARGIN
+from methods.symbol_index import SymbolIndex, get_symbol_index
+
+ROUTE_INCOME_STATEMENT = "income_statement"
+ROUTE_REPORT = "report"
+ROUTE_COMPANY_FINANCIALS = "company_financials"
+ROUTE_STOCK_PRICE = "stock_price"
+ROUTE_PRICE_HISTORY = "price_history"
+ROUTE_CHAT = "chat"
+
+_PERIOD = r"(?:\d+|a|one|two|three|four|five|six|nine|twelve)[\s-]*(?:day|week|month|year)s?"
+
+# (pattern, weight) per route; a strong phrase alone reaches FAST_ROUTER_MIN_SCORE
+LEXICON: dict[str, list[tuple[str, float]]] = {
+    ROUTE_STOCK_PRICE: [
+        (r"\b(?:stock|share)\s+price\b", 3.0),
+        (r"\bprice\s+(?:of|for)\b", 2.0),
+        (r"\b(?:current|latest|today'?s)\s+(?:stock\s+|share\s+)?price\b", 3.0),
+        (r"\bquote\b", 2.0),
+        (r"\btrading\s+at\b", 3.0),
+        (r"\bhow\s+much\s+is\b.*\b(?:stock|share)s?\b", 3.0),
+        (r"\b(?:p/?e|pe\s+ratio|price[\s-]to[\s-]earnings)\b", 2.0),
+        (r"\bprice\b", 1.0),
+    ],
+    ROUTE_PRICE_HISTORY: [
+        (r"\b(?:price|stock|share)\s+(?:history|performance|chart)\b", 4.0),
+        (r"\bhistorical\s+(?:stock\s+|share\s+)?prices?\b", 4.0),
+        (r"\bperform(?:ed|ance|ing)?\b", 2.0),
+        (r"\b(?:return|returns|gain|gains|moved?|changed?)\b", 1.0),
+        (r"\b(?:over|in|during|for)\s+the\s+(?:last|past)\b", 2.0),
+        (r"\b(?:last|past)\s+" + _PERIOD + r"\b", 2.0),
+        (r"\b(?:ytd|year[\s-]to[\s-]date)\b", 3.0),
+        (r"\b(?:rsi|macd|moving\s+averages?|volatility|drawdown)\b", 3.0),
+    ],
+    ROUTE_INCOME_STATEMENT: [
+        (r"\bincome\s+statements?\b", 4.0),
+        (r"\b(?:p&l|profit\s+and\s+loss)\b", 4.0),
+        (r"\b(?:revenue|revenues|sales|turnover)\b", 2.0),
+        (r"\b(?:net\s+income|gross\s+profit|ebitda|operating\s+income)\b", 3.0),
+        (r"\b(?:eps|earnings\s+per\s+share)\b", 2.0),
+        (r"\b(?:margins?|profit|profits|profitability|earnings)\b", 1.5),
+    ],
+    ROUTE_COMPANY_FINANCIALS: [
+        (r"\b(?:company\s+)?financials\b", 4.0),
+        (r"\bfinancial\s+(?:position|data|information|info|profile|details)\b", 3.0),
+        (r"\bcompany\s+(?:profile|info|information|details)\b", 3.0),
+        (r"\b(?:market\s+cap(?:italization)?|mkt\s+cap)\b", 3.0),
+        (r"\b(?:industry|sector|beta|website)\b", 2.0),
+    ],
+    ROUTE_REPORT: [
+        (r"\breports?\b", 4.0),
+        (r"\boverview\b", 3.0),
+        (r"\btell\s+me\s+(?:everything\s+)?about\b", 3.0),
+        (r"\b(?:full|complete|comprehensive)\s+(?:analysis|picture|summary|rundown)\b", 3.0),
+        (r"\b(?:business|analysis)\b", 1.0),
+    ],
+    ROUTE_CHAT: [
+        (r"^\s*(?:hi|hello|hey|good\s+(?:morning|afternoon|evening))\b[\s!.]*$", 5.0),
+        (r"^\s*(?:thanks|thank\s+you|thx|ok|okay|great|cool|bye|goodbye)\b[\s!.]*$", 5.0),
+        (r"\b(?:who|what)\s+are\s+you\b|\bwhat\s+can\s+you\s+do\b", 5.0),
+        (r"\bwhat\s+do\s+you\s+think\b|\byour\s+(?:opinion|thoughts|view)\b", 3.0),
+        (r"\b(?:should\s+i|would\s+you|do\s+you\s+recommend|is\s+it\s+a\s+good)\b", 3.0),
+        (r"\bgood\s+(?:sign|buy|investment|time\s+to)\b|\bany\s+thoughts\b", 3.0),
+        (r"\b(?:thoughts|opinion|explain|why)\b", 1.5),
+    ],
+}
+
+_CASHTAG_PATTERN = re.compile(r"(?<![\w$])\$[A-Za-z][A-Za-z.\-]{0,9}\b")
+
+_COMPILED = {route: [(re.compile(pattern, re.IGNORECASE), weight) for pattern, weight in patterns]
+             for route, patterns in LEXICON.items()}
+
+
+class FastRouter:
+    """
+    Thread-safe lexicon scorer that routes unmistakable requests without the LLM.
+
+    Args:
+        min_score: Score the best route needs to be taken locally
+        min_margin: Lead the best route needs over the runner-up
+        enabled: Whether to route locally at all; when False every request goes to the LLM
+        symbol_index: Index finding the company a request names; defaults to the process-wide one
+    """
+
+    def __init__(self, min_score: float = FAST_ROUTER_MIN_SCORE, min_margin: float = FAST_ROUTER_MIN_MARGIN,
+                 enabled: bool = True, symbol_index: Optional[SymbolIndex] = None):
+        self.min_score = min_score
+        self.min_margin = min_margin
+        self.enabled = enabled
+        self.symbol_index = symbol_index
+        self._decisions: Counter = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "FastRouter":
+        """
+        Create a router that is enabled unless FAST_ROUTER_ENABLED is "0".
+        """
+        return cls(enabled=os.environ.get("FAST_ROUTER_ENABLED", "1") != "0")
+
+    @staticmethod
+    def score(request: str) -> dict[str, float]:
+        """
+        Return the lexicon score of every route for a request.
+        """
+        return {
+            route: sum(weight for pattern, weight in patterns if pattern.search(request))
+            for route, patterns in _COMPILED.items()
+        }
+
+    def names_company(self, request: str) -> bool:
+        """Return whether a request names one company, by a $ticker or a listed ticker or name."""
+        if _CASHTAG_PATTERN.search(request):
+            return True
+        return (self.symbol_index or get_symbol_index()).resolve(request, record=False) is not None
+
+    def classify(self, request: Optional[str]) -> Optional[str]:
+        """
+        Return the route of a request when one route clearly wins, or None to ask the LLM.
+        """
+        route = None
+        if self.enabled and request:
+            ranked = sorted(self.score(request).items(), key=lambda item: item[1], reverse=True)
+            (best, best_score), (_, runner_up) = ranked[0], ranked[1]
+            if best_score >= self.min_score and best_score - runner_up >= self.min_margin:
+                # Keywords alone do not make a data request: "the price of gold" is a chat question
+                route = best if best == ROUTE_CHAT or self.names_company(request) else None
+        with self._lock:
+            self._decisions[route or "llm"] += 1
+        return route
+
+    def record_llm_route(self, route: str) -> None:
+        """Count the route the LLM chose for a request the fast path passed on."""
+        with self._lock:
+            self._decisions[f"llm:{route}"] += 1
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return how many requests were routed locally and by the LLM, the local fraction,
+        and the count of every route taken on either path.
+        """
+        with self._lock:
+            decisions = dict(self._decisions)
+        llm = decisions.pop("llm", 0)
+        local = sum(count for route, count in decisions.items() if not route.startswith("llm:"))
+        total = local + llm
+        return {
+            "local": local,
+            "llm": llm,
+            "local_fraction": local / total if total else 0.0,
+            **{f"route:{route}": count for route, count in sorted(decisions.items())},
+        }
+
+    def reset(self) -> None:
+        """Reset the decision counters."""
+        with self._lock:
+            self._decisions.clear()
+
+
+_router: Optional[FastRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_fast_router() -> FastRouter:
+    """
+    Return the process-wide fast router, creating it on first use.
+    """
+    global _router
+    if _router is None:
+        with _router_lock:
+            if _router is None:
+                _router = FastRouter.from_env()
+    return _router
@@ -0,0 +1,348 @@
+"""
+Process-wide TTL cache for Financial Modeling Prep responses.
+
+Entries are keyed by (endpoint, symbol, period) and hold the decoded JSON
+payload, so every fetcher built on top of the same endpoint shares them.
+Each endpoint has its own time to live, and the cache is bounded with
+least-recently-used eviction. An optional FMPDiskCache tier keeps payloads
+across restarts; entries found there are promoted into memory. Concurrent
+misses for the same key are coalesced into a single FMP request.
+
+With a CacheRefresher attached the cache works in stale-while-revalidate
+mode: get_or_fetch serves an entry up to its endpoint's max staleness past
+the TTL and refreshes it in the background. Keys that are read often are
+tracked as hot and refreshed shortly before they expire, so they are always
+served from memory. Proactive refreshes reuse the last synchronous fetch
+seen for a key; keys only read through aget_or_fetch are refreshed when
+they are served stale.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Awaitable, Callable, Optional
+from consts.consts import (
+    FMP_CACHE_TTL, FMP_CACHE_MAX_SIZE, FMP_DISK_CACHE_PATH, FMP_CACHE_MAX_STALENESS,
+    FMP_REFRESH_AHEAD, FMP_HOT_WINDOW, FMP_HOT_MIN_HITS, PRIORITY_BACKGROUND
+)
+from methods.cache_refresher import CacheRefresher
+from methods.fmp_disk_cache import FMPDiskCache, open_disk_cache
+from methods.rate_limiter import priority_floor
+from methods.single_flight import SingleFlight, AsyncSingleFlight
+
+CacheKey = tuple[str, str, Optional[str]]
+
+
+class FMPCache:
+    """
+    Thread-safe LRU cache with a separate time to live per FMP endpoint.
+
+    Args:
+        ttls: Time to live in seconds for each endpoint
+        max_size: Maximum number of entries before the least recently used is evicted
+        clock: Function returning the current time in seconds
+        disk: Optional persistent tier consulted on memory misses
+        max_staleness: Seconds past the TTL an entry of each endpoint may be served while it is refreshed
+        refresher: Runs background refreshes; stale entries are only served when one is given
+        hot_window: Seconds over which reads are counted to find hot keys
+        hot_min_hits: Reads within the window that make a key hot
+    """
+
+    def __init__(
+        self,
+        ttls: Optional[dict[str, float]] = None,
+        max_size: int = FMP_CACHE_MAX_SIZE,
+        clock: Callable[[], float] = time.monotonic,
+        disk: Optional[FMPDiskCache] = None,
+        max_staleness: Optional[dict[str, float]] = None,
+        refresher: Optional[CacheRefresher] = None,
+        hot_window: float = FMP_HOT_WINDOW,
+        hot_min_hits: int = FMP_HOT_MIN_HITS,
+    ):
+        self.ttls = dict(FMP_CACHE_TTL if ttls is None else ttls)
+        self.max_size = max_size
+        self.clock = clock
+        self.disk = disk
+        self.max_staleness = dict(max_staleness or {}) if refresher is not None else {}
+        self.refresher = refresher
+        self.hot_window = hot_window
+        self.hot_min_hits = hot_min_hits
+        self.hits = 0
+        self.disk_hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[CacheKey, tuple[float, Any]]" = OrderedDict()
+        self._fetchers: dict[CacheKey, Callable[[], Any]] = {}
+        self._reads: Counter = Counter()
+        self._previous_reads: Counter = Counter()
+        self._window_start = clock()
+        self._background: set[asyncio.Task] = set()
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self._async_flights = AsyncSingleFlight()
+        # Refreshes run at background priority, so misses must not join them and wait behind background tokens
+        self._async_refreshes = AsyncSingleFlight()
+        if disk is not None and self.ttls:
+            disk.prune(max(ttl + self.max_staleness.get(endpoint, 0) for endpoint, ttl in self.ttls.items()))
+
+    @classmethod
+    def from_env(cls) -> "FMPCache":
+        """
+        Create a cache whose disk tier lives at FMP_CACHE_PATH (disabled when it is empty or cannot be opened).
+        Stale-while-revalidate is on unless FMP_CACHE_STALE_WHILE_REVALIDATE is "0".
+        """
+        path = os.environ.get("FMP_CACHE_PATH", FMP_DISK_CACHE_PATH)
+        revalidate = os.environ.get("FMP_CACHE_STALE_WHILE_REVALIDATE", "1") != "0"
+        return cls(
+            disk=open_disk_cache(path),
+            max_staleness=FMP_CACHE_MAX_STALENESS if revalidate else None,
+            refresher=CacheRefresher() if revalidate else None,
+        )
+
+    @staticmethod
+    def make_key(endpoint: str, symbol: str, period: Optional[str] = None) -> CacheKey:
+        """Build the cache key for a request."""
+        return (endpoint, symbol.upper(), period)
+
+    def get(self, endpoint: str, symbol: str, period: Optional[str] = None) -> Any:
+        """
+        Return the cached payload, or None if it is missing or expired.
+        """
+        payload, fresh = self._serve(self.make_key(endpoint, symbol, period), allow_stale=False)
+        return payload
+
+    def _serve(self, key: CacheKey, allow_stale: bool) -> tuple[Any, bool]:
+        """
+        Look a key up in both tiers, update the counters and return (payload, fresh).
+        """
+        self._record_read(key)
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] + self._staleness(key) <= now:
+                self._drop(key)
+                entry = None
+            if entry is not None and (entry[0] > now or allow_stale):
+                self._entries.move_to_end(key)
+                self.hits += 1
+                if entry[0] <= now:
+                    self.stale_hits += 1
+                return entry[1], entry[0] > now
+            if entry is not None:
+                self.misses += 1
+                return None, False
+
+        payload, remaining = self._get_from_disk(key)
+        with self._lock:
+            if payload is None or (remaining <= 0 and not allow_stale):
+                self.misses += 1
+                return None, False
+            self.hits += 1
+            self.disk_hits += 1
+            if remaining <= 0:
+                self.stale_hits += 1
+            self._put(key, self.clock() + remaining, payload)
+            return payload, remaining > 0
+
+    def _staleness(self, key: CacheKey) -> float:
+        """Return how long past its TTL an entry for key may still be served."""
+        return self.max_staleness.get(key[0], 0)
+
+    def _get_from_disk(self, key: CacheKey) -> tuple[Any, float]:
+        """
+        Return the payload from the disk tier and its remaining lifetime, which is
+        negative for entries that are stale but still within the max staleness.
+        """
+        if self.disk is None:
+            return None, 0.0
+        stored = self.disk.get(key)
+        if stored is None:
+            return None, 0.0
+        fetched_at, payload = stored
+        remaining = self.ttls.get(key[0], 0) - (self.disk.clock() - fetched_at)
+        if remaining + self._staleness(key) <= 0:
+            return None, 0.0
+        return payload, remaining
+
+    def _record_read(self, key: CacheKey) -> None:
+        """Count a read of key in the current hot window."""
+        now = self.clock()
+        with self._lock:
+            if now - self._window_start >= self.hot_window:
+                # Keep one previous window so keys do not go cold right after a rotation
+                expired = now - self._window_start >= 2 * self.hot_window
+                self._previous_reads = Counter() if expired else self._reads
+                self._reads = Counter()
+                self._window_start = now
+            self._reads[key] += 1
+
+    def is_hot(self, key: CacheKey) -> bool:
+        """Return whether key has been read often enough recently to be refreshed ahead of expiry."""
+        with self._lock:
+            return self._reads[key] + self._previous_reads[key] >= self.hot_min_hits
+
+    def _put(self, key: CacheKey, expires_at: float, payload: Any) -> None:
+        """Insert an entry into the memory tier; the caller must hold the lock."""
+        self._entries[key] = (expires_at, payload)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._drop(next(iter(self._entries)))
+
+    def _drop(self, key: CacheKey) -> None:
+        """Remove an entry and its refresh state from memory; the caller must hold the lock."""
+        self._entries.pop(key, None)
+        self._fetchers.pop(key, None)
+        self._reads.pop(key, None)
+        self._previous_reads.pop(key, None)
+
+    def set(self, endpoint: str, symbol: str, payload: Any, period: Optional[str] = None) -> None:
+        """
+        Store a payload. Only non-empty lists are cached, so FMP error objects are never served.
+        """
+        if not isinstance(payload, list) or not payload:
+            return
+        ttl = self.ttls.get(endpoint, 0)
+        if ttl <= 0:
+            return
+        key = self.make_key(endpoint, symbol, period)
+        with self._lock:
+            self._put(key, self.clock() + ttl, payload)
+        if self.disk is not None:
+            self.disk.set(key, payload)
+
+    def _fetch_and_set(self, key: CacheKey, fetch: Callable[[], Any]) -> Any:
+        """Call fetch(), cache its result under key and return it."""
+        result = fetch()
+        endpoint, symbol, period = key
+        self.set(endpoint, symbol, result, period)
+        return result
+
+    def get_or_fetch(self, endpoint: str, symbol: str, fetch: Callable[[], Any], period: Optional[str] = None) -> Any:
+        """
+        Return the cached payload, calling fetch() and caching its result on a miss.
+
+        Threads that miss on the same key while another miss is being fetched wait
+        for it and share its payload instead of issuing their own request. A stale
+        entry is returned at once and refreshed in the background.
+        """
+        key = self.make_key(endpoint, symbol, period)
+        payload, fresh = self._serve(key, allow_stale=True)
+        if self.refresher is not None:
+            with self._lock:
+                self._fetchers[key] = fetch
+            self.refresher.start(self.refresh_hot)
+        if payload is None:
+            return self._flights.do(key, lambda: self._fetch_and_set(key, fetch))
+        if not fresh:
+            self._schedule_refresh(key, fetch)
+        return payload
+
+    async def aget_or_fetch(
+        self, endpoint: str, symbol: str, fetch: Callable[[], Awaitable[Any]], period: Optional[str] = None
+    ) -> Any:
+        """
+        Async variant of get_or_fetch; coroutines on the same event loop share one fetch per key.
+        Stale entries are refreshed by a background task on the running loop.
+        """
+        key = self.make_key(endpoint, symbol, period)
+        payload, fresh = self._serve(key, allow_stale=True)
+
+        async def fetch_and_set() -> Any:
+            result = await fetch()
+            self.set(endpoint, symbol, result, period)
+            return result
+
+        if payload is None:
+            return await self._async_flights.do(key, fetch_and_set)
+        if not fresh:
+            self._refresh_in_background(key, fetch_and_set)
+        return payload
+
+    def _refresh_in_background(self, key: CacheKey, fetch_and_set: Callable[[], Awaitable[Any]]) -> None:
+        """Run an async refresh as a task on the running loop, keeping a reference until it is done."""
+        async def refresh() -> None:
+            try:
+                with priority_floor(PRIORITY_BACKGROUND):
+                    await self._async_refreshes.do(key, fetch_and_set)
+            except Exception as e:
+                print ("Error:",f"Could not refresh {key}: {e}")
+
+        task = asyncio.get_running_loop().create_task(refresh())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    def refresh_hot(self) -> int:
+        """
+        Schedule a background refresh of every hot entry within FMP_REFRESH_AHEAD of its TTL.
+
+        Returns:
+            The number of refreshes scheduled
+        """
+        if self.refresher is None:
+            return 0
+        now = self.clock()
+        with self._lock:
+            due = [
+                (key, self._fetchers[key]) for key, (expires_at, _) in self._entries.items()
+                if key in self._fetchers
+                and expires_at - now <= self.ttls.get(key[0], 0) * FMP_REFRESH_AHEAD
+                and self._reads[key] + self._previous_reads[key] >= self.hot_min_hits
+            ]
+        return sum(self._schedule_refresh(key, fetch) for key, fetch in due)
+
+    def _schedule_refresh(self, key: CacheKey, fetch: Callable[[], Any]) -> bool:
+        """
+        Refresh key on the refresher. The refresh is not shared with callers that miss meanwhile,
+        which fetch at their own priority instead of waiting behind background requests.
+        """
+        return self.refresher.submit(key, lambda: self._fetch_and_set(key, fetch))
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return the hit/miss counters, the current size and the hit rate.
+
+        Hits served from the disk tier or past their TTL are also counted in
+        disk_hits and stale_hits respectively.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "size": len(self._entries),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._fetchers.clear()
+            self._reads.clear()
+            self._previous_reads.clear()
+            self.hits = 0
+            self.disk_hits = 0
+            self.stale_hits = 0
+            self.misses = 0
+        if self.disk is not None:
+            self.disk.clear()
+
+
+_cache: Optional[FMPCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_fmp_cache() -> FMPCache:
+    """
+    Return the process-wide FMP response cache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = FMPCache.from_env()
+    return _cache
@@ -0,0 +1,421 @@
+"""
+Pooled HTTP clients for the Financial Modeling Prep (FMP) API.
+
+All synchronous FMP fetchers share a single requests.Session so that connections
+are kept alive and reused instead of paying a new TCP+TLS handshake on every call.
+The asyncio fetchers share one httpx.AsyncClient per event loop, which lets the
+report fan-out overlap its requests without tying up worker threads.
+Both clients take a token from the shared RateLimiter before each request and
+back off when FMP answers 429. Every endpoint has a circuit breaker that fails
+fast while FMP keeps erroring, and slow calls can optionally be hedged with a
+second request once they pass the endpoint's tail latency. Response bodies are decoded with the fast path in
+methods.fmp_json and can be projected to the fields the caller needs. Timeouts,
+retries and the per-host connection limit can be tuned through environment
+variables (see FMPClient.from_env).
+"""
+
+import asyncio
+import os
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Iterable, Optional
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from pydantic import SecretStr
+from consts.consts import (
+    FMP_BASE_URL, FMP_CONNECT_TIMEOUT, FMP_READ_TIMEOUT,
+    FMP_MAX_RETRIES, FMP_RETRY_BACKOFF, FMP_POOL_MAXSIZE,
+    FMP_RETRY_AFTER_DEFAULT, PRIORITY_INTERACTIVE
+)
+from methods.circuit_breaker import CircuitBreaker, CircuitBreakers, CircuitOpenError, get_fmp_circuit_breakers
+from methods.fmp_json import decode_payload
+from methods.hedging import LatencyTracker, ahedged_call, hedged_call
+from methods.rate_limiter import RateLimiter, get_fmp_rate_limiter, parse_retry_after
+
+HTTP_TOO_MANY_REQUESTS = 429
+
+
+def _settings_from_env() -> dict[str, Any]:
+    """
+    Read the client settings, overriding the defaults with FMP_* environment variables.
+    """
+    return {
+        "base_url": os.environ.get("FMP_BASE_URL", FMP_BASE_URL),
+        "connect_timeout": float(os.environ.get("FMP_CONNECT_TIMEOUT", FMP_CONNECT_TIMEOUT)),
+        "read_timeout": float(os.environ.get("FMP_READ_TIMEOUT", FMP_READ_TIMEOUT)),
+        "max_retries": int(os.environ.get("FMP_MAX_RETRIES", FMP_MAX_RETRIES)),
+        "retry_backoff": float(os.environ.get("FMP_RETRY_BACKOFF", FMP_RETRY_BACKOFF)),
+        "pool_maxsize": int(os.environ.get("FMP_POOL_MAXSIZE", FMP_POOL_MAXSIZE)),
+        "hedge": os.environ.get("FMP_HEDGE_REQUESTS", "0") == "1",
+    }
+
+
+def _endpoint(path: str) -> str:
+    """Return the endpoint of a request path, e.g. "profile" for "profile/AAPL"."""
+    return path.split("/", 1)[0]
+
+
+class _Resilience:
+    """
+    Circuit breaker and latency bookkeeping shared by the sync and async clients.
+    """
+
+    def __init__(self, breakers: Optional[CircuitBreakers], hedge: bool):
+        self.breakers = breakers
+        self.hedge = hedge
+        self._latencies: dict[str, LatencyTracker] = {}
+        self._latencies_lock = threading.Lock()
+
+    def _breaker(self, endpoint: str) -> Optional[CircuitBreaker]:
+        """Return the breaker of an endpoint, raising CircuitOpenError if it rejects the request."""
+        if self.breakers is None:
+            return None
+        breaker = self.breakers.get(endpoint)
+        if not breaker.allow():
+            raise CircuitOpenError(endpoint, breaker.retry_in())
+        return breaker
+
+    def _latency(self, endpoint: str) -> LatencyTracker:
+        """Return the latency tracker of an endpoint."""
+        with self._latencies_lock:
+            tracker = self._latencies.get(endpoint)
+            if tracker is None:
+                tracker = self._latencies[endpoint] = LatencyTracker()
+            return tracker
+
+    @staticmethod
+    def _record_outcome(breaker: Optional[CircuitBreaker], status_code: Optional[int]) -> None:
+        """Count a response (or an exception when status_code is None) towards the breaker."""
+        if breaker is None:
+            return
+        if status_code is None or status_code >= 500:
+            breaker.record_failure()
+        else:
+            breaker.record_success()
+
+
+class FMPClient(_Resilience):
+    """
+    Thread-safe FMP client backed by a pooled keep-alive session.
+
+    Args:
+        base_url: Root URL of the FMP API
+        connect_timeout: Seconds to wait for a connection to be established
+        read_timeout: Seconds to wait for the server to send a response
+        max_retries: Retries for connection errors and 5xx responses
+        retry_backoff: Backoff factor between retries
+        pool_maxsize: Maximum number of connections kept open per host
+        limiter: Rate limiter to take a token from before each request, or None
+        breakers: Per-endpoint circuit breakers, or None to always send requests
+        hedge: Whether to send a second request when a call is slower than the endpoint's tail latency
+    """
+
+    def __init__(
+        self,
+        base_url: str = FMP_BASE_URL,
+        connect_timeout: float = FMP_CONNECT_TIMEOUT,
+        read_timeout: float = FMP_READ_TIMEOUT,
+        max_retries: int = FMP_MAX_RETRIES,
+        retry_backoff: float = FMP_RETRY_BACKOFF,
+        pool_maxsize: int = FMP_POOL_MAXSIZE,
+        limiter: Optional[RateLimiter] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        hedge: bool = False,
+    ):
+        super().__init__(breakers, hedge)
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.limiter = limiter
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+            # 429s are handled by _send, which lets the rate limiter pause every caller
+            respect_retry_after_header=False,
+        )
+        # pool_block turns pool_maxsize into a hard per-host connection limit
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._hedge_executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls) -> "FMPClient":
+        """
+        Create a client, overriding the defaults with FMP_* environment variables.
+        """
+        return cls(**_settings_from_env(), limiter=get_fmp_rate_limiter(), breakers=get_fmp_circuit_breakers())
+
+    def get_json(
+        self, path: str, api_key: SecretStr, params: Optional[dict[str, Any]] = None,
+        priority: int = PRIORITY_INTERACTIVE, fields: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """
+        Perform a GET request against the FMP API and return the decoded JSON.
+
+        Args:
+            path: Endpoint path relative to the base URL, e.g. "profile/AAPL"
+            api_key: The FMP API key
+            params: Additional query parameters
+            priority: Rate limiter priority class of the request
+            fields: Keys to keep in each object of the payload, or None to keep all
+
+        Returns:
+            The decoded JSON payload
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            requests.RequestException: On connection errors, timeouts or invalid JSON
+        """
+        endpoint = _endpoint(path)
+        breaker = self._breaker(endpoint)
+        url = f"{self.base_url}/{path}"
+        query = dict(params or {})
+        query["apikey"] = api_key.get_secret_value()
+        try:
+            if self.hedge:
+                tracker = self._latency(endpoint)
+                response, _ = hedged_call(
+                    lambda: self._send(url, query, priority, tracker), tracker.delay(), self._executor()
+                )
+            else:
+                response = self._send(url, query, priority)
+        except BaseException:
+            self._record_outcome(breaker, None)
+            raise
+        self._record_outcome(breaker, response.status_code)
+        try:
+            return decode_payload(response.content, fields)
+        except ValueError as e:
+            raise requests.exceptions.InvalidJSONError(str(e), response=response) from e
+
+    def _send(
+        self, url: str, query: dict[str, Any], priority: int, tracker: Optional[LatencyTracker] = None
+    ) -> requests.Response:
+        """Send the GET request, retrying after 429 answers, and record its latency."""
+        for attempt in range(self.max_retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire(priority)
+            started = time.monotonic()
+            response = self.session.get(url, params=query, timeout=self.timeout)
+            if response.status_code != HTTP_TOO_MANY_REQUESTS:
+                if self.limiter is not None:
+                    self.limiter.on_success()
+                if tracker is not None and response.status_code < 500:
+                    tracker.record(time.monotonic() - started)
+                break
+            self._on_throttled(
+                parse_retry_after(response.headers.get("Retry-After")), will_retry=attempt < self.max_retries
+            )
+        return response
+
+    def _executor(self) -> ThreadPoolExecutor:
+        """Return the thread pool running hedged requests, creating it on first use."""
+        with self._latencies_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(thread_name_prefix="fmp-hedge")
+            return self._hedge_executor
+
+    def _on_throttled(self, retry_after: Optional[float], will_retry: bool) -> None:
+        """Let the limiter pause all callers, or sleep before retrying when there is no limiter."""
+        if self.limiter is not None:
+            self.limiter.on_throttled(retry_after)
+        elif will_retry:
+            time.sleep(FMP_RETRY_AFTER_DEFAULT if retry_after is None else retry_after)
+
+    def warm_up(self) -> None:
+        """
+        Open a pooled connection to FMP ahead of the first request. The request
+        carries no API key, so it does not count against the plan's quota.
+
+        Raises:
+            requests.RequestException: If FMP cannot be reached
+        """
+        self.session.head(self.base_url, timeout=self.timeout, allow_redirects=False)
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.session.close()
+
+
+class AsyncFMPClient(_Resilience):
+    """
+    asyncio-native FMP client backed by a pooled keep-alive httpx.AsyncClient.
+
+    An instance is bound to the event loop it is first used on; use
+    get_async_fmp_client() to obtain the instance for the running loop.
+
+    Args:
+        base_url: Root URL of the FMP API
+        connect_timeout: Seconds to wait for a connection to be established
+        read_timeout: Seconds to wait for the server to send a response
+        max_retries: Retries for connection errors and 5xx responses
+        retry_backoff: Backoff factor between retries
+        pool_maxsize: Maximum number of connections kept open per host
+        limiter: Rate limiter to take a token from before each request, or None
+        breakers: Per-endpoint circuit breakers, or None to always send requests
+        hedge: Whether to send a second request when a call is slower than the endpoint's tail latency
+    """
+
+    def __init__(
+        self,
+        base_url: str = FMP_BASE_URL,
+        connect_timeout: float = FMP_CONNECT_TIMEOUT,
+        read_timeout: float = FMP_READ_TIMEOUT,
+        max_retries: int = FMP_MAX_RETRIES,
+        retry_backoff: float = FMP_RETRY_BACKOFF,
+        pool_maxsize: int = FMP_POOL_MAXSIZE,
+        limiter: Optional[RateLimiter] = None,
+        breakers: Optional[CircuitBreakers] = None,
+        hedge: bool = False,
+    ):
+        super().__init__(breakers, hedge)
+        self.base_url = base_url.rstrip("/")
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.limiter = limiter
+        self.client = httpx.AsyncClient(
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+            limits=httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize),
+        )
+
+    @classmethod
+    def from_env(cls) -> "AsyncFMPClient":
+        """
+        Create a client, overriding the defaults with FMP_* environment variables.
+        """
+        return cls(**_settings_from_env(), limiter=get_fmp_rate_limiter(), breakers=get_fmp_circuit_breakers())
+
+    async def get_json(
+        self, path: str, api_key: SecretStr, params: Optional[dict[str, Any]] = None,
+        priority: int = PRIORITY_INTERACTIVE, fields: Optional[Iterable[str]] = None,
+    ) -> Any:
+        """
+        Perform a GET request against the FMP API and return the decoded JSON.
+
+        Args:
+            path: Endpoint path relative to the base URL, e.g. "profile/AAPL"
+            api_key: The FMP API key
+            params: Additional query parameters
+            priority: Rate limiter priority class of the request
+            fields: Keys to keep in each object of the payload, or None to keep all
+
+        Returns:
+            The decoded JSON payload
+
+        Raises:
+            CircuitOpenError: If the endpoint's circuit is open
+            httpx.HTTPError: On connection errors, timeouts or invalid JSON
+        """
+        endpoint = _endpoint(path)
+        breaker = self._breaker(endpoint)
+        url = f"{self.base_url}/{path}"
+        query = dict(params or {})
+        query["apikey"] = api_key.get_secret_value()
+        try:
+            if self.hedge:
+                tracker = self._latency(endpoint)
+                response, _ = await ahedged_call(lambda: self._send(url, query, priority, tracker), tracker.delay())
+            else:
+                response = await self._send(url, query, priority)
+        except BaseException:
+            self._record_outcome(breaker, None)
+            raise
+        self._record_outcome(breaker, response.status_code)
+        try:
+            return decode_payload(response.content, fields)
+        except ValueError as e:
+            raise httpx.DecodingError(str(e), request=response.request) from e
+
+    async def _send(
+        self, url: str, query: dict[str, Any], priority: int, tracker: Optional[LatencyTracker] = None
+    ) -> httpx.Response:
+        """Send the GET request, retrying transport errors, 5xx and 429 answers, and record its latency."""
+        attempt = 0
+        while True:
+            if self.limiter is not None:
+                await self.limiter.aacquire(priority)
+            started = time.monotonic()
+            try:
+                response = await self.client.get(url, params=query)
+            except httpx.TransportError:
+                if attempt >= self.max_retries:
+                    raise
+                response = None
+            if response is not None and response.status_code == HTTP_TOO_MANY_REQUESTS:
+                await self._on_throttled(
+                    parse_retry_after(response.headers.get("Retry-After")), will_retry=attempt < self.max_retries
+                )
+            elif response is not None and response.status_code < 500:
+                if self.limiter is not None:
+                    self.limiter.on_success()
+                if tracker is not None:
+                    tracker.record(time.monotonic() - started)
+                break
+            if attempt >= self.max_retries:
+                break
+            if response is None or response.status_code >= 500:
+                await asyncio.sleep(self.retry_backoff * (2 ** attempt))
+            attempt += 1
+        return response
+
+    async def _on_throttled(self, retry_after: Optional[float], will_retry: bool) -> None:
+        """Let the limiter pause all callers, or sleep before retrying when there is no limiter."""
+        if self.limiter is not None:
+            self.limiter.on_throttled(retry_after)
+        elif will_retry:
+            await asyncio.sleep(FMP_RETRY_AFTER_DEFAULT if retry_after is None else retry_after)
+
+    async def aclose(self) -> None:
+        """Close all pooled connections."""
+        await self.client.aclose()
+
+
+_client: Optional[FMPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_fmp_client() -> FMPClient:
+    """
+    Return the process-wide FMP client, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = FMPClient.from_env()
+    return _client
+
+
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, AsyncFMPClient]" = weakref.WeakKeyDictionary()
+
+
+def get_async_fmp_client() -> AsyncFMPClient:
+    """
+    Return the async FMP client for the running event loop, creating it on first use.
+
+    httpx connections cannot be shared between event loops, so each loop gets its
+    own pooled client that is dropped together with the loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = AsyncFMPClient.from_env()
+        _async_clients[loop] = client
+    return client
@@ -0,0 +1,133 @@
+"""
+Persistent SQLite store for Financial Modeling Prep responses.
+
+This is the second tier behind FMPCache. Payloads are stored with the wall-clock
+time they were fetched, so a restarted Streamlit or LangGraph server can serve
+symbols it already knows without touching the network. The database runs in
+WAL mode so several worker processes can read and write it at the same time.
+
+The tier is only an optimization: a database that cannot be opened leaves the
+cache in memory (see open_disk_cache), and a read or write failing at run time,
+e.g. "database is locked", counts as a miss or is skipped.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Optional
+
+CacheKey = tuple[str, str, Optional[str]]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS fmp_cache (
+    endpoint TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    period TEXT NOT NULL,
+    fetched_at REAL NOT NULL,
+    payload TEXT NOT NULL,
+    PRIMARY KEY (endpoint, symbol, period)
+)
+"""
+
+
+class FMPDiskCache:
+    """
+    SQLite-backed payload store shared by all processes that point at the same file.
+
+    Args:
+        path: Location of the SQLite database file
+        clock: Function returning the current wall-clock time in seconds
+    """
+
+    def __init__(self, path: str, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.clock = clock
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(_SCHEMA)
+
+    def _connection(self) -> sqlite3.Connection:
+        """Return the connection for the current thread, opening it on first use."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: CacheKey) -> Optional[tuple[float, Any]]:
+        """
+        Return (fetched_at, payload) for the key, or None if it was never stored.
+        """
+        endpoint, symbol, period = key
+        try:
+            row = self._connection().execute(
+                "SELECT fetched_at, payload FROM fmp_cache WHERE endpoint = ? AND symbol = ? AND period = ?",
+                (endpoint, symbol, period or ""),
+            ).fetchone()
+        except sqlite3.Error as e:
+            print("Error:", f"Could not read the disk cache {self.path}: {e}")
+            return None
+        if row is None:
+            return None
+        return row[0], json.loads(row[1])
+
+    def set(self, key: CacheKey, payload: Any, fetched_at: Optional[float] = None) -> None:
+        """
+        Store a payload together with the time it was fetched.
+        """
+        endpoint, symbol, period = key
+        try:
+            with self._connection() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO fmp_cache (endpoint, symbol, period, fetched_at, payload) VALUES (?, ?, ?, ?, ?)",
+                    (endpoint, symbol, period or "", self.clock() if fetched_at is None else fetched_at, json.dumps(payload)),
+                )
+        except sqlite3.Error as e:
+            print("Error:", f"Could not write the disk cache {self.path}: {e}")
+
+    def prune(self, max_age: float) -> int:
+        """
+        Delete entries older than max_age seconds and return how many were removed.
+        """
+        try:
+            with self._connection() as conn:
+                cursor = conn.execute("DELETE FROM fmp_cache WHERE fetched_at < ?", (self.clock() - max_age,))
+                return cursor.rowcount
+        except sqlite3.Error as e:
+            print("Error:", f"Could not prune the disk cache {self.path}: {e}")
+            return 0
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        try:
+            with self._connection() as conn:
+                conn.execute("DELETE FROM fmp_cache")
+        except sqlite3.Error as e:
+            print("Error:", f"Could not clear the disk cache {self.path}: {e}")
+
+    def close(self) -> None:
+        """Close the connection opened by the current thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def open_disk_cache(path: Optional[str]) -> Optional[FMPDiskCache]:
+    """
+    Open the disk tier at path, or return None, keeping the cache in memory only,
+    when path is empty or the database cannot be created there.
+    """
+    if not path:
+        return None
+    try:
+        return FMPDiskCache(path)
+    except (OSError, sqlite3.Error) as e:
+        print("Error:", f"Could not open the disk cache {path}, caching in memory only: {e}")
+        return None
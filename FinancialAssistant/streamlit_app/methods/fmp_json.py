@@ -0,0 +1,66 @@
+"""
+Fast decoding and field projection for FMP payloads.
+
+FMP responses carry far more than the models read: a profile has a multi-kilobyte
+description and an income statement has dozens of unused fields per period.
+Payloads are decoded with orjson when it is installed (falling back to the
+standard library) and projected down to the keys a model needs, so the cache,
+the disk tier and Pydantic validation only ever see those keys.
+"""
+
+import json
+from typing import Any, Iterable, Optional
+from pydantic import BaseModel
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is an optional speed-up
+    orjson = None
+
+JSON_DECODER = "orjson" if orjson is not None else "json"
+
+
+def loads(data: bytes | str) -> Any:
+    """
+    Decode a JSON document with the fastest available parser.
+
+    Raises:
+        ValueError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def payload_fields(model: type[BaseModel]) -> tuple[str, ...]:
+    """
+    Return the payload keys a model reads, i.e. the alias of each field or its name.
+    """
+    return tuple(field.alias or name for name, field in model.model_fields.items())
+
+
+def project(payload: Any, fields: Optional[Iterable[str]]) -> Any:
+    """
+    Keep only the given keys of a JSON object or of every object in a JSON list.
+    Other values, and every payload when fields is None, are returned unchanged.
+    """
+    if fields is None:
+        return payload
+    if isinstance(payload, dict):
+        return {key: payload[key] for key in fields if key in payload}
+    if isinstance(payload, list):
+        return [
+            {key: row[key] for key in fields if key in row} if isinstance(row, dict) else row
+            for row in payload
+        ]
+    return payload
+
+
+def decode_payload(content: bytes | str, fields: Optional[Iterable[str]] = None) -> Any:
+    """
+    Decode an FMP response body and project it to the given fields.
+
+    Raises:
+        ValueError: If the body is not valid JSON
+    """
+    return project(loads(content), fields)
@@ -1,7 +1,11 @@
 from classes.company_financials import CompanyFinancials
 from classes.income_statement import IncomeStatement
+from classes.income_statement_history import IncomeStatementHistory, describe_trend
+from classes.price_history import PriceHistory, describe_period
 from classes.stock_price import StockPrice
+import math
 from typing import Optional
+from consts.consts import INDICATOR_RSI_PERIOD, INDICATOR_VOLATILITY_WINDOW
 
 def generate_markdown_financials(company_financials: CompanyFinancials) -> str:
   return f"""
@@ -28,6 +32,31 @@ def generate_markdown_income_statement(income_statement: IncomeStatement) -> str
     - **EPS (Diluted)**: {income_statement.eps_diluted: .2f}
     """ if income_statement else "No income statement was obtained"
 
+def _format_percent(value: float) -> str:
+  return "n/a" if math.isnan(value) else f"{value:.1%}"
+
+def generate_markdown_income_statement_trends(history: IncomeStatementHistory) -> str:
+  """
+  Generates the multi-year growth, margin and trend section of the income statement.
+  """
+  summary = history.summary() if history else None
+  if summary is None:
+    return ""
+  gross, net, ebitda = (summary[key] for key in ('gross_margin', 'net_margin', 'ebitda_margin'))
+  return f"""
+    ## Income Statement Trends ({summary['first_date']} to {summary['last_date']}, {summary['periods']} years)
+    - **Revenue Growth (YoY)**: {_format_percent(summary['revenue_growth'])}
+    - **Net Income Growth (YoY)**: {_format_percent(summary['net_income_growth'])}
+    - **EPS Growth (YoY, Diluted)**: {_format_percent(summary['eps_growth'])}
+    - **Gross Margin**: {_format_percent(gross[-1])} (previous year {_format_percent(gross[0])})
+    - **Net Margin**: {_format_percent(net[-1])} (previous year {_format_percent(net[0])})
+    - **EBITDA Margin**: {_format_percent(ebitda[-1])} (previous year {_format_percent(ebitda[0])})
+    - **Revenue CAGR**: {_format_percent(summary['revenue_cagr'])}
+    - **Net Income CAGR**: {_format_percent(summary['net_income_cagr'])}
+    - **Revenue Trend**: {describe_trend(summary['revenue_trend'])}
+    - **Net Income Trend**: {describe_trend(summary['net_income_trend'])}
+    """
+
 def generate_markdown_stock_price(stock_price: StockPrice) -> str:
   return  f"""
       ## Stock Price Information
@@ -40,6 +69,58 @@ def generate_markdown_stock_price(stock_price: StockPrice) -> str:
     - **Earnings Announcement**: {stock_price.earningsAnnouncement}
     """ if stock_price else "No stock price information was obtained"
 
+def generate_markdown_price_history(price_history: PriceHistory) -> str:
+  """
+  Generates the performance summary of a symbol over the requested period.
+  """
+  summary = price_history.summary() if price_history else None
+  if summary is None:
+    return "No price history was obtained"
+  return f"""
+    ## Price Performance over {describe_period(price_history.months)} ({summary['first_date']} to {summary['last_date']}, {summary['sessions']} sessions)
+    - **Close**: ${summary['first_close']: .2f} to ${summary['last_close']: .2f}
+    - **Total Return**: {_format_percent(summary['total_return'])}
+    - **Annualized Return**: {_format_percent(summary['annualized_return'])}
+    - **Period High**: ${summary['high']: .2f} ({summary['high_date']})
+    - **Period Low**: ${summary['low']: .2f} ({summary['low_date']})
+    - **Average Daily Volume**: {summary['average_volume']: ,.0f}
+    """
+
+def _format_price(value: float) -> str:
+  return "n/a" if math.isnan(value) else f"${value:,.2f}"
+
+def _format_number(value: float) -> str:
+  return "n/a" if math.isnan(value) else f"{value:.2f}"
+
+def generate_markdown_indicators(indicators: Optional[dict[str, float]]) -> str:
+  """
+  Generates the technical indicators section from the latest indicator values.
+  """
+  if not indicators:
+    return ""
+  averages = "\n".join(
+    f"    - **{name.split('_')[0].upper()} ({name.split('_')[1]}-day)**: {_format_price(value)}"
+    for name, value in indicators.items() if name.startswith(('sma_', 'ema_'))
+  )
+  return f"""
+    ## Technical Indicators (from daily closes)
+{averages}
+    - **RSI ({INDICATOR_RSI_PERIOD})**: {_format_number(indicators['rsi'])}
+    - **MACD**: {_format_number(indicators['macd'])} (signal {_format_number(indicators['macd_signal'])}, histogram {_format_number(indicators['macd_histogram'])})
+    - **Volatility ({INDICATOR_VOLATILITY_WINDOW}-day, annualized)**: {_format_percent(indicators['volatility'])}
+    - **Drawdown from Peak**: {_format_percent(indicators['drawdown'])} (maximum {_format_percent(indicators['max_drawdown'])})
+    """
+
+def generate_markdown_unavailable(what: str, retry_in: float) -> str:
+  """
+  Generates the message shown instead of data while the FMP endpoint serving it is failing.
+  """
+  return f"""
+    ## {what}
+    The financial data provider is not responding right now, so no {what.lower()} could be retrieved.
+    Please try again in about {max(1, math.ceil(retry_in))} seconds.
+    """
+
 def generate_markdown_report(company_financials: str| None, income_statement: str| None, stock_price: str| None) -> str:
     """
     Generates a markdown report from the GraphState instance.
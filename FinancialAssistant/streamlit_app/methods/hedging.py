@@ -0,0 +1,106 @@
+"""
+Hedged requests for tail latency.
+
+A LatencyTracker keeps the most recent latencies of an endpoint. Once it has
+enough samples, a call that has not finished within the tracked percentile
+gets a second, identical request, and whichever answers first wins. Only
+the slowest few percent of calls are duplicated, which cuts the tail
+latency at a small cost in extra requests.
+"""
+
+import asyncio
+import contextvars
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Executor, wait
+from typing import Any, Awaitable, Callable, Optional
+import numpy as np
+from consts.consts import FMP_HEDGE_PERCENTILE, FMP_HEDGE_MIN_SAMPLES, FMP_HEDGE_MIN_DELAY, FMP_HEDGE_WINDOW
+
+
+class LatencyTracker:
+    """
+    Thread-safe window of recent latencies and the hedging delay derived from them.
+
+    Args:
+        percentile: Latency percentile used as the hedging delay
+        min_samples: Samples needed before a delay is returned
+        min_delay: Lower bound of the delay in seconds
+        window: Most recent samples kept
+    """
+
+    def __init__(
+        self,
+        percentile: float = FMP_HEDGE_PERCENTILE,
+        min_samples: int = FMP_HEDGE_MIN_SAMPLES,
+        min_delay: float = FMP_HEDGE_MIN_DELAY,
+        window: int = FMP_HEDGE_WINDOW,
+    ):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.min_delay = min_delay
+        self._samples: deque[float] = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        """Record the latency of a successful call."""
+        with self._lock:
+            self._samples.append(seconds)
+
+    def delay(self) -> Optional[float]:
+        """Return the seconds after which a call should be hedged, or None while there are too few samples."""
+        with self._lock:
+            if len(self._samples) < self.min_samples:
+                return None
+            samples = np.fromiter(self._samples, dtype=np.float64)
+        return max(self.min_delay, float(np.percentile(samples, self.percentile)))
+
+
+def hedged_call(fn: Callable[[], Any], delay: Optional[float], executor: Executor) -> tuple[Any, bool]:
+    """
+    Call fn() and, if it has not returned after delay seconds, call it again in parallel.
+    Both calls run in a copy of the caller's context, so its priority_floor applies to them.
+
+    Returns:
+        The first successful result and whether a hedge was sent
+
+    Raises:
+        The primary call's exception if both calls fail
+    """
+    if delay is None:
+        return fn(), False
+    # One context per attempt: a Context cannot be entered by two threads at once
+    primary = executor.submit(contextvars.copy_context().run, fn)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result(), False
+    pending = {primary, executor.submit(contextvars.copy_context().run, fn)}
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result(), True
+    return primary.result(), True
+
+
+async def ahedged_call(fn: Callable[[], Awaitable[Any]], delay: Optional[float]) -> tuple[Any, bool]:
+    """
+    Async variant of hedged_call; the losing request is cancelled.
+    """
+    if delay is None:
+        return await fn(), False
+    primary = asyncio.ensure_future(fn())
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done:
+        return primary.result(), False
+    pending = {primary, asyncio.ensure_future(fn())}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result(), True
+        return primary.result(), True
+    finally:
+        for task in pending:
+            task.cancel()
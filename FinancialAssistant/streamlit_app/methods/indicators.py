@@ -0,0 +1,270 @@
+"""
+Vectorized technical indicators over daily closes.
+
+The functions compute a whole series at once with NumPy: moving averages from
+cumulative sums, exponential averages in blocks (see ema), and rolling
+volatility over sliding-window views. IndicatorEngine keeps, per symbol, the
+state the recursive indicators need (EMA values, RSI averages, running peak)
+so that when new bars are appended to the price store only those bars are
+processed instead of the full history.
+"""
+
+import math
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Optional
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+from consts.consts import (
+    INDICATOR_SMA_WINDOWS, INDICATOR_EMA_SPANS, INDICATOR_RSI_PERIOD, INDICATOR_MACD, INDICATOR_VOLATILITY_WINDOW
+)
+
+TRADING_DAYS_PER_YEAR = 252
+# Largest factor the blocked EMA lets its weights grow to before starting a new block
+_MAX_EMA_SCALE = 1e100
+
+
+def sma(values: np.ndarray, window: int) -> np.ndarray:
+    """
+    Return the simple moving average; the first window - 1 values are NaN.
+    """
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(values.shape, np.nan)
+    if window <= 0 or len(values) < window:
+        return result
+    sums = np.cumsum(values)
+    result[window - 1] = sums[window - 1]
+    result[window:] = sums[window:] - sums[:-window]
+    result[window - 1:] /= window
+    return result
+
+
+def ema(values: np.ndarray, span: Optional[int] = None, alpha: Optional[float] = None,
+        initial: Optional[float] = None) -> np.ndarray:
+    """
+    Return the exponential moving average e[t] = alpha * x[t] + (1 - alpha) * e[t - 1].
+
+    The recursion is unrolled into e[t] = d^t * (d * e[-1] + alpha * cumsum(x[i] / d^i)) with
+    d = 1 - alpha. The weights 1 / d^i grow geometrically, so the series is processed in
+    blocks short enough to keep them finite, each continuing from the previous one.
+
+    Args:
+        values: The input series
+        span: Span of the average, giving alpha = 2 / (span + 1)
+        alpha: Smoothing factor, used when span is not given
+        initial: The average before the first value; the series starts at its first value when None
+    """
+    values = np.asarray(values, dtype=np.float64)
+    if alpha is None:
+        alpha = 2.0 / (span + 1.0)
+    result = np.empty(values.shape)
+    if len(values) == 0:
+        return result
+    start = 0
+    if initial is None:
+        initial = result[0] = values[0]
+        start = 1
+    decay = 1.0 - alpha
+    if decay <= 0.0:
+        result[start:] = values[start:]
+        return result
+    block = max(1, int(math.log(_MAX_EMA_SCALE) / -math.log(decay)))
+    previous = initial
+    for lo in range(start, len(values), block):
+        chunk = values[lo:lo + block]
+        powers = decay ** np.arange(len(chunk))
+        out = powers * (decay * previous + alpha * np.cumsum(chunk / powers))
+        result[lo:lo + len(chunk)] = out
+        previous = out[-1]
+    return result
+
+
+def rsi(close: np.ndarray, period: int = INDICATOR_RSI_PERIOD) -> np.ndarray:
+    """
+    Return Wilder's relative strength index; values before period + 1 closes are NaN.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    result = np.full(close.shape, np.nan)
+    if len(close) <= period:
+        return result
+    delta = np.diff(close)
+    gains, losses = np.clip(delta, 0, None), np.clip(-delta, 0, None)
+    avg_gain = ema(gains[period:], alpha=1.0 / period, initial=gains[:period].mean())
+    avg_loss = ema(losses[period:], alpha=1.0 / period, initial=losses[:period].mean())
+    result[period] = _rsi_value(gains[:period].mean(), losses[:period].mean())
+    result[period + 1:] = _rsi_value(avg_gain, avg_loss)
+    return result
+
+
+def _rsi_value(avg_gain, avg_loss):
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / np.where(avg_loss == 0, 1, avg_loss)))
+
+
+def macd(close: np.ndarray, fast: int = INDICATOR_MACD[0], slow: int = INDICATOR_MACD[1],
+         signal: int = INDICATOR_MACD[2]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Return the MACD line, its signal line and the histogram.
+    """
+    line = ema(close, fast) - ema(close, slow)
+    signal_line = ema(line, signal)
+    return line, signal_line, line - signal_line
+
+
+def volatility(close: np.ndarray, window: int = INDICATOR_VOLATILITY_WINDOW) -> np.ndarray:
+    """
+    Return the annualized standard deviation of daily log returns over a rolling window,
+    aligned with close; values before window + 1 closes are NaN.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    result = np.full(close.shape, np.nan)
+    if len(close) <= window:
+        return result
+    returns = np.diff(np.log(close))
+    result[window:] = sliding_window_view(returns, window).std(axis=1, ddof=1) * math.sqrt(TRADING_DAYS_PER_YEAR)
+    return result
+
+
+def drawdown(close: np.ndarray) -> np.ndarray:
+    """
+    Return the decline of every close from the highest close before it, as a non-positive fraction.
+    """
+    close = np.asarray(close, dtype=np.float64)
+    return close / np.maximum.accumulate(close) - 1.0
+
+
+@dataclass
+class _IndicatorState:
+    """Carried values of the recursive indicators after the first `processed` closes."""
+    processed: int = 0
+    first_close: float = math.nan
+    emas: dict[int, float] = field(default_factory=dict)
+    macd_fast: float = math.nan
+    macd_slow: float = math.nan
+    macd_signal: float = math.nan
+    avg_gain: float = math.nan
+    avg_loss: float = math.nan
+    peak: float = -math.inf
+    max_drawdown: float = 0.0
+    latest: dict[str, float] = field(default_factory=dict)
+
+
+class IndicatorEngine:
+    """
+    Keeps the latest indicator values of every symbol up to date as bars are appended.
+
+    Args:
+        sma_windows: Windows of the simple moving averages
+        ema_spans: Spans of the exponential moving averages
+        rsi_period: Period of the RSI
+        macd_spans: Fast, slow and signal spans of the MACD
+        volatility_window: Window of the rolling volatility
+    """
+
+    def __init__(
+        self,
+        sma_windows: tuple[int, ...] = INDICATOR_SMA_WINDOWS,
+        ema_spans: tuple[int, ...] = INDICATOR_EMA_SPANS,
+        rsi_period: int = INDICATOR_RSI_PERIOD,
+        macd_spans: tuple[int, int, int] = INDICATOR_MACD,
+        volatility_window: int = INDICATOR_VOLATILITY_WINDOW,
+    ):
+        self.sma_windows = sma_windows
+        self.ema_spans = ema_spans
+        self.rsi_period = rsi_period
+        self.macd_spans = macd_spans
+        self.volatility_window = volatility_window
+        self.processed_bars = 0
+        self._states: dict[str, _IndicatorState] = {}
+        self._lock = threading.Lock()
+
+    def update(self, symbol: str, close: np.ndarray) -> dict[str, float]:
+        """
+        Return the latest indicator values for the full close series of a symbol.
+
+        Only the closes appended since the previous update are processed. The series must
+        only ever grow at the end; a series that is shorter or starts with another close
+        than last time starts the symbol over.
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            state = self._states.get(symbol)
+            if state is None or len(close) < state.processed or (len(close) and close[0] != state.first_close):
+                state = self._states[symbol] = _IndicatorState(first_close=float(close[0]) if len(close) else math.nan)
+            if len(close) > state.processed:
+                self._advance(state, np.asarray(close, dtype=np.float64))
+            return dict(state.latest)
+
+    def _advance(self, state: _IndicatorState, close: np.ndarray) -> None:
+        first = state.processed == 0
+        new = close[state.processed:]
+        self.processed_bars += len(new)
+        latest: dict[str, float] = {"close": float(close[-1])}
+
+        # Windowed indicators only need the last window of closes
+        for window in self.sma_windows:
+            latest[f"sma_{window}"] = float(close[-window:].mean()) if len(close) >= window else math.nan
+        latest["volatility"] = float(volatility(close[-(self.volatility_window + 1):], self.volatility_window)[-1])
+
+        # Recursive indicators continue from the carried state
+        for span in self.ema_spans:
+            state.emas[span] = float(ema(new, span, initial=state.emas.get(span))[-1])
+            latest[f"ema_{span}"] = state.emas[span]
+        fast, slow, signal = self.macd_spans
+        fast_line = ema(new, fast, initial=None if first else state.macd_fast)
+        slow_line = ema(new, slow, initial=None if first else state.macd_slow)
+        line = fast_line - slow_line
+        signal_line = ema(line, signal, initial=None if first else state.macd_signal)
+        state.macd_fast, state.macd_slow, state.macd_signal = fast_line[-1], slow_line[-1], signal_line[-1]
+        latest["macd"], latest["macd_signal"] = float(line[-1]), float(signal_line[-1])
+        latest["macd_histogram"] = latest["macd"] - latest["macd_signal"]
+        latest["rsi"] = self._advance_rsi(state, close)
+
+        peaks = np.maximum.accumulate(np.append(state.peak, new))[1:]
+        state.peak = float(peaks[-1])
+        state.max_drawdown = min(state.max_drawdown, float((new / peaks - 1.0).min()))
+        latest["drawdown"] = float(close[-1] / state.peak - 1.0)
+        latest["max_drawdown"] = state.max_drawdown
+
+        state.latest = latest
+        state.processed = len(close)
+
+    def _advance_rsi(self, state: _IndicatorState, close: np.ndarray) -> float:
+        period = self.rsi_period
+        if len(close) <= period:
+            return math.nan
+        alpha = 1.0 / period
+        if math.isnan(state.avg_gain):
+            # Seed Wilder's averages with the mean of the first period of changes
+            delta = np.diff(close[:period + 1])
+            state.avg_gain = float(np.clip(delta, 0, None).mean())
+            state.avg_loss = float(np.clip(-delta, 0, None).mean())
+            start = period + 1
+        else:
+            start = state.processed
+        delta = np.diff(close[start - 1:])
+        if len(delta):
+            state.avg_gain = float(ema(np.clip(delta, 0, None), alpha=alpha, initial=state.avg_gain)[-1])
+            state.avg_loss = float(ema(np.clip(-delta, 0, None), alpha=alpha, initial=state.avg_loss)[-1])
+        return float(_rsi_value(state.avg_gain, state.avg_loss))
+
+    def forget(self, symbol: str) -> None:
+        """Drop the carried state of a symbol."""
+        with self._lock:
+            self._states.pop(symbol.upper(), None)
+
+
+_engine: Optional[IndicatorEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """
+    Return the process-wide indicator engine, creating it on first use.
+    """
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = IndicatorEngine()
+    return _engine
@@ -0,0 +1,267 @@
+"""
+Exact-match cache of structured LLM chain results.
+
+The chains run at temperature 0, so the same prompt sent to the same model
+gives the same answer; repeated questions ("what is the stock price of
+apple") need not cost a provider round trip. Results are keyed by a hash of
+the provider, model, temperature, rendered prompt messages and the JSON
+schema of the structured output, so changing any of them, including the
+prompt template, never serves an old answer. Entries live in an LRU memory
+tier with a time to live and, optionally, in an SQLite tier shared by
+worker processes and kept across restarts (an FMPDiskCache in its own file,
+keyed by chain and hash).
+
+Caching is enabled per chain: cached_chain returns a CachedChain for a
+chain whose name is in the cache's chain set, and the plain chain otherwise. Hits and misses are counted per chain.
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Iterable, Optional
+from langchain_core.prompts import ChatPromptTemplate
+from langchain_core.runnables import RunnableConfig, RunnableLambda
+from pydantic import BaseModel
+from consts.consts import LLM_CACHE_MAX_SIZE, LLM_CACHE_TTL, LLM_CACHE_PATH, LLM_CACHE_CHAINS
+from methods.fmp_disk_cache import FMPDiskCache, open_disk_cache
+
+
+def llm_identity(llm: Any) -> tuple[str, str, str]:
+    """
+    Return the (provider, model, temperature) of a chat model, as part of a cache key.
+    """
+    model = getattr(llm, "model_name", None) or getattr(llm, "model", None)
+    return type(llm).__name__, str(model), str(getattr(llm, "temperature", None))
+
+
+class LLMCache:
+    """
+    Thread-safe LRU cache of structured chain results with an optional persistent tier.
+
+    Args:
+        chains: Names of the chains whose results are cached
+        max_size: Maximum number of entries before the least recently used is evicted
+        ttl: Seconds an entry is served
+        disk: Optional persistent tier consulted on memory misses
+        clock: Function returning the current wall-clock time in seconds
+    """
+
+    def __init__(
+        self,
+        chains: Iterable[str] = LLM_CACHE_CHAINS,
+        max_size: int = LLM_CACHE_MAX_SIZE,
+        ttl: float = LLM_CACHE_TTL,
+        disk: Optional[FMPDiskCache] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.chains = set(chains)
+        self.max_size = max_size
+        self.ttl = ttl
+        self.disk = disk
+        self.clock = clock
+        self._entries: "OrderedDict[str, tuple[float, dict]]" = OrderedDict()
+        self._counts: Counter = Counter()
+        self._lock = threading.Lock()
+        if disk is not None:
+            disk.prune(ttl)
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        """
+        Create a cache for the chains in LLM_CACHE_CHAINS (comma-separated, empty disables it)
+        whose disk tier lives at LLM_CACHE_PATH (disabled when it is empty or cannot be opened).
+        """
+        chains = os.environ.get("LLM_CACHE_CHAINS")
+        path = os.environ.get("LLM_CACHE_PATH", LLM_CACHE_PATH)
+        return cls(
+            chains=LLM_CACHE_CHAINS if chains is None else [name.strip() for name in chains.split(",") if name.strip()],
+            disk=open_disk_cache(path),
+        )
+
+    def enabled(self, chain: str) -> bool:
+        """Return whether results of the chain are cached."""
+        return chain in self.chains
+
+    @staticmethod
+    def make_key(identity: tuple[str, str, str], messages: list[Any], schema: str) -> str:
+        """Hash a model identity, the rendered prompt messages and the output schema into a key."""
+        payload = json.dumps(
+            [identity, [(message.type, message.content) for message in messages], schema],
+            sort_keys=True, default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def get(self, chain: str, key: str) -> Optional[dict]:
+        """
+        Return the cached result fields, or None if they are missing or expired.
+        """
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self._counts[(chain, "hits")] += 1
+                return entry[1]
+            self._entries.pop(key, None)
+
+        stored = self.disk.get((chain, key, None)) if self.disk is not None else None
+        with self._lock:
+            if stored is None or stored[0] + self.ttl <= now:
+                self._counts[(chain, "misses")] += 1
+                return None
+            self._counts[(chain, "hits")] += 1
+            self._counts[(chain, "disk_hits")] += 1
+            self._put(key, stored[0] + self.ttl, stored[1])
+            return stored[1]
+
+    def set(self, chain: str, key: str, fields: dict) -> None:
+        """Store the fields of a result."""
+        with self._lock:
+            self._put(key, self.clock() + self.ttl, fields)
+        if self.disk is not None:
+            self.disk.set((chain, key, None), fields)
+
+    def _put(self, key: str, expires_at: float, fields: dict) -> None:
+        """Insert an entry into the memory tier; the caller must hold the lock."""
+        self._entries[key] = (expires_at, fields)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return the hit/miss counters, the current size and the hit rate, overall and per chain
+        (as "<chain>:hits", "<chain>:misses" and "<chain>:hit_rate").
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            size = len(self._entries)
+        hits = sum(count for (_, kind), count in counts.items() if kind == "hits")
+        misses = sum(count for (_, kind), count in counts.items() if kind == "misses")
+        stats = {
+            "hits": hits,
+            "disk_hits": sum(count for (_, kind), count in counts.items() if kind == "disk_hits"),
+            "misses": misses,
+            "size": size,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+        }
+        for chain in sorted({chain for chain, _ in counts}):
+            chain_hits, chain_misses = counts.get((chain, "hits"), 0), counts.get((chain, "misses"), 0)
+            stats[f"{chain}:hits"] = chain_hits
+            stats[f"{chain}:misses"] = chain_misses
+            stats[f"{chain}:hit_rate"] = chain_hits / (chain_hits + chain_misses) if chain_hits + chain_misses else 0.0
+        return stats
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers and reset the counters."""
+        with self._lock:
+            self._entries.clear()
+            self._counts.clear()
+        if self.disk is not None:
+            self.disk.clear()
+
+
+def structured_output(llm: Any, schema: type[BaseModel], text_field: Optional[str] = None):
+    """
+    Return llm.with_structured_output(schema) or, with text_field, the model's plain text answer
+    put into that field of the schema. A plain text answer streams token by token, which
+    structured output, sent as one tool call, does not.
+    """
+    if text_field is None:
+        return llm.with_structured_output(schema)
+    return llm | RunnableLambda(lambda message: schema(**{text_field: message.text()}), name=f"{schema.__name__}_from_text")
+
+
+class CachedChain:
+    """
+    prompt | llm.with_structured_output(schema), answering repeated prompts from an LLM cache.
+
+    Only invoke and ainvoke are provided, which is all the nodes use; a hit returns without
+    setting up callbacks, so it costs microseconds, and a miss calls the model with the
+    caller's config as the plain chain would.
+
+    Args:
+        name: Name of the chain, used for the per-chain counters
+        prompt: Prompt of the chain
+        llm: Chat model of the chain
+        schema: Structured output of the chain
+        cache: Cache holding the results
+        text_field: Field of the schema holding the model's plain text answer, see structured_output
+    """
+
+    def __init__(self, name: str, prompt: ChatPromptTemplate, llm: Any, schema: type[BaseModel], cache: LLMCache,
+                 text_field: Optional[str] = None):
+        self.name = name
+        self.prompt = prompt
+        self.schema = schema
+        self.cache = cache
+        self.structured = structured_output(llm, schema, text_field)
+        self._identity = llm_identity(llm)
+        self._schema_json = json.dumps([schema.model_json_schema(), text_field], sort_keys=True)
+
+    def _lookup(self, input: Any) -> tuple[Any, str, Optional[BaseModel]]:
+        """Render the prompt and return (prompt value, key, cached result or None)."""
+        variables = input if isinstance(input, dict) else {self.prompt.input_variables[0]: input}
+        prompt_value = self.prompt.format_prompt(**variables)
+        key = self.cache.make_key(self._identity, prompt_value.to_messages(), self._schema_json)
+        fields = self.cache.get(self.name, key)
+        return prompt_value, key, self.schema.model_validate(fields) if fields is not None else None
+
+    def _remember(self, key: str, result: Any) -> Any:
+        """Cache a result of the model; anything but a validated schema instance, such as a failed parse, is not."""
+        if isinstance(result, self.schema):
+            self.cache.set(self.name, key, result.model_dump())
+        return result
+
+    def invoke(self, input: Any, config: Optional[RunnableConfig] = None) -> Any:
+        """Return the cached result for the prompt, calling the model on a miss."""
+        prompt_value, key, result = self._lookup(input)
+        if result is not None:
+            return result
+        return self._remember(key, self.structured.invoke(prompt_value, config))
+
+    async def ainvoke(self, input: Any, config: Optional[RunnableConfig] = None) -> Any:
+        """Async variant of invoke."""
+        prompt_value, key, result = self._lookup(input)
+        if result is not None:
+            return result
+        return self._remember(key, await self.structured.ainvoke(prompt_value, config))
+
+
+def cached_chain(name: str, prompt: ChatPromptTemplate, llm: Any, schema: type[BaseModel],
+                 cache: Optional[LLMCache] = None, text_field: Optional[str] = None):
+    """
+    Build the structured chain of a prompt and model: a CachedChain when the LLM cache is
+    enabled for the chain, the plain prompt | structured_output(llm, schema, text_field) otherwise.
+
+    Args:
+        name: Name of the chain, as listed in LLM_CACHE_CHAINS
+        prompt: Prompt of the chain
+        llm: Chat model of the chain
+        schema: Structured output of the chain
+        cache: Cache to use; defaults to the process-wide one
+        text_field: Field of the schema holding the model's plain text answer, see structured_output
+    """
+    cache = cache or get_llm_cache()
+    if cache.enabled(name):
+        return CachedChain(name, prompt, llm, schema, cache, text_field)
+    return prompt | structured_output(llm, schema, text_field)
+
+
+_cache: Optional[LLMCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> LLMCache:
+    """
+    Return the process-wide LLM result cache, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = LLMCache.from_env()
+    return _cache
@@ -0,0 +1,218 @@
+"""
+Process-wide registry of LLM chat models.
+
+Every Streamlit session compiles its own graph, and building a new
+ChatOpenAI/ChatGroq/ChatAnthropic for each meant a new HTTP connection pool
+per session, so no session ever found a warm connection. The registry hands
+out one shared chat model per (provider, model, hashed API key); chat models
+hold no per-request state, so sessions and threads can use the same one.
+OpenAI and Groq models get an explicit keep-alive httpx pool; Anthropic's SDK
+client is created once per model, so sharing the model shares its pool.
+
+A model nobody asked for within the idle timeout is no longer pinned: the
+registry keeps only a weak reference, so it is freed, and its connections
+closed, once the last graph using it is gone. A session still holding it
+gets the same model back on its next request.
+"""
+
+import hashlib
+import os
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+import httpx
+from langchain_anthropic import ChatAnthropic
+from langchain_groq import ChatGroq
+from langchain_openai import ChatOpenAI
+from classes.config import Config
+from consts.consts import (
+    PROVIDER_OPENAI, PROVIDER_GROQ, PROVIDER_ANTHROPIC, MODEL_OPENAI, MODEL_GROQ, MODEL_ANTHROPIC,
+    LLM_CLIENT_IDLE_TIMEOUT, LLM_HTTP_POOL_MAXSIZE, LLM_HTTP_KEEPALIVE_EXPIRY
+)
+
+MODELS = {PROVIDER_OPENAI: MODEL_OPENAI, PROVIDER_GROQ: MODEL_GROQ, PROVIDER_ANTHROPIC: MODEL_ANTHROPIC}
+
+RegistryKey = tuple[str, str, str]
+
+
+def build_llm(config: Config, http_client: Optional[httpx.Client] = None) -> Any:
+    """
+    Build the chat model of a provider, sending its requests through http_client when the provider supports one.
+    Supported providers: "Groq", "OpenAI", "Anthropic"
+    """
+    # The api_key is already a SecretStr, so we can pass it directly
+    if config.provider == PROVIDER_OPENAI:
+        return ChatOpenAI(api_key=config.llm_api_key, model=MODEL_OPENAI, http_client=http_client)
+    elif config.provider == PROVIDER_GROQ:
+        return ChatGroq(api_key=config.llm_api_key, model=MODEL_GROQ,
+                        temperature=0,
+                        max_tokens=None,
+                        timeout=None,
+                        max_retries=2,
+                        http_client=http_client,)
+    elif config.provider == PROVIDER_ANTHROPIC:
+        return ChatAnthropic(
+            api_key=config.llm_api_key,
+            model_name=MODEL_ANTHROPIC,
+            temperature=0.0,
+            timeout=None,
+            max_retries=2,
+            stop=None
+        )
+
+    raise ValueError(f"Unsupported provider: {config.provider}")
+
+
+@dataclass
+class _Entry:
+    """A registered model: pinned while in use, weakly referenced once idle."""
+    ref: weakref.ref
+    last_used: float
+    pinned: Optional[Any] = None
+
+
+class LLMRegistry:
+    """
+    Thread-safe registry of shared chat models.
+
+    Args:
+        factory: Builds a chat model from a config and an optional httpx client
+        idle_timeout: Seconds a model nobody asked for stays pinned
+        pool_maxsize: Pooled connections per model
+        keepalive_expiry: Seconds an idle pooled connection is kept open
+        clock: Function returning the current time in seconds
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[Config, Optional[httpx.Client]], Any] = build_llm,
+        idle_timeout: float = LLM_CLIENT_IDLE_TIMEOUT,
+        pool_maxsize: int = LLM_HTTP_POOL_MAXSIZE,
+        keepalive_expiry: float = LLM_HTTP_KEEPALIVE_EXPIRY,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.factory = factory
+        self.idle_timeout = idle_timeout
+        self.pool_maxsize = pool_maxsize
+        self.keepalive_expiry = keepalive_expiry
+        self.clock = clock
+        self.created = 0
+        self.reused = 0
+        self._entries: dict[RegistryKey, _Entry] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "LLMRegistry":
+        """
+        Create a registry with the idle timeout in LLM_CLIENT_IDLE_TIMEOUT and the pool size in LLM_HTTP_POOL_MAXSIZE.
+        """
+        return cls(
+            idle_timeout=float(os.environ.get("LLM_CLIENT_IDLE_TIMEOUT", LLM_CLIENT_IDLE_TIMEOUT)),
+            pool_maxsize=int(os.environ.get("LLM_HTTP_POOL_MAXSIZE", LLM_HTTP_POOL_MAXSIZE)),
+        )
+
+    @staticmethod
+    def make_key(config: Config) -> RegistryKey:
+        """Build the registry key of a config; the API key only appears hashed."""
+        digest = hashlib.sha256(config.llm_api_key.get_secret_value().encode()).hexdigest()[:16]
+        return (config.provider, MODELS.get(config.provider, ""), digest)
+
+    def _http_client(self) -> httpx.Client:
+        """Create the keep-alive connection pool of a new model."""
+        return httpx.Client(
+            limits=httpx.Limits(
+                max_connections=self.pool_maxsize,
+                max_keepalive_connections=self.pool_maxsize,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+        )
+
+    def get(self, config: Config) -> Any:
+        """
+        Return the shared chat model of a config, building it on first use.
+
+        Raises:
+            ValueError: If the provider is not supported
+        """
+        key = self.make_key(config)
+        now = self.clock()
+        with self._lock:
+            self._release_idle(now)
+            entry = self._entries.get(key)
+            llm = entry.ref() if entry is not None else None
+            if llm is not None:
+                self.reused += 1
+            else:
+                http_client = self._http_client() if config.provider in (PROVIDER_OPENAI, PROVIDER_GROQ) else None
+                try:
+                    llm = self.factory(config, http_client)
+                except Exception:
+                    if http_client is not None:
+                        http_client.close()
+                    raise
+                if http_client is not None:
+                    # Close the pool once the last graph using the model is gone
+                    weakref.finalize(llm, http_client.close)
+                entry = self._entries[key] = _Entry(ref=weakref.ref(llm), last_used=now)
+                self.created += 1
+            entry.pinned = llm
+            entry.last_used = now
+            return llm
+
+    def release_idle(self) -> int:
+        """
+        Unpin the models nobody asked for within the idle timeout and forget the ones already freed.
+
+        Returns:
+            The number of models unpinned
+        """
+        with self._lock:
+            return self._release_idle(self.clock())
+
+    def _release_idle(self, now: float) -> int:
+        """Unpin idle models; the caller must hold the lock."""
+        released = 0
+        for key, entry in list(self._entries.items()):
+            if entry.pinned is not None and now - entry.last_used > self.idle_timeout:
+                entry.pinned = None
+                released += 1
+            if entry.pinned is None and entry.ref() is None:
+                del self._entries[key]
+        return released
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return how many models were created and reused, how many are alive and how many of those are pinned.
+        """
+        with self._lock:
+            return {
+                "created": self.created,
+                "reused": self.reused,
+                "alive": sum(entry.ref() is not None for entry in self._entries.values()),
+                "pinned": sum(entry.pinned is not None for entry in self._entries.values()),
+            }
+
+    def clear(self) -> None:
+        """Forget every model; models still used by a graph keep working until it is gone."""
+        with self._lock:
+            self._entries.clear()
+            self.created = 0
+            self.reused = 0
+
+
+_registry: Optional[LLMRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMRegistry:
+    """
+    Return the process-wide LLM registry, creating it on first use.
+    """
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LLMRegistry.from_env()
+    return _registry
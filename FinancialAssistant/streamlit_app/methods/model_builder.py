@@ -0,0 +1,99 @@
+"""
+Low-overhead construction of the financial data models from FMP payloads.
+
+Validation in pydantic-core is already cheaper than model_construct for these
+small models, so the savings come from not repeating work: batches are
+validated in a single call through a precompiled TypeAdapter, and a model
+built from a cached payload row is reused for as long as the cache keeps
+serving that same row object. Rows are only trusted once they have passed
+validation, so a reused model is always the one validation produced.
+Reused models are shared between callers and must not be mutated.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Generic, Hashable, TypeVar
+from pydantic import BaseModel, TypeAdapter, ValidationError
+from consts.consts import FMP_CACHE_MAX_SIZE
+
+M = TypeVar("M", bound=BaseModel)
+
+
+class ModelBuilder(Generic[M]):
+    """
+    Builds one model class from payload rows, remembering the model built for each key.
+
+    Args:
+        model: The Pydantic model to build
+        max_size: Maximum number of remembered models before the least recently used is dropped
+    """
+
+    def __init__(self, model: type[M], max_size: int = FMP_CACHE_MAX_SIZE):
+        self.model = model
+        self.max_size = max_size
+        self.reused = 0
+        self.built = 0
+        self._rows_adapter = TypeAdapter(list[model])
+        self._memo: "OrderedDict[Hashable, tuple[Any, M]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def build(self, key: Hashable, row: Any) -> M:
+        """
+        Return the model for a payload row, reusing the one built for key if row is the same object.
+
+        Raises:
+            ValidationError: If the row does not match the model
+        """
+        with self._lock:
+            entry = self._memo.get(key)
+            if entry is not None and entry[0] is row:
+                self._memo.move_to_end(key)
+                self.reused += 1
+                return entry[1]
+        model = self.model.model_validate(row)
+        with self._lock:
+            self.built += 1
+        self.remember(key, row, model)
+        return model
+
+    def build_many(self, rows: list[Any]) -> list[tuple[Any, M]]:
+        """
+        Validate a batch of rows in one call and return (row, model) pairs.
+        Rows that do not match the model are left out.
+        """
+        try:
+            pairs = list(zip(rows, self._rows_adapter.validate_python(rows)))
+        except ValidationError:
+            pairs = []
+            for row in rows:
+                try:
+                    pairs.append((row, self.model.model_validate(row)))
+                except ValidationError:
+                    continue
+        with self._lock:
+            self.built += len(pairs)
+        return pairs
+
+    def remember(self, key: Hashable, row: Any, model: M) -> None:
+        """
+        Record that row was validated into model, so later builds of the same row reuse it.
+        """
+        with self._lock:
+            self._memo[key] = (row, model)
+            self._memo.move_to_end(key)
+            while len(self._memo) > self.max_size:
+                self._memo.popitem(last=False)
+
+    def stats(self) -> dict[str, int]:
+        """
+        Return how many models were built and how many were reused.
+        """
+        with self._lock:
+            return {"built": self.built, "reused": self.reused, "size": len(self._memo)}
+
+    def clear(self) -> None:
+        """Forget all remembered models and reset the counters."""
+        with self._lock:
+            self._memo.clear()
+            self.built = 0
+            self.reused = 0
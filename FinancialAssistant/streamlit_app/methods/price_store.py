@@ -0,0 +1,282 @@
+"""
+Append-only store of daily price bars backed by memory-mapped NumPy columns.
+
+Every symbol has a directory with one raw binary file per column (date as
+datetime64[D], open, high, low, close and volume as float64). New bars are
+only ever appended, so a refresh downloads just the bars after the last
+stored date, and reads map the files instead of loading them: slicing a
+date range returns views into the page cache without copying. Columns are
+written before the date column, and the number of stored bars is the length
+of the shortest column, so a write cut short never exposes a partial bar.
+
+Only finished sessions are stored: a bar dated today is left out until the
+next day. Each refresh downloads the last stored bar again; when its close
+no longer matches, a split or dividend has adjusted the earlier prices and
+the symbol is rebuilt from a full download.
+"""
+
+import os
+import threading
+import time
+from typing import Any, Awaitable, Callable, Optional
+import numpy as np
+from consts.consts import PRICE_STORE_PATH, PRICE_STORE_REFRESH_INTERVAL, PRICE_STORE_ADJUSTMENT_TOLERANCE
+from methods.single_flight import AsyncSingleFlight, SingleFlight
+
+DATE_COLUMN = "date"
+PRICE_COLUMNS = ("open", "high", "low", "close", "volume")
+COLUMN_DTYPES = {DATE_COLUMN: np.dtype("datetime64[D]"), **{name: np.dtype(np.float64) for name in PRICE_COLUMNS}}
+
+Bars = tuple[np.ndarray, dict[str, np.ndarray]]
+
+
+class PriceStore:
+    """
+    Thread-safe daily price store rooted at a directory.
+
+    Args:
+        directory: Root directory holding one sub-directory per symbol
+        refresh_interval: Seconds after a refresh before a symbol is checked for new bars again
+        clock: Function returning the current wall-clock time in seconds
+    """
+
+    def __init__(
+        self,
+        directory: str = PRICE_STORE_PATH,
+        refresh_interval: float = PRICE_STORE_REFRESH_INTERVAL,
+        clock: Callable[[], float] = time.time,
+    ):
+        self.directory = directory
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._maps: dict[str, tuple[int, dict[str, np.ndarray]]] = {}
+        self._checked: dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._single_flight = SingleFlight()
+        self._async_single_flight = AsyncSingleFlight()
+
+    @classmethod
+    def from_env(cls) -> "PriceStore":
+        """
+        Create a store rooted at FMP_PRICE_STORE_PATH.
+        """
+        return cls(os.environ.get("FMP_PRICE_STORE_PATH", PRICE_STORE_PATH))
+
+    def today(self) -> np.datetime64:
+        """Return the current date according to the clock."""
+        return np.datetime64(int(self.clock()), "s").astype("datetime64[D]")
+
+    def _path(self, symbol: str, column: str) -> str:
+        return os.path.join(self.directory, symbol.upper(), f"{column}.bin")
+
+    def _stored_rows(self, symbol: str) -> int:
+        """Return the number of complete bars, i.e. the length of the shortest column."""
+        rows = []
+        for column, dtype in COLUMN_DTYPES.items():
+            try:
+                rows.append(os.path.getsize(self._path(symbol, column)) // dtype.itemsize)
+            except FileNotFoundError:
+                return 0
+        return min(rows)
+
+    def columns(self, symbol: str) -> dict[str, np.ndarray]:
+        """
+        Return all stored bars of a symbol as read-only memory-mapped columns, oldest first.
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            rows = self._stored_rows(symbol)
+            cached = self._maps.get(symbol)
+            if cached is not None and cached[0] == rows:
+                return cached[1]
+            if rows == 0:
+                columns = {column: np.empty(0, dtype) for column, dtype in COLUMN_DTYPES.items()}
+            else:
+                columns = {
+                    column: np.memmap(self._path(symbol, column), dtype=dtype, mode="r", shape=(rows,))
+                    for column, dtype in COLUMN_DTYPES.items()
+                }
+            self._maps[symbol] = (rows, columns)
+            return columns
+
+    def last_date(self, symbol: str) -> Optional[np.datetime64]:
+        """Return the date of the most recent stored bar, or None if the symbol has none."""
+        dates = self.columns(symbol)[DATE_COLUMN]
+        return dates[-1] if len(dates) else None
+
+    def slice(
+        self, symbol: str, start: Optional[np.datetime64] = None, end: Optional[np.datetime64] = None
+    ) -> dict[str, np.ndarray]:
+        """
+        Return the bars dated from start to end (both inclusive) as views into the mapped columns.
+        """
+        columns = self.columns(symbol)
+        dates = columns[DATE_COLUMN]
+        lo = 0 if start is None else int(np.searchsorted(dates, start, side="left"))
+        hi = len(dates) if end is None else int(np.searchsorted(dates, end, side="right"))
+        return {column: values[lo:hi] for column, values in columns.items()}
+
+    def append(self, symbol: str, dates: np.ndarray, columns: dict[str, np.ndarray]) -> int:
+        """
+        Append the bars dated after the last stored bar and before today, and return how many were added.
+
+        Args:
+            symbol: The stock symbol
+            dates: Bar dates, in any order
+            columns: One array per name in PRICE_COLUMNS, aligned with dates
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            return self._append(symbol, dates, columns)
+
+    def replace(self, symbol: str, dates: np.ndarray, columns: dict[str, np.ndarray]) -> int:
+        """
+        Drop the stored bars of a symbol, store the given ones instead and return how many were stored.
+        Arrays already returned by columns() keep the old bars.
+        """
+        symbol = symbol.upper()
+        with self._lock:
+            # Unlinking leaves existing maps valid, truncating in place would not
+            for column in COLUMN_DTYPES:
+                try:
+                    os.remove(self._path(symbol, column))
+                except FileNotFoundError:
+                    pass
+            self._maps.pop(symbol, None)
+            return self._append(symbol, dates, columns)
+
+    def _append(self, symbol: str, dates: np.ndarray, columns: dict[str, np.ndarray]) -> int:
+        """Append new finished bars; the caller must hold the lock."""
+        dates = np.asarray(dates, dtype="datetime64[D]")
+        rows = self._stored_rows(symbol)
+        last = None
+        if rows:
+            dtype = COLUMN_DTYPES[DATE_COLUMN]
+            last = np.fromfile(self._path(symbol, DATE_COLUMN), dtype=dtype, count=1, offset=(rows - 1) * dtype.itemsize)[0]
+        order = np.argsort(dates, kind="stable")
+        dates = dates[order]
+        keep = np.ones(len(dates), dtype=bool)
+        if len(dates):
+            keep[1:] = dates[1:] != dates[:-1]
+        # Today's bar changes until the session closes, and stored bars are never rewritten
+        keep &= dates < self.today()
+        if last is not None:
+            keep &= dates > last
+        if not keep.any():
+            return 0
+        os.makedirs(os.path.dirname(self._path(symbol, DATE_COLUMN)), exist_ok=True)
+        # Dates go last so a bar only counts once all of its values are on disk
+        for column in (*PRICE_COLUMNS, DATE_COLUMN):
+            values = dates if column == DATE_COLUMN else np.asarray(columns[column], dtype=np.float64)[order]
+            self._write(symbol, column, rows, values[keep])
+        self._maps.pop(symbol, None)
+        return int(keep.sum())
+
+    def _write(self, symbol: str, column: str, rows: int, values: np.ndarray) -> None:
+        """Append values to a column, first dropping any tail left by an interrupted write."""
+        dtype = COLUMN_DTYPES[column]
+        with open(self._path(symbol, column), "ab") as file:
+            if file.tell() != rows * dtype.itemsize:
+                file.truncate(rows * dtype.itemsize)
+            file.write(values.astype(dtype, copy=False).tobytes())
+
+    def due(self, symbol: str) -> bool:
+        """
+        Return whether a symbol should be checked for new bars: it has none yet, or
+        its last bar is before yesterday and it was not checked within the refresh interval.
+        """
+        symbol = symbol.upper()
+        last = self.last_date(symbol)
+        if last is None:
+            return True
+        if last >= self.today() - np.timedelta64(1, "D"):
+            return False
+        with self._lock:
+            checked = self._checked.get(symbol)
+        return checked is None or self.clock() - checked >= self.refresh_interval
+
+    def _mark_checked(self, symbol: str) -> None:
+        with self._lock:
+            self._checked[symbol.upper()] = self.clock()
+
+    def _adjusted(self, symbol: str, last: Optional[np.datetime64], bars: Bars) -> bool:
+        """Return whether the downloaded copy of the last stored bar has another close than the stored one."""
+        dates, columns = bars
+        if last is None:
+            return False
+        matches = np.flatnonzero(np.asarray(dates, dtype="datetime64[D]") == last)
+        stored = self.columns(symbol)["close"]
+        if not len(matches) or not len(stored) or stored[-1] <= 0:
+            return False
+        return abs(float(columns["close"][matches[-1]]) / float(stored[-1]) - 1.0) > PRICE_STORE_ADJUSTMENT_TOLERANCE
+
+    def _store(self, symbol: str, last: Optional[np.datetime64], bars: Bars) -> Optional[int]:
+        """Append downloaded bars, or return None when the stored ones were adjusted and need a full download."""
+        if self._adjusted(symbol, last, bars):
+            print("Warning:", f"Prices of {symbol.upper()} were adjusted since they were stored, rebuilding them")
+            return None
+        return self.append(symbol, *bars)
+
+    def refresh(self, symbol: str, fetch: Callable[[Optional[np.datetime64]], Bars]) -> int:
+        """
+        Download and append the bars from the last stored date on if the symbol is due,
+        rebuilding the symbol when the last stored bar has been adjusted since.
+        Concurrent refreshes of one symbol share a single download.
+
+        Args:
+            symbol: The stock symbol
+            fetch: Called with the date of the last stored bar (None for a full download) and
+                returning (dates, columns) of the bars from that date on
+
+        Returns:
+            The number of bars stored
+        """
+        def run() -> int:
+            if not self.due(symbol):
+                return 0
+            last = self.last_date(symbol)
+            added = self._store(symbol, last, fetch(last))
+            if added is None:
+                added = self.replace(symbol, *fetch(None))
+            self._mark_checked(symbol)
+            return added
+
+        return self._single_flight.do(symbol.upper(), run)
+
+    async def arefresh(self, symbol: str, fetch: Callable[[Optional[np.datetime64]], Awaitable[Bars]]) -> int:
+        """
+        Async variant of refresh; the download runs on the event loop.
+        """
+        async def run() -> int:
+            if not self.due(symbol):
+                return 0
+            last = self.last_date(symbol)
+            added = self._store(symbol, last, await fetch(last))
+            if added is None:
+                added = self.replace(symbol, *(await fetch(None)))
+            self._mark_checked(symbol)
+            return added
+
+        return await self._async_single_flight.do(symbol.upper(), run)
+
+    def symbols(self) -> list[str]:
+        """Return the symbols that have stored bars."""
+        if not os.path.isdir(self.directory):
+            return []
+        return sorted(name for name in os.listdir(self.directory) if self._stored_rows(name))
+
+
+_store: Optional[PriceStore] = None
+_store_lock = threading.Lock()
+
+
+def get_price_store() -> PriceStore:
+    """
+    Return the process-wide price store, creating it on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = PriceStore.from_env()
+    return _store
@@ -0,0 +1,228 @@
+"""
+Client-side rate limiter for the Financial Modeling Prep API.
+
+A token bucket shared by every FMP call keeps the process under the plan's
+per-minute quota. Callers pass a priority class: when tokens are scarce,
+interactive requests are served before batch and background ones, and a
+small reserve of the bucket is kept for interactive requests only.
+When FMP answers 429 the bucket is paused for the Retry-After period and
+the refill rate is halved, then it recovers gradually as calls succeed.
+Background work such as cache refreshes runs inside
+priority_floor(PRIORITY_BACKGROUND) so its requests never outrank that class.
+"""
+
+import asyncio
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from email.utils import parsedate_to_datetime
+from typing import Callable, Iterator, Optional
+from consts.consts import (
+    PRIORITY_INTERACTIVE, FMP_RATE_LIMIT_PER_MINUTE, FMP_RATE_LIMIT_BURST,
+    FMP_INTERACTIVE_RESERVE, FMP_RETRY_AFTER_DEFAULT
+)
+
+_priority_floor: ContextVar[int] = ContextVar("fmp_priority_floor", default=PRIORITY_INTERACTIVE)
+
+
+@contextmanager
+def priority_floor(priority: int) -> Iterator[None]:
+    """
+    Run a block whose rate-limited requests use at most the given priority class.
+    """
+    token = _priority_floor.set(priority)
+    try:
+        yield
+    finally:
+        _priority_floor.reset(token)
+
+
+def effective_priority(priority: int) -> int:
+    """Return the priority a request is served at, given the current priority_floor."""
+    return max(priority, _priority_floor.get())
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Parse a Retry-After header given either in seconds or as an HTTP date.
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """
+    Thread-safe and asyncio-friendly token bucket with priority classes.
+
+    Args:
+        rate_per_minute: Sustained number of calls allowed per minute
+        burst: Bucket capacity, i.e. calls that can be made back to back
+        interactive_reserve: Fraction of the bucket only interactive calls may use
+        clock: Function returning the current time in seconds
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float = FMP_RATE_LIMIT_PER_MINUTE,
+        burst: float = FMP_RATE_LIMIT_BURST,
+        interactive_reserve: float = FMP_INTERACTIVE_RESERVE,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        # A bucket that never holds a whole token, or never refills, would block every caller forever
+        if rate_per_minute <= 0:
+            raise ValueError(f"FMP rate limit must be positive, got {rate_per_minute} per minute")
+        if burst < 1:
+            raise ValueError(f"FMP rate limit burst must be at least 1, got {burst}")
+        self.base_rate = rate_per_minute / 60.0
+        self.rate = self.base_rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        # Lower priorities need one token above the reserve, so it must leave a token they can reach
+        self.reserve = min(interactive_reserve * burst, max(0.0, self.capacity - 1.0))
+        self.clock = clock
+        self.updated = clock()
+        self.paused_until = 0.0
+        self.throttled = 0
+        self._waiting: Counter = Counter()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def from_env(cls) -> "RateLimiter":
+        """
+        Create a limiter, overriding the defaults with FMP_RATE_LIMIT_* environment variables.
+        """
+        return cls(
+            rate_per_minute=float(os.environ.get("FMP_RATE_LIMIT_PER_MINUTE", FMP_RATE_LIMIT_PER_MINUTE)),
+            burst=float(os.environ.get("FMP_RATE_LIMIT_BURST", FMP_RATE_LIMIT_BURST)),
+        )
+
+    def _refill(self, now: float) -> None:
+        if now > self.updated:
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+    def _try_take(self, priority: int) -> float:
+        """
+        Take a token if this priority may have one; otherwise return how long to wait.
+        The caller must hold the lock.
+        """
+        now = self.clock()
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        needed = 1.0 if priority <= PRIORITY_INTERACTIVE else 1.0 + self.reserve
+        higher_waiting = any(count for p, count in self._waiting.items() if p < priority)
+        if self.tokens >= needed and not higher_waiting:
+            self.tokens -= 1.0
+            return 0.0
+        # Wait for the shortfall to refill; a queued higher priority caller gets the next token first
+        shortfall = max(needed - self.tokens, 1.0 if higher_waiting else 0.0)
+        return shortfall / self.rate
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None) -> bool:
+        """
+        Block until a token is available for the given priority.
+
+        Args:
+            priority: Priority class, lower values are served first
+            timeout: Maximum seconds to wait, or None to wait indefinitely
+
+        Returns:
+            True if a token was taken, False if the timeout expired
+        """
+        priority = effective_priority(priority)
+        deadline = None if timeout is None else self.clock() + timeout
+        with self._cond:
+            self._waiting[priority] += 1
+            try:
+                while True:
+                    wait = self._try_take(priority)
+                    if wait == 0.0:
+                        return True
+                    if deadline is not None:
+                        remaining = deadline - self.clock()
+                        if remaining <= 0:
+                            return False
+                        wait = min(wait, remaining)
+                    self._cond.wait(wait)
+            finally:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    async def aacquire(self, priority: int = PRIORITY_INTERACTIVE) -> None:
+        """
+        Async variant of acquire that sleeps on the event loop instead of blocking a thread.
+        """
+        priority = effective_priority(priority)
+        with self._cond:
+            self._waiting[priority] += 1
+        try:
+            while True:
+                with self._cond:
+                    wait = self._try_take(priority)
+                if wait == 0.0:
+                    return
+                await asyncio.sleep(wait)
+        finally:
+            with self._cond:
+                self._waiting[priority] -= 1
+                self._cond.notify_all()
+
+    def on_throttled(self, retry_after: Optional[float] = None) -> None:
+        """
+        React to a 429 response: pause for Retry-After and halve the refill rate.
+        """
+        with self._cond:
+            self.throttled += 1
+            pause = FMP_RETRY_AFTER_DEFAULT if retry_after is None else retry_after
+            self.paused_until = max(self.paused_until, self.clock() + pause)
+            self.tokens = 0.0
+            self.rate = max(self.base_rate / 10.0, self.rate / 2.0)
+
+    def on_success(self) -> None:
+        """
+        Recover the refill rate gradually after throttling.
+        """
+        with self._cond:
+            if self.rate < self.base_rate:
+                self.rate = min(self.base_rate, self.rate + self.base_rate / 20.0)
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return the current rate, available tokens, throttle count and waiting callers.
+        """
+        with self._cond:
+            self._refill(self.clock())
+            return {
+                "rate_per_minute": self.rate * 60.0,
+                "tokens": self.tokens,
+                "throttled": self.throttled,
+                "waiting": sum(self._waiting.values()),
+            }
+
+
+_limiter: Optional[RateLimiter] = None
+_limiter_lock = threading.Lock()
+
+
+def get_fmp_rate_limiter() -> RateLimiter:
+    """
+    Return the process-wide FMP rate limiter, creating it on first use.
+    """
+    global _limiter
+    if _limiter is None:
+        with _limiter_lock:
+            if _limiter is None:
+                _limiter = RateLimiter.from_env()
+    return _limiter
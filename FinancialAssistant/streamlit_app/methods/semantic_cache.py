@@ -0,0 +1,302 @@
+"""
+Semantic cache of chat-node answers.
+
+General questions ("what do you think of the tech market?") are often asked
+again in other words minutes later. SemanticCache keeps recent answers with a
+vector of their question and serves one when a new question is close enough
+that the LLM would answer it the same way.
+
+Questions are vectorized locally, without a model: words, word bigrams and
+character trigrams of the words left after dropping stop and filler words
+("what do you think of", "explain") are hashed into a fixed number of signed
+buckets and L2-normalized. The vectors of all cached answers form one dense
+matrix, so the nearest neighbours of a question are a single matrix-vector
+product. Lexical similarity alone would match "tech stocks" with "bank
+stocks", so a neighbour is only served when both questions also have the same
+content words, up to plural forms and typos.
+
+Answers expire after a time to live; when the cache is full the least recently
+used answer is replaced. With the "user" scope answers are only reused for the
+user who got them, with "global" they are shared. Questions that refer back to
+the conversation ("what about their debt?") are neither cached nor answered
+from the cache, since their answer depends on the summary.
+"""
+
+import difflib
+import os
+import re
+import threading
+import time
+import zlib
+from typing import Callable, Optional
+import numpy as np
+from consts.consts import (
+    SEMANTIC_CACHE_MIN_SIMILARITY, SEMANTIC_CACHE_TTL, SEMANTIC_CACHE_MAX_SIZE, SEMANTIC_CACHE_SCOPE,
+    SEMANTIC_CACHE_DIMENSIONS
+)
+
+SCOPE_USER = "user"
+SCOPE_GLOBAL = "global"
+MIN_TYPO_LENGTH = 5  # shorter words must match exactly
+MIN_TYPO_RATIO = 0.8  # difflib ratio at which two longer words count as the same
+
+# Function words and the phrasing of a question, which do not change what is asked. Question words
+# other than "what", negations and modals do ("why did AAPL fall?" is not "when did AAPL fall?")
+FILLER_WORDS = frozenset("""
+a an the of on in into for to and or but is are was were be been being do does did doing done
+i me my we us our you your it its this that these there here as at by from with about than so
+what whats any some much many very really actually basically exactly just please kindly
+think thoughts thought opinion opinions view views take feel believe
+explain explanation describe define definition mean means meaning tell know give show
+now currently today right
+""".split())
+
+_CONTEXT_PATTERN = re.compile(
+    r"\b(?:they|them|their|theirs|those|these|its|he|she|his|her|above|earlier|previous|previously|again|same)\b",
+    re.IGNORECASE,
+)
+
+
+def content_words(text: str) -> list[str]:
+    """
+    Return the lower-cased words of a question without stop and filler words and possessive endings.
+    Abbreviations written with dots or slashes ("P/E", "e.p.s.") become one word.
+    """
+    text = re.sub(r"(?<=\w)[/.](?=\w)|'s\b|'", "", text.lower())
+    return [word for word in re.sub(r"[^a-z0-9]+", " ", text).split() if word not in FILLER_WORDS]
+
+
+def _stem(word: str) -> str:
+    """Strip a plural ending, so "stocks" and "stock" compare equal."""
+    if len(word) > 4 and word.endswith("ies"):
+        return word[:-3] + "y"
+    if len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+        return word[:-1]
+    return word
+
+
+def same_content(words: list[str], other: list[str]) -> bool:
+    """
+    Return whether every content word of each question has a counterpart in the other,
+    either the same stem or, for longer words, a close spelling.
+    """
+    stems, other_stems = {_stem(word) for word in words}, {_stem(word) for word in other}
+
+    def covered(stem: str, candidates: set[str]) -> bool:
+        return stem in candidates or (len(stem) >= MIN_TYPO_LENGTH and any(
+            len(candidate) >= MIN_TYPO_LENGTH and difflib.SequenceMatcher(None, stem, candidate).ratio() >= MIN_TYPO_RATIO
+            for candidate in candidates
+        ))
+
+    return all(covered(stem, other_stems) for stem in stems) and all(covered(stem, stems) for stem in other_stems)
+
+
+class TextVectorizer:
+    """
+    Hashed n-gram vectorizer; the same text always gets the same vector, in any process.
+
+    Args:
+        dimensions: Number of hash buckets
+    """
+
+    def __init__(self, dimensions: int = SEMANTIC_CACHE_DIMENSIONS):
+        self.dimensions = dimensions
+
+    @staticmethod
+    def features(words: list[str]) -> list[tuple[str, float]]:
+        """Return the weighted features of a question's content words."""
+        features = [(f"w:{_stem(word)}", 1.0) for word in words]
+        features += [(f"b:{_stem(first)} {_stem(second)}", 1.0) for first, second in zip(words, words[1:])]
+        for word in words:
+            padded = f"<{word}>"
+            features += [(f"c:{padded[i:i + 3]}", 0.3) for i in range(len(padded) - 2)]
+        return features
+
+    def vectorize(self, words: list[str]) -> np.ndarray:
+        """Return the unit-length vector of a question's content words (all zeros when there are none)."""
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, weight in self.features(words):
+            bucket = zlib.crc32(feature.encode())
+            # The top bit of the hash picks the sign, so collisions cancel out instead of adding up
+            vector[bucket % self.dimensions] += weight if bucket & 0x80000000 else -weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+
+class SemanticCache:
+    """
+    Thread-safe nearest-neighbour cache of chat answers.
+
+    Args:
+        min_similarity: Cosine similarity a cached question needs to be considered
+        ttl: Seconds an answer is served
+        max_size: Number of answers kept
+        scope: "user" to reuse answers only for the user who got them, "global" to share them
+        vectorizer: Turns questions into vectors
+        clock: Function returning the current time in seconds
+        enabled: Whether to cache at all; when False every question goes to the LLM
+    """
+
+    def __init__(
+        self,
+        min_similarity: float = SEMANTIC_CACHE_MIN_SIMILARITY,
+        ttl: float = SEMANTIC_CACHE_TTL,
+        max_size: int = SEMANTIC_CACHE_MAX_SIZE,
+        scope: str = SEMANTIC_CACHE_SCOPE,
+        vectorizer: Optional[TextVectorizer] = None,
+        clock: Callable[[], float] = time.monotonic,
+        enabled: bool = True,
+    ):
+        if scope not in (SCOPE_USER, SCOPE_GLOBAL):
+            raise ValueError(f"Unknown semantic cache scope: {scope}")
+        self.min_similarity = min_similarity
+        self.ttl = ttl
+        self.max_size = max_size
+        self.scope = scope
+        self.vectorizer = vectorizer or TextVectorizer()
+        self.clock = clock
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self.skipped = 0
+        self._vectors = np.zeros((max_size, self.vectorizer.dimensions), dtype=np.float32)
+        self._expires_at = np.full(max_size, -np.inf)
+        self._last_used = np.full(max_size, -np.inf)
+        self._owners = np.full(max_size, -1, dtype=np.int64)
+        self._owner_ids: dict[str, int] = {}
+        self._next_owner = 0
+        self._words: list[list[str]] = [[] for _ in range(max_size)]
+        self._answers: list[Optional[str]] = [None] * max_size
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SemanticCache":
+        """
+        Create a cache that is enabled unless SEMANTIC_CACHE_ENABLED is "0", with the scope
+        in SEMANTIC_CACHE_SCOPE ("user" or "global").
+        """
+        return cls(
+            scope=os.environ.get("SEMANTIC_CACHE_SCOPE", SEMANTIC_CACHE_SCOPE),
+            enabled=os.environ.get("SEMANTIC_CACHE_ENABLED", "1") != "0",
+        )
+
+    @staticmethod
+    def cacheable(question: Optional[str]) -> bool:
+        """Return whether a question can be answered without the conversation it is part of."""
+        return bool(question) and not _CONTEXT_PATTERN.search(question) and bool(content_words(question))
+
+    def _owner_key(self, user_id: Optional[str]) -> str:
+        return (user_id or "") if self.scope == SCOPE_USER else ""
+
+    def _owner(self, user_id: Optional[str], now: float) -> int:
+        """
+        Return the owner number of a user's entries, assigning a new one if needed; the caller must hold the lock.
+        Numbers are never reused, and users without live entries are forgotten once there are more than max_size.
+        """
+        key = self._owner_key(user_id)
+        owner = self._owner_ids.get(key)
+        if owner is None:
+            if len(self._owner_ids) >= self.max_size:
+                live = set(self._owners[self._expires_at > now].tolist())
+                self._owner_ids = {name: number for name, number in self._owner_ids.items() if number in live}
+            owner = self._owner_ids[key] = self._next_owner
+            self._next_owner += 1
+        return owner
+
+    def _candidates(self, vector: np.ndarray, owner: int, now: float) -> list[tuple[float, int]]:
+        """Return (similarity, slot) of the live entries of an owner above the threshold, best first."""
+        similarities = self._vectors @ vector
+        live = (self._expires_at > now) & (self._owners == owner) & (similarities >= self.min_similarity)
+        slots = np.flatnonzero(live)
+        return sorted(zip(similarities[slots].tolist(), slots.tolist()), reverse=True)
+
+    def get(self, question: Optional[str], user_id: Optional[str] = None) -> Optional[str]:
+        """
+        Return the cached answer to a question asked in other words, or None to ask the LLM.
+        """
+        if not self.enabled or not self.cacheable(question):
+            with self._lock:
+                self.skipped += 1
+            return None
+        words = content_words(question)
+        vector = self.vectorizer.vectorize(words)
+        now = self.clock()
+        with self._lock:
+            owner = self._owner_ids.get(self._owner_key(user_id))
+            candidates = [] if owner is None else self._candidates(vector, owner, now)
+            for similarity, slot in candidates:
+                if same_content(words, self._words[slot]):
+                    self._last_used[slot] = now
+                    self.hits += 1
+                    print(f"Semantic cache hit ({similarity:.2f}): {question!r}")
+                    return self._answers[slot]
+            self.misses += 1
+            return None
+
+    def set(self, question: Optional[str], answer: Optional[str], user_id: Optional[str] = None) -> None:
+        """
+        Store the answer to a question, replacing the answer to the same question if there is one.
+        """
+        if not self.enabled or not answer or not self.cacheable(question):
+            return
+        words = content_words(question)
+        vector = self.vectorizer.vectorize(words)
+        now = self.clock()
+        with self._lock:
+            owner = self._owner(user_id, now)
+            same = [slot for _, slot in self._candidates(vector, owner, now) if same_content(words, self._words[slot])]
+            # Reuse the slot of the same question, else an expired one, else the least recently used
+            used = np.where(self._expires_at > now, self._last_used, -np.inf)
+            slot = same[0] if same else int(np.argmin(used))
+            self._vectors[slot] = vector
+            self._expires_at[slot] = now + self.ttl
+            self._last_used[slot] = now
+            self._owners[slot] = owner
+            self._words[slot] = words
+            self._answers[slot] = answer
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return the hit/miss counters, the questions skipped as context-dependent,
+        the number of live answers and the hit rate.
+        """
+        now = self.clock()
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "skipped": self.skipped,
+                "size": int(np.count_nonzero(self._expires_at > now)),
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self) -> None:
+        """Remove all answers and reset the counters."""
+        with self._lock:
+            self._vectors[:] = 0
+            self._expires_at[:] = -np.inf
+            self._last_used[:] = -np.inf
+            self._owners[:] = -1
+            self._owner_ids.clear()
+            self._words = [[] for _ in range(self.max_size)]
+            self._answers = [None] * self.max_size
+            self.hits = 0
+            self.misses = 0
+            self.skipped = 0
+
+
+_cache: Optional[SemanticCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_semantic_cache() -> SemanticCache:
+    """
+    Return the process-wide semantic cache of chat answers, creating it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = SemanticCache.from_env()
+    return _cache
@@ -0,0 +1,108 @@
+"""
+Single-flight request coalescing.
+
+When several callers ask for the same key at the same time, only the first
+one (the leader) runs the call; the others wait for it and share its result
+or its exception. SingleFlight serves threaded callers and AsyncSingleFlight
+serves coroutines running on an event loop.
+"""
+
+import asyncio
+import threading
+import weakref
+from typing import Any, Awaitable, Callable, Hashable, Optional
+
+
+class _Call:
+    """An in-flight call that followers wait on."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls with the same key across threads.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() unless a call for key is already in flight, in which case wait for its result.
+
+        Args:
+            key: Identifies identical requests
+            fn: The call to run when this caller is the leader
+
+        Returns:
+            The result of the leader's call
+
+        Raises:
+            Whatever exception the leader's call raised
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+            else:
+                call.followers += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+    def in_flight(self) -> int:
+        """Return the number of keys currently being fetched."""
+        with self._lock:
+            return len(self._calls)
+
+
+class AsyncSingleFlight:
+    """
+    Coalesces concurrent coroutine calls with the same key on each event loop.
+    """
+
+    def __init__(self):
+        self._tasks: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[Hashable, asyncio.Future]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Await fn() unless a call for key is already in flight on this loop, in which case await its result.
+
+        Args:
+            key: Identifies identical requests
+            fn: The coroutine factory to run when this caller is the leader
+
+        Returns:
+            The result of the leader's call
+        """
+        tasks = self._tasks.setdefault(asyncio.get_running_loop(), {})
+        task = tasks.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            tasks[key] = task
+            task.add_done_callback(lambda _: tasks.pop(key, None))
+        # shield so that one cancelled caller does not cancel the shared call
+        return await asyncio.shield(task)
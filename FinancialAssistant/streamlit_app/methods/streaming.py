@@ -0,0 +1,99 @@
+"""
+Streaming of graph answers into the UI.
+
+invoke only returns once every node, summarization included, has finished,
+so the user waits for the whole graph before seeing a word. AnswerStream
+runs the graph with stream/astream in "messages" and "updates" mode and
+yields the answer as it is produced: the tokens of the chat response while
+the LLM generates them, and each report or data section as soon as its node
+returns. When nothing could be streamed (an error, an answer served from a
+cache) the final answer is yielded as a whole. Either way the final answer
+is available afterwards, to replace the streamed pieces with the formatted
+answer and keep it in the chat history.
+"""
+
+import os
+from typing import Any, AsyncIterator, Iterator, Optional
+from langchain_core.messages import AIMessage
+from langchain_core.runnables.config import RunnableConfig
+from consts.consts import (
+    STREAM_RESPONSES, NODE_CHAT, NODE_FINAL_ANSWER,
+    NODE_INCOME_STATEMENT, NODE_COMPANY_FINANCIALS, NODE_STOCK_PRICE,
+    NODE_INCOME_STATEMENT_STAND_ALONE, NODE_COMPANY_FINANCIALS_STAND_ALONE, NODE_STOCK_PRICE_STAND_ALONE,
+    NODE_PRICE_HISTORY_STAND_ALONE, KEY_INCOME_STATEMENT, KEY_COMPANY_FINANCIALS, KEY_STOCK_PRICE,
+    KEY_PRICE_HISTORY, KEY_FINAL_ANSWER
+)
+
+STREAM_MODES = ["messages", "updates"]
+
+# Data nodes whose section is shown as soon as they return, and the state key holding it
+SECTION_KEYS = {
+    NODE_INCOME_STATEMENT: KEY_INCOME_STATEMENT,
+    NODE_COMPANY_FINANCIALS: KEY_COMPANY_FINANCIALS,
+    NODE_STOCK_PRICE: KEY_STOCK_PRICE,
+    NODE_INCOME_STATEMENT_STAND_ALONE: KEY_INCOME_STATEMENT,
+    NODE_COMPANY_FINANCIALS_STAND_ALONE: KEY_COMPANY_FINANCIALS,
+    NODE_STOCK_PRICE_STAND_ALONE: KEY_STOCK_PRICE,
+    NODE_PRICE_HISTORY_STAND_ALONE: KEY_PRICE_HISTORY,
+}
+
+
+def streaming_from_env() -> bool:
+    """Whether answers are streamed, unless STREAM_RESPONSES is "0"."""
+    value = os.environ.get("STREAM_RESPONSES")
+    return STREAM_RESPONSES if value is None else value != "0"
+
+
+class AnswerStream:
+    """
+    Iterable over the pieces of one answer, as the graph produces them.
+
+    Iterate it once, with for (graph.stream) or async for (graph.astream); final_answer
+    is set when the graph has produced it.
+
+    Args:
+        graph: The compiled graph
+        inputs: The graph input
+        config: The run config
+    """
+
+    def __init__(self, graph: Any, inputs: dict[str, Any], config: RunnableConfig):
+        self.graph = graph
+        self.inputs = inputs
+        self.config = config
+        self.final_answer: Optional[str] = None
+        self.streamed = False
+
+    def __iter__(self) -> Iterator[str]:
+        for mode, payload in self.graph.stream(self.inputs, self.config, stream_mode=STREAM_MODES):
+            piece = self._piece(mode, payload)
+            if piece:
+                yield piece
+
+    async def __aiter__(self) -> AsyncIterator[str]:
+        async for mode, payload in self.graph.astream(self.inputs, self.config, stream_mode=STREAM_MODES):
+            piece = self._piece(mode, payload)
+            if piece:
+                yield piece
+
+    def _piece(self, mode: str, payload: Any) -> Optional[str]:
+        """Return the text to show for one streamed event, if any."""
+        if mode == "messages":
+            message, metadata = payload
+            # Only the chat node talks to the user; the other nodes' LLM calls are structured decisions
+            if metadata.get("langgraph_node") != NODE_CHAT or not isinstance(message, AIMessage):
+                return None
+            self.streamed = True
+            return message.text()
+        pieces = []
+        for node, update in (payload or {}).items():
+            if not update:
+                continue
+            if node in SECTION_KEYS and update.get(SECTION_KEYS[node]):
+                self.streamed = True
+                pieces.append(update[SECTION_KEYS[node]])
+            elif node == NODE_FINAL_ANSWER:
+                self.final_answer = update.get(KEY_FINAL_ANSWER)
+                if not self.streamed:
+                    pieces.append(self.final_answer or "")
+        return "\n\n".join(pieces)
@@ -0,0 +1,219 @@
+"""
+Budget-aware policy for conversation summaries.
+
+Summarizing after every turn costs one LLM call per turn, and feeding it
+whole report answers makes each call grow with the report. SummaryPolicy
+keeps the spend per turn flat:
+
+- turns are collected per user and summarized together every N turns, or
+  earlier when their estimated size passes a token budget; until then the
+  router and chat nodes see the summary followed by the unsummarized turns,
+  so no context is lost;
+- answers are compressed before they are collected: the "- **Label**: value"
+  bullets of reports become one line of facts per section, and any answer is
+  cut to a fixed number of characters;
+- the stored summary is capped at a fixed size, at a sentence boundary.
+
+Token counts are estimated at four characters per token, which is close
+enough for budgeting and needs no tokenizer download.
+"""
+
+import itertools
+import math
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Optional
+from consts.consts import SUMMARY_EVERY_N_TURNS, SUMMARY_TOKEN_BUDGET, SUMMARY_MAX_TOKENS, SUMMARY_TURN_MAX_CHARS
+
+CHARS_PER_TOKEN = 4
+MAX_USERS = 10000  # users whose unsummarized turns are kept; the least recently active are dropped
+
+_HEADING_PATTERN = re.compile(r"^#+\s*(.+?)\s*$")
+_BULLET_PATTERN = re.compile(r"^[-*]\s*\*\*(.+?)\*\*:?\s*(.*)$")
+_LINK_PATTERN = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+
+
+def estimate_tokens(text: Optional[str]) -> int:
+    """Estimate the number of tokens of a text."""
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def _truncate(text: str, max_chars: int, separator: str) -> str:
+    """Cut text to max_chars, at the last separator that fits if there is one."""
+    if len(text) <= max_chars:
+        return text
+    cut = text.rfind(separator, 0, max_chars - 1)
+    return (text[:cut + len(separator.rstrip())] if cut > 0 else text[:max_chars - 1].rstrip()) + "…"
+
+
+def compress_answer(answer: Optional[str], max_chars: int = SUMMARY_TURN_MAX_CHARS) -> str:
+    """
+    Compress an answer into compact facts: report bullets become "Section: Label value; ..." lines
+    and the result is cut to max_chars.
+    """
+    sections: "OrderedDict[str, list[str]]" = OrderedDict()
+    section = ""
+    has_facts = False
+    for line in (answer or "").splitlines():
+        line = " ".join(line.split())
+        heading = _HEADING_PATTERN.match(line)
+        bullet = _BULLET_PATTERN.match(line)
+        if heading:
+            section = heading.group(1)
+        elif bullet:
+            value = _LINK_PATTERN.sub(r"\1", bullet.group(2)).replace("$ ", "$").strip()
+            sections.setdefault(section, []).append(f"{bullet.group(1)} {value}".strip())
+            has_facts = True
+        elif line:
+            sections.setdefault(section, []).append(line)
+    lines = [f"{name}: {'; '.join(facts)}" if name else " ".join(facts) for name, facts in sections.items()]
+    # Reports are cut between facts, prose between sentences
+    return _truncate("\n".join(lines), max_chars, "; " if has_facts else ". ")
+
+
+class SummaryPolicy:
+    """
+    Thread-safe per-user record of unsummarized turns, deciding when to summarize them.
+
+    Args:
+        every_n_turns: Turns collected before they are summarized together
+        token_budget: Estimated tokens of collected turns that trigger a summary earlier
+        max_summary_tokens: Hard cap on the stored summary
+        turn_max_chars: Characters an answer is compressed to
+    """
+
+    def __init__(
+        self,
+        every_n_turns: int = SUMMARY_EVERY_N_TURNS,
+        token_budget: int = SUMMARY_TOKEN_BUDGET,
+        max_summary_tokens: int = SUMMARY_MAX_TOKENS,
+        turn_max_chars: int = SUMMARY_TURN_MAX_CHARS,
+    ):
+        self.every_n_turns = max(1, every_n_turns)
+        self.token_budget = token_budget
+        self.max_summary_tokens = max_summary_tokens
+        self.turn_max_chars = turn_max_chars
+        # Per user, [turn, claim] pairs oldest first; claim 0 means no summary has claimed the turn
+        self._pending: "OrderedDict[str, list[list]]" = OrderedDict()
+        self._claims = itertools.count(1)
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls) -> "SummaryPolicy":
+        """
+        Create a policy with the turn count in SUMMARY_EVERY_N_TURNS and the budget in SUMMARY_TOKEN_BUDGET.
+        """
+        return cls(
+            every_n_turns=int(os.environ.get("SUMMARY_EVERY_N_TURNS", SUMMARY_EVERY_N_TURNS)),
+            token_budget=int(os.environ.get("SUMMARY_TOKEN_BUDGET", SUMMARY_TOKEN_BUDGET)),
+        )
+
+    def format_turn(self, request: str, request_category: str, symbol: str, answer: Optional[str]) -> str:
+        """Format one turn, with its answer compressed, for the summarization chain."""
+        # Build a conversation string with metadata
+        turn = f"User: {request}\n"
+        turn += f"Request Type: {request_category.replace('_', ' ').title()}\n"
+        # Add symbol information if available and relevant
+        if symbol != 'UNKNOWN' and request_category != 'chat':
+            turn += f"Company Symbol: {symbol}\n"
+        turn += f"Assistant: {compress_answer(answer, self.turn_max_chars)}\n"
+        return turn
+
+    def add_turn(self, user_id: str, turn: str) -> bool:
+        """
+        Record an unsummarized turn of a user.
+
+        Returns:
+            True if the user's turns not yet claimed by a summary are due to be summarized
+        """
+        with self._lock:
+            turns = self._pending.setdefault(user_id, [])
+            turns.append([turn, 0])
+            self._pending.move_to_end(user_id)
+            while len(self._pending) > MAX_USERS:
+                self._pending.popitem(last=False)
+            unclaimed = [text for text, claim in turns if not claim]
+            return len(unclaimed) >= self.every_n_turns or estimate_tokens("".join(unclaimed)) >= self.token_budget
+
+    def claim(self, user_id: str) -> tuple[int, list[str]]:
+        """
+        Claim the turns of a user not yet claimed by a summary.
+
+        A claimed turn is kept, and shown by context(), until mark_summarized() drops it
+        or release() hands it to the next claim.
+
+        Returns:
+            The claim number and the claimed turns, oldest first
+        """
+        with self._lock:
+            claim = next(self._claims)
+            claimed = []
+            for entry in self._pending.get(user_id, ()):
+                if not entry[1]:
+                    entry[1] = claim
+                    claimed.append(entry[0])
+            return claim, claimed
+
+    def mark_summarized(self, user_id: str, claim: int) -> None:
+        """Forget the turns of a claim, which are now part of the summary."""
+        with self._lock:
+            turns = self._pending.get(user_id)
+            if turns is None:
+                return
+            turns[:] = [entry for entry in turns if entry[1] != claim]
+            if not turns:
+                del self._pending[user_id]
+
+    def release(self, user_id: str, claim: int) -> None:
+        """Return the turns of a claim whose summary failed, so the next claim takes them."""
+        with self._lock:
+            for entry in self._pending.get(user_id, ()):
+                if entry[1] == claim:
+                    entry[1] = 0
+
+    def pending(self, user_id: str) -> list[str]:
+        """Return the unsummarized turns of a user, claimed or not, oldest first."""
+        with self._lock:
+            return [text for text, _ in self._pending.get(user_id, ())]
+
+    def context(self, user_id: str, summary: Optional[str]) -> str:
+        """
+        Return what the nodes should know of the conversation: the summary followed by the turns not yet in it.
+        """
+        turns = self.pending(user_id)
+        if not turns:
+            return summary or ""
+        recent = "Recent turns, not yet summarized:\n" + "\n".join(turns)
+        return f"{summary}\n\n{recent}" if summary else recent
+
+    def cap_summary(self, summary: str) -> str:
+        """Cut a summary to the maximum size, at a sentence boundary when possible."""
+        return _truncate(summary, self.max_summary_tokens * CHARS_PER_TOKEN, ". ")
+
+    @property
+    def max_summary_words(self) -> int:
+        """The summary size asked of the LLM, in words, leaving room below the hard cap."""
+        return self.max_summary_tokens * 3 // 5
+
+    def clear(self) -> None:
+        """Forget all unsummarized turns."""
+        with self._lock:
+            self._pending.clear()
+
+
+_policy: Optional[SummaryPolicy] = None
+_policy_lock = threading.Lock()
+
+
+def get_summary_policy() -> SummaryPolicy:
+    """
+    Return the process-wide summary policy, creating it on first use.
+    """
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = SummaryPolicy.from_env()
+    return _policy
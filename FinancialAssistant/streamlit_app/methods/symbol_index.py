@@ -0,0 +1,349 @@
+"""
+Local resolver from tickers and company names to stock symbols.
+
+The index is built lazily from a CSV symbol list (symbol, name and optional
+"|"-separated aliases, most important companies first) and answers three
+kinds of lookups without the LLM:
+
+- exact tickers, written in upper case ("AAPL") or with a dollar sign ("$aapl");
+- company names, normalized (lower case, no punctuation or corporate suffixes)
+  and kept in one sorted list, which serves as a compact trie: the names
+  starting with a phrase of two or more words form a contiguous range found
+  by binary search;
+- misspelt names, through an inverted index of character trigrams scored
+  with the Dice coefficient, when the phrase is about as long as the name.
+
+A request resolves only when every mention points at the same company;
+anything ambiguous is left to the extraction chain. The bundled list covers
+large companies with common aliases; a full list can be downloaded from FMP:
+
+    python -m methods.symbol_index download --output data/symbols.csv
+"""
+
+import bisect
+import csv
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Iterable, Optional
+import numpy as np
+from pydantic import SecretStr
+from consts.consts import (
+    SYMBOL_LIST_PATH, SYMBOL_FUZZY_MIN_SIMILARITY, SYMBOL_FUZZY_MIN_MARGIN, SYMBOL_FUZZY_MIN_COVERAGE,
+    FMP_ENDPOINT_STOCK_LIST, PRIORITY_BACKGROUND
+)
+
+APP_DIR = Path(__file__).resolve().parent.parent
+MAX_NAME_WORDS = 4  # longest phrase looked up as a company name
+MIN_FUZZY_LENGTH = 4  # shorter words are never matched fuzzily
+
+# Words dropped from the end of company names ("Apple Inc." -> "apple")
+_NAME_SUFFIXES = {
+    "inc", "incorporated", "corp", "corporation", "co", "company", "companies", "ltd", "limited",
+    "plc", "llc", "lp", "group", "holding", "holdings", "nv", "sa", "se", "as", "ag", "and", "com",
+}
+# Words that never start a company mention: grammar, finance vocabulary and route keywords
+_STOPWORDS = set("""
+a about after all also am an and any are as at be been before being between both but by can could
+did do does doing done for from get give had has have how i if in into is it its just last latest
+let like me more most my need next no not now of off on once only or our over past please recent
+recently right same see should show so some tell than that the their them then there these they this
+those through to too up us very want was we were what when where which while who why will with would
+you your compare versus vs
+stock stocks share shares price prices quote quotes ticker symbol company companies firm business
+income statement statements revenue revenues sales profit profits earnings eps ebitda margin margins
+gross net financial financials report reports overview summary analysis info information data details
+performance performed perform return returns history historical chart value market cap capitalization
+current today year years month months week weeks day days ytd annual quarterly growth trend trends
+volume dividend dividends valuation ratio pe doing going look looking think thoughts opinion
+gold silver oil gas crude bitcoin crypto cryptocurrency commodity commodities bond bonds treasury
+treasuries yield yields rate rates interest inflation economy economic fed dollar euro currency
+fund funds etf index indices sector sectors industry tech technology markets bull bear buy sell
+invest investing investment investor investors portfolio money cash debt loan mortgage housing
+news week good bad best worst big top new high low up down
+""".split())
+# Upper-case words in requests that are finance acronyms rather than tickers
+_ACRONYMS = {"A", "I", "CEO", "CFO", "EPS", "PE", "ETF", "IPO", "YTD", "RSI", "MACD", "EBITDA", "USA", "US", "AI", "OK"}
+
+_TOKEN_PATTERN = re.compile(r"\$?[A-Za-z0-9][A-Za-z0-9.&'-]*")
+_INITIALISM_PATTERN = re.compile(r"\b((?:[a-z][./]){2,}|[a-z]/[a-z]\b)")
+
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize a company name or phrase for lookup: "The Procter & Gamble Company" -> "procter and gamble".
+    """
+    text = unicodedata.normalize("NFKD", name).encode("ascii", "ignore").decode().lower()
+    text = _INITIALISM_PATTERN.sub(lambda match: re.sub(r"[./]", "", match.group(1)), text)
+    text = text.replace("&", " and ").replace("'s ", " ").replace("'", "")
+    words = re.sub(r"[^a-z0-9]+", " ", text).split()
+    while len(words) > 1 and words[-1] in _NAME_SUFFIXES:
+        words.pop()
+    if len(words) > 1 and words[0] == "the":
+        words.pop(0)
+    return " ".join(words)
+
+
+def _trigrams(text: str) -> set[str]:
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class SymbolIndex:
+    """
+    Thread-safe, lazily loaded index of a symbol list.
+
+    Args:
+        path: CSV file with symbol, name and optional aliases columns
+        min_similarity: Trigram similarity a misspelt name needs to match
+        min_margin: Lead the best fuzzy match needs over the next company
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        min_similarity: float = SYMBOL_FUZZY_MIN_SIMILARITY,
+        min_margin: float = SYMBOL_FUZZY_MIN_MARGIN,
+    ):
+        self.path = path or os.environ.get("SYMBOL_LIST_PATH") or str(APP_DIR / SYMBOL_LIST_PATH)
+        self.min_similarity = min_similarity
+        self.min_margin = min_margin
+        self._loaded = False
+        self._lock = threading.Lock()
+        self._outcomes: Counter = Counter()
+        self.symbols: list[str] = []
+        self._tickers: dict[str, int] = {}
+        self._names: list[str] = []
+        self._name_rows: list[int] = []
+        self._postings: dict[str, np.ndarray] = {}
+        self._trigram_counts = np.zeros(0, dtype=np.int32)
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self.symbols)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._lock:
+            if not self._loaded:
+                try:
+                    with open(self.path, encoding="utf-8", newline="") as file:
+                        self._build(csv.DictReader(file))
+                except OSError as e:
+                    print("Error:", f"Could not read symbol list {self.path}: {e}")
+                self._loaded = True
+
+    def _build(self, rows: Iterable[dict[str, str]]) -> None:
+        """Build the ticker map, the sorted name list and the trigram postings; earlier rows win ties."""
+        names: dict[str, int] = {}
+        for row in rows:
+            symbol = (row.get("symbol") or "").strip().upper()
+            if not symbol or symbol in self._tickers:
+                continue
+            index = self._tickers[symbol] = len(self.symbols)
+            self.symbols.append(symbol)
+            for name in [row.get("name") or "", *(row.get("aliases") or "").split("|")]:
+                normalized = normalize_name(name)
+                if normalized:
+                    names.setdefault(normalized, index)
+        self._names = sorted(names)
+        self._name_rows = [names[name] for name in self._names]
+        postings: defaultdict[str, list[int]] = defaultdict(list)
+        counts = []
+        for position, name in enumerate(self._names):
+            grams = _trigrams(name)
+            counts.append(len(grams))
+            for gram in grams:
+                postings[gram].append(position)
+        self._postings = {gram: np.array(ids, dtype=np.int32) for gram, ids in postings.items()}
+        self._trigram_counts = np.array(counts, dtype=np.int32)
+
+    def lookup_ticker(self, ticker: str) -> Optional[str]:
+        """Return the ticker if it is in the list."""
+        self._ensure_loaded()
+        ticker = ticker.upper()
+        return ticker if ticker in self._tickers else None
+
+    def lookup_name(self, phrase: str, prefix: bool = True) -> set[str]:
+        """
+        Return the symbols whose name is the phrase or, failing that and with prefix set,
+        starts with it as whole words.
+        """
+        self._ensure_loaded()
+        phrase = normalize_name(phrase)
+        if not phrase:
+            return set()
+        position = bisect.bisect_left(self._names, phrase)
+        if position < len(self._names) and self._names[position] == phrase:
+            return {self.symbols[self._name_rows[position]]}
+        if not prefix:
+            return set()
+        start = bisect.bisect_left(self._names, phrase + " ", lo=position)
+        end = bisect.bisect_left(self._names, phrase + " ￿", lo=start)
+        return {self.symbols[row] for row in self._name_rows[start:end]}
+
+    def fuzzy(self, phrase: str) -> Optional[str]:
+        """
+        Return the symbol of the name most similar to a misspelt phrase, if it is similar
+        enough, about as long as the phrase and clearly ahead of every other company.
+        """
+        self._ensure_loaded()
+        phrase = normalize_name(phrase)
+        if len(phrase) < MIN_FUZZY_LENGTH or not self._names:
+            return None
+        grams = _trigrams(phrase)
+        hits = [self._postings[gram] for gram in grams if gram in self._postings]
+        if not hits:
+            return None
+        shared = np.bincount(np.concatenate(hits), minlength=len(self._names))
+        scores = 2.0 * shared / (len(grams) + self._trigram_counts)
+        best = int(scores.argmax())
+        name = self._names[best]
+        # A word shared with a longer name ("gold" in "goldman", "health" in "cvs health") is not a misspelling
+        if min(len(phrase), len(name)) < SYMBOL_FUZZY_MIN_COVERAGE * max(len(phrase), len(name)):
+            return None
+        symbol = self.symbols[self._name_rows[best]]
+        others = [scores[i] for i in np.argsort(scores)[-5:] if self.symbols[self._name_rows[i]] != symbol]
+        runner_up = max(others, default=0.0)
+        if scores[best] >= self.min_similarity and scores[best] - runner_up >= self.min_margin:
+            return symbol
+        return None
+
+    def resolve(self, request: Optional[str], record: bool = True) -> Optional[str]:
+        """
+        Return the single symbol a request refers to, or None when it names no company,
+        several companies, or a name that could mean more than one company.
+        With record unset the outcome is left out of stats().
+        """
+        self._ensure_loaded()
+        found: set[str] = set()
+        ambiguous = False
+        run: list[str] = []
+        runs: list[list[str]] = []
+        # Case only marks a ticker when the request is not written all in capitals
+        shouting = not any(char.islower() for char in request or "")
+        for token in _TOKEN_PATTERN.findall(request or ""):
+            token = token.rstrip(".'-")
+            bare = token[:-2] if token.lower().endswith("'s") else token
+            if bare.startswith("$") or (
+                bare.isupper() and bare not in _ACRONYMS and not (shouting and bare.lower() in _STOPWORDS)
+            ):
+                ticker = self.lookup_ticker(bare.lstrip("$"))
+                if ticker is not None:
+                    found.add(ticker)
+                    runs.append(run)
+                    run = []
+                    continue
+            word = normalize_name(bare)
+            if not word or word in _STOPWORDS or word.isdigit():
+                runs.append(run)
+                run = []
+            else:
+                run.append(word)
+        runs.append(run)
+
+        for words in filter(None, runs):
+            symbols, unclear = self._resolve_run(words)
+            found |= symbols
+            ambiguous |= unclear
+        if len(found) == 1 and not ambiguous:
+            outcome, symbol = "resolved", next(iter(found))
+        else:
+            outcome, symbol = ("ambiguous" if found or ambiguous else "unresolved"), None
+        if record:
+            with self._lock:
+                self._outcomes[outcome] += 1
+        return symbol
+
+    def _resolve_run(self, words: list[str]) -> tuple[set[str], bool]:
+        """Match the longest name phrases in a run of content words, then try the rest fuzzily."""
+        found: set[str] = set()
+        ambiguous = False
+        unmatched: list[str] = []
+        i = 0
+        while i < len(words):
+            for n in range(min(MAX_NAME_WORDS, len(words) - i), 0, -1):
+                # A single word must be a whole name: "home" is not "Home Depot"
+                symbols = self.lookup_name(" ".join(words[i:i + n]), prefix=n > 1)
+                if symbols:
+                    found |= symbols
+                    ambiguous |= len(symbols) > 1
+                    i += n
+                    break
+            else:
+                unmatched.append(words[i])
+                i += 1
+        if unmatched and not found:
+            symbol = self.fuzzy(" ".join(unmatched))
+            if symbol is None and len(unmatched) > 1:
+                matches = {self.fuzzy(word) for word in unmatched} - {None}
+                symbol = matches.pop() if len(matches) == 1 else None
+            if symbol is not None:
+                found.add(symbol)
+        return found, ambiguous
+
+    def stats(self) -> dict[str, float]:
+        """
+        Return how many requests were resolved locally, were ambiguous or named no known company.
+        """
+        with self._lock:
+            outcomes = dict(self._outcomes)
+        total = sum(outcomes.values())
+        return {**outcomes, "resolved_fraction": outcomes.get("resolved", 0) / total if total else 0.0}
+
+
+def download_symbol_list(api_key: SecretStr, path: str, exchanges: Iterable[str] = ("NASDAQ", "NYSE", "AMEX")) -> int:
+    """
+    Write the stocks listed on the given exchanges, as returned by FMP, to a symbol list CSV.
+
+    Returns:
+        The number of symbols written
+
+    Raises:
+        requests.RequestException: If FMP cannot be reached
+    """
+    from methods.fmp_client import get_fmp_client
+
+    exchanges = set(exchanges)
+    rows = [
+        row for row in get_fmp_client().get_json(FMP_ENDPOINT_STOCK_LIST, api_key, priority=PRIORITY_BACKGROUND)
+        if row.get("type") == "stock" and row.get("exchangeShortName") in exchanges and row.get("name")
+    ]
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = csv.writer(file, lineterminator="\n")
+        writer.writerow(["symbol", "name", "aliases"])
+        writer.writerows([row["symbol"], row["name"], ""] for row in rows)
+    return len(rows)
+
+
+_index: Optional[SymbolIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_symbol_index() -> SymbolIndex:
+    """
+    Return the process-wide symbol index; the symbol list is read on the first lookup.
+    """
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = SymbolIndex()
+    return _index
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Manage the symbol list of the local symbol resolver")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+    download = subcommands.add_parser("download", help="download the listed stocks from FMP")
+    download.add_argument("--output", default=str(APP_DIR / SYMBOL_LIST_PATH))
+    args = parser.parse_args()
+    count = download_symbol_list(SecretStr(os.environ["FINANCIAL_MODELING_PREP_API_KEY"]), args.output)
+    print(f"Wrote {count} symbols to {args.output}")
@@ -0,0 +1,130 @@
+"""
+Background task queue with per-key ordering.
+
+Tasks submitted under the same key (a user id) run one at a time in the
+order they were submitted, so a task always sees the results of the ones
+before it; tasks under different keys run in parallel on a small pool of
+worker threads. A key is served by one drain job that runs its tasks until
+its queue is empty, so no worker ever blocks waiting for another.
+"""
+
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Hashable, Optional
+from consts.consts import SUMMARY_QUEUE_WORKERS
+
+
+class KeyedTaskQueue:
+    """
+    Runs tasks in the background, in submission order per key.
+
+    Args:
+        workers: Keys served at once; 0 runs tasks inline in the caller, e.g. in tests
+        name: Prefix of the worker thread names
+    """
+
+    def __init__(self, workers: int = SUMMARY_QUEUE_WORKERS, name: str = "task-queue"):
+        self.workers = workers
+        self.name = name
+        self.submitted = 0
+        self.completed = 0
+        self.failed = 0
+        self._queues: dict[Hashable, deque] = {}
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    @classmethod
+    def from_env(cls, name: str = "summarize") -> "KeyedTaskQueue":
+        """
+        Create a queue with SUMMARY_QUEUE_WORKERS workers.
+        """
+        return cls(workers=int(os.environ.get("SUMMARY_QUEUE_WORKERS", SUMMARY_QUEUE_WORKERS)), name=name)
+
+    def submit(self, key: Hashable, task: Callable[[], Any]) -> None:
+        """
+        Run task() after every task submitted earlier under the same key.
+        """
+        with self._lock:
+            self.submitted += 1
+            queue = self._queues.get(key)
+            if queue is not None:
+                # A drain job is already serving the key and will pick the task up
+                queue.append(task)
+                return
+            self._queues[key] = deque([task])
+            if self.workers > 0 and self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix=self.name)
+            executor = self._executor
+        if executor is None:
+            self._drain(key)
+        else:
+            executor.submit(self._drain, key)
+
+    def _drain(self, key: Hashable) -> None:
+        """Run the tasks of a key until its queue is empty."""
+        while True:
+            with self._lock:
+                queue = self._queues[key]
+                if not queue:
+                    del self._queues[key]
+                    self._idle.notify_all()
+                    return
+                task = queue[0]
+            try:
+                task()
+                outcome = "completed"
+            except Exception as e:
+                print("Error:", f"Background task for {key} failed: {e}")
+                outcome = "failed"
+            with self._lock:
+                # The task is only removed once done, so the key stays pending while it runs
+                queue.popleft()
+                setattr(self, outcome, getattr(self, outcome) + 1)
+
+    def pending(self, key: Optional[Hashable] = None) -> int:
+        """Return the number of tasks not yet finished, for one key or in total."""
+        with self._lock:
+            if key is not None:
+                return len(self._queues.get(key, ()))
+            return sum(len(queue) for queue in self._queues.values())
+
+    def wait(self, key: Optional[Hashable] = None, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until the tasks of a key, or all tasks, have finished.
+
+        Returns:
+            False if the timeout expired first
+        """
+        with self._idle:
+            return self._idle.wait_for(
+                lambda: key not in self._queues if key is not None else not self._queues, timeout
+            )
+
+    def stats(self) -> dict[str, int]:
+        """Return the submitted, completed, failed and pending task counts."""
+        with self._lock:
+            return {
+                "submitted": self.submitted,
+                "completed": self.completed,
+                "failed": self.failed,
+                "pending": sum(len(queue) for queue in self._queues.values()),
+            }
+
+
+_queue: Optional[KeyedTaskQueue] = None
+_queue_lock = threading.Lock()
+
+
+def get_summary_queue() -> KeyedTaskQueue:
+    """
+    Return the process-wide queue of conversation summaries, creating it on first use.
+    """
+    global _queue
+    if _queue is None:
+        with _queue_lock:
+            if _queue is None:
+                _queue = KeyedTaskQueue.from_env()
+    return _queue
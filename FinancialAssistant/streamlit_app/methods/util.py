@@ -2,14 +2,9 @@ from langchain_core.runnables.config import RunnableConfig
 from pydantic import SecretStr
 from classes.config import Config
 from langchain_core.runnables.config import RunnableConfig
-from langchain_openai import ChatOpenAI
-from langchain_groq import ChatGroq
-from langchain_anthropic import ChatAnthropic
 from typing import Any, Union
-from consts.consts import (
-    KEY_FMP_API_KEY, PROVIDER_OPENAI, PROVIDER_GROQ, PROVIDER_ANTHROPIC,
-    MODEL_OPENAI, MODEL_GROQ, MODEL_ANTHROPIC
-)
+from consts.consts import KEY_FMP_API_KEY
+from methods.llm_registry import get_llm_registry
 
 # Define KEY_CONFIG constant
 KEY_CONFIG = "configurable"
@@ -20,28 +15,11 @@ def get_llm(config: Config)-> Any:
     """
     Get the LLM based on the provider and API key.
     Supported providers: "Groq", "OpenAI", "Anthropic"
-    """
-    # The api_key is already a SecretStr, so we can pass it directly
-    if config.provider == PROVIDER_OPENAI:
-        return ChatOpenAI(api_key=config.llm_api_key, model=MODEL_OPENAI)
-    elif config.provider == PROVIDER_GROQ:
-        return ChatGroq(api_key=config.llm_api_key, model=MODEL_GROQ,
-                        temperature=0,
-                        max_tokens=None,
-                        timeout=None,
-                        max_retries=2,)
-    elif config.provider == PROVIDER_ANTHROPIC:
-        return ChatAnthropic(
-            api_key=config.llm_api_key,
-            model_name=MODEL_ANTHROPIC,
-            temperature=0.0,
-            timeout=None,
-            max_retries=2,
-            stop=None
-        )
-
 
-    raise ValueError(f"Unsupported provider: {config.provider}")
+    The model is shared by every session using the same provider and API key,
+    so their chains reuse its pooled connections.
+    """
+    return get_llm_registry().get(config)
 
 def get_memory_manager(store: BaseStore) -> MemoryManager:
   if isinstance(store, MemoryManager):
@@ -0,0 +1,170 @@
+"""
+Startup warm-up for the Financial Assistant.
+
+Right after a deploy every cache is empty and no connection is open, so the
+first users pay for TCP+TLS handshakes and full FMP round trips. The warm-up
+opens the pooled connections to FMP and to the LLM provider, then loads the
+quote, profile and income statement of every symbol on a watchlist into the
+FMP cache and its daily prices into the price store, so technical indicators
+are available without another call. Data is fetched in batches at background priority, so the rate
+limiter serves real users first if they arrive while it is still running.
+
+The watchlist is read from FMP_WATCHLIST (comma-separated symbols) or from
+the file named by FMP_WATCHLIST_FILE (one symbol per line, # for comments).
+"""
+
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+import httpx
+import requests
+from pydantic import SecretStr
+from classes.company_financials import get_company_financials
+from classes.income_statement import get_income_statement
+from classes.price_history import fetch_price_bars
+from classes.stock_price import get_stock_prices
+from consts.consts import (
+    FMP_WATCHLIST_ENV, FMP_WATCHLIST_FILE_ENV, FMP_BATCH_CONCURRENCY, PRIORITY_BACKGROUND
+)
+from methods.fmp_client import get_fmp_client
+from methods.price_store import get_price_store
+
+_started = False
+_started_lock = threading.Lock()
+
+
+def load_watchlist(path: Optional[str] = None) -> list[str]:
+    """
+    Return the upper-cased, de-duplicated watchlist symbols.
+
+    Args:
+        path: Watchlist file to read; defaults to FMP_WATCHLIST_FILE, then FMP_WATCHLIST
+    """
+    path = path or os.environ.get(FMP_WATCHLIST_FILE_ENV)
+    if path:
+        try:
+            with open(path, encoding="utf-8") as file:
+                text = "\n".join(line.split("#", 1)[0] for line in file)
+        except OSError as e:
+            print("Error:", f"Could not read watchlist {path}: {e}")
+            text = ""
+    else:
+        text = os.environ.get(FMP_WATCHLIST_ENV, "")
+    symbols = (symbol.strip().upper() for symbol in text.replace(",", "\n").splitlines())
+    return list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+
+def warm_up_connections(llm: Any = None) -> None:
+    """
+    Open pooled connections to FMP and, when given, to the LLM provider.
+    Failures are reported and ignored; the first real request will simply connect itself.
+    """
+    try:
+        get_fmp_client().warm_up()
+    except requests.RequestException as e:
+        print("Error:", f"Could not open a connection to FMP: {e}")
+    http_client = _find_http_client(llm) if llm is not None else None
+    if http_client is not None:
+        try:
+            http_client.head(str(http_client.base_url))
+        except httpx.HTTPError as e:
+            print("Error:", f"Could not open a connection to the LLM provider: {e}")
+
+
+def _find_http_client(obj: Any, depth: int = 0) -> Optional[httpx.Client]:
+    """Find the pooled httpx client inside a LangChain chat model and its provider SDK client."""
+    if isinstance(obj, httpx.Client):
+        return obj
+    if depth > 3:
+        return None
+    for name in ("root_client", "client", "_client"):
+        child = getattr(obj, name, None)
+        if child is not None and child is not obj:
+            found = _find_http_client(child, depth + 1)
+            if found is not None:
+                return found
+    return None
+
+
+def warm_fmp_cache(symbols: list[str], api_key: SecretStr, priority: int = PRIORITY_BACKGROUND) -> dict[str, int]:
+    """
+    Load the quote, profile and income statement of every symbol into the FMP cache
+    and its daily prices into the price store.
+
+    Returns:
+        How many symbols were loaded for each kind of data
+    """
+    if not symbols:
+        return {"quotes": 0, "profiles": 0, "income_statements": 0, "price_histories": 0}
+    quotes = _warm("the quotes", ", ".join(symbols), lambda: get_stock_prices(symbols, api_key, priority=priority)) or {}
+    with ThreadPoolExecutor(max_workers=min(len(symbols), FMP_BATCH_CONCURRENCY)) as executor:
+        profiles = list(executor.map(
+            lambda symbol: _warm("the profile", symbol, lambda: get_company_financials(symbol, api_key, priority)),
+            symbols,
+        ))
+        statements = list(executor.map(
+            lambda symbol: _warm("the income statement", symbol, lambda: get_income_statement(symbol, api_key, priority)),
+            symbols,
+        ))
+        histories = list(executor.map(
+            lambda symbol: _warm("the price history", symbol, lambda: _warm_price_store(symbol, api_key, priority)),
+            symbols,
+        ))
+    return {
+        "quotes": len(quotes),
+        "profiles": sum(profile is not None for profile in profiles),
+        "income_statements": sum(statement is not None for statement in statements),
+        "price_histories": sum(bool(history) for history in histories),
+    }
+
+
+def _warm(what: str, symbol: str, load: Callable[[], Any]) -> Any:
+    """
+    Run one load of the warm-up; a failure is logged and returns None so the other symbols still load.
+    """
+    try:
+        return load()
+    except Exception as e:
+        print("Error:", f"Could not load {what} of {symbol}: {e}")
+        return None
+
+
+def _warm_price_store(symbol: str, api_key: SecretStr, priority: int) -> bool:
+    """Bring the stored daily prices of a symbol up to date; return whether it has any."""
+    store = get_price_store()
+    try:
+        store.refresh(symbol, lambda start: fetch_price_bars(symbol, api_key, start, priority))
+    except (ValueError, requests.RequestException) as e:
+        print("Error:", f"Could not load the price history of {symbol}: {e}")
+    return store.last_date(symbol) is not None
+
+
+def warm_up(llm: Any = None, api_key: Optional[SecretStr] = None, symbols: Optional[list[str]] = None) -> dict[str, int]:
+    """
+    Open the connections, then warm the FMP cache with the watchlist when an FMP API key is given.
+    """
+    warm_up_connections(llm)
+    if api_key is None:
+        return {}
+    symbols = load_watchlist() if symbols is None else symbols
+    counts = warm_fmp_cache(symbols, api_key)
+    print("Warm-up loaded", counts)
+    return counts
+
+
+def start_warm_up(llm: Any = None, api_key: Optional[SecretStr] = None) -> Optional[threading.Thread]:
+    """
+    Run warm_up on a daemon thread, once per process.
+
+    Returns:
+        The warm-up thread, or None if a warm-up was already started
+    """
+    global _started
+    with _started_lock:
+        if _started:
+            return None
+        _started = True
+    thread = threading.Thread(target=warm_up, args=(llm, api_key), name="warm-up", daemon=True)
+    thread.start()
+    return thread
@@ -0,0 +1,74 @@
+"""
+Shared fixtures for the Financial Assistant tests.
+"""
+
+import os
+import tempfile
+import pytest
+
+# Keep the shared FMP cache in memory so tests never read or write the on-disk tier
+os.environ["FMP_CACHE_PATH"] = ""
+# Write conversation summaries inline, so tests can check them right after the node ran
+os.environ["SUMMARY_QUEUE_WORKERS"] = "0"
+# Keep cached LLM results in memory
+os.environ["LLM_CACHE_PATH"] = ""
+# Keep downloaded price bars out of the working tree
+os.environ["FMP_PRICE_STORE_PATH"] = tempfile.mkdtemp(prefix="fmp-prices-")
+# Serve only fresh entries so tests never start background refreshes
+os.environ["FMP_CACHE_STALE_WHILE_REVALIDATE"] = "0"
+
+from methods.circuit_breaker import get_fmp_circuit_breakers
+from methods.fmp_cache import get_fmp_cache
+from methods.llm_cache import get_llm_cache
+from methods.semantic_cache import get_semantic_cache
+from methods.summary_policy import get_summary_policy
+
+
+@pytest.fixture(autouse=True)
+def clear_fmp_cache():
+    """
+    Empties the process-wide FMP cache so tests never see each other's payloads.
+    """
+    get_fmp_cache().clear()
+    yield
+    get_fmp_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def close_circuit_breakers():
+    """
+    Closes the process-wide FMP circuit breakers so failures in one test never reject requests in another.
+    """
+    get_fmp_circuit_breakers().clear()
+    yield
+    get_fmp_circuit_breakers().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_llm_cache():
+    """
+    Empties the process-wide LLM result cache so a mocked answer in one test is never served in another.
+    """
+    get_llm_cache().clear()
+    yield
+    get_llm_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_semantic_cache():
+    """
+    Empties the process-wide semantic cache so chat answers from one test are never served in another.
+    """
+    get_semantic_cache().clear()
+    yield
+    get_semantic_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def clear_summary_policy():
+    """
+    Forgets the unsummarized turns so the conversation context of one test never reaches another.
+    """
+    get_summary_policy().clear()
+    yield
+    get_summary_policy().clear()
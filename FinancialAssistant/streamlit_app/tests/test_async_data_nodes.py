@@ -0,0 +1,111 @@
+"""
+Unit tests for the async FMP client and the async financial data nodes.
+"""
+
+import asyncio
+import httpx
+import pytest
+from pydantic import SecretStr
+from methods.fmp_client import AsyncFMPClient
+from graph.nodes.financial_data_nodes import (
+    aget_stock_price_node, aget_income_statement_node, aget_company_financials_node
+)
+from consts.consts import KEY_STOCK_PRICE, KEY_INCOME_STATEMENT, KEY_COMPANY_FINANCIALS
+
+QUOTE = {
+    "symbol": "AAPL", "price": 222.5, "volume": 35396922, "priceAvg50": 223.07,
+    "priceAvg200": 195.38, "eps": 6.57, "pe": 33.87,
+    "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+}
+INCOME_STATEMENT = {
+    "date": "2023-09-30", "revenue": 383285000000, "grossProfit": 169148000000,
+    "netIncome": 96995000000, "ebitda": 125820000000, "eps": 6.16, "epsdiluted": 6.13,
+}
+PROFILE = {
+    "symbol": "AAPL", "companyName": "Apple Inc.", "mktCap": 3382912250000,
+    "industry": "Consumer Electronics", "sector": "Technology",
+    "website": "https://www.apple.com", "beta": 1.24, "price": 222.5,
+}
+
+
+@pytest.fixture
+def test_config():
+    """
+    Creates a test config with an FMP API key.
+    """
+    return {"configurable": {"fmp_api_key": SecretStr("test_key")}}
+
+
+def make_client(handler) -> AsyncFMPClient:
+    """
+    Creates an async client whose requests are answered by the given handler.
+    """
+    client = AsyncFMPClient(base_url="https://fmp.test/api/v3", retry_backoff=0)
+    client.client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def test_async_get_json_retries_server_errors():
+    """
+    Test that 5xx responses are retried before the payload is returned.
+    """
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request)
+        if len(calls) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json=[QUOTE])
+
+    client = make_client(handler)
+    data = asyncio.run(client.get_json("quote-order/AAPL", SecretStr("test_key")))
+
+    assert data == [QUOTE]
+    assert len(calls) == 2
+    assert calls[-1].url.params["apikey"] == "test_key"
+
+
+def test_async_get_json_wraps_invalid_json():
+    """
+    Test that a non-JSON body is reported as an httpx error.
+    """
+    client = make_client(lambda request: httpx.Response(200, text="<html>"))
+
+    with pytest.raises(httpx.HTTPError):
+        asyncio.run(client.get_json("profile/AAPL", SecretStr("test_key")))
+
+
+def test_async_report_nodes_overlap(mocker, test_config):
+    """
+    Test that the three async data nodes run concurrently on one event loop.
+    """
+    payloads = {"quote-order": [QUOTE], "income-statement": [INCOME_STATEMENT], "profile": [PROFILE]}
+    in_flight = []
+    peak = []
+
+    async def get_json(path, api_key, params=None, priority=None, fields=None):
+        in_flight.append(path)
+        peak.append(len(in_flight))
+        await asyncio.sleep(0.01)
+        in_flight.remove(path)
+        return payloads[path.split("/")[0]]
+
+    client = mocker.Mock()
+    client.get_json = get_json
+    for module in ("classes.stock_price", "classes.income_statement", "classes.company_financials"):
+        mocker.patch(f"{module}.get_async_fmp_client", return_value=client)
+
+    async def fan_out():
+        state = {"symbol": "AAPL"}
+        return await asyncio.gather(
+            aget_stock_price_node(state, test_config),
+            aget_income_statement_node(state, test_config),
+            aget_company_financials_node(state, test_config),
+        )
+
+    stock_price, income_statement, company_financials = asyncio.run(fan_out())
+
+    assert max(peak) == 3
+    assert "222.50" in stock_price[KEY_STOCK_PRICE]
+    assert "2023-09-30" in income_statement[KEY_INCOME_STATEMENT]
+    assert "Apple Inc." in company_financials[KEY_COMPANY_FINANCIALS]
@@ -0,0 +1,216 @@
+"""
+Unit tests for the per-endpoint circuit breakers and hedged FMP requests.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+import requests
+from pydantic import SecretStr
+from methods.circuit_breaker import (
+    CircuitBreaker, CircuitBreakers, CircuitOpenError, STATE_CLOSED, STATE_HALF_OPEN, STATE_OPEN,
+    get_fmp_circuit_breakers
+)
+from methods.fmp_client import FMPClient
+from methods.hedging import LatencyTracker, ahedged_call, hedged_call
+from methods.rate_limiter import effective_priority, priority_floor
+from classes.stock_price import get_stock_price
+from graph.nodes.financial_data_nodes import get_stock_price_node
+from consts.consts import FMP_ENDPOINT_QUOTE, KEY_STOCK_PRICE, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+
+class FakeClock:
+    """
+    Manually advanced clock so tests never sleep.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a clock starting at zero.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def breaker(clock):
+    """
+    Creates a breaker that opens at a 50% failure rate over at least four calls.
+    """
+    return CircuitBreaker(failure_rate=0.5, min_calls=4, window=10, open_seconds=30, clock=clock)
+
+
+def test_breaker_opens_on_failure_rate(breaker):
+    """
+    Test that the circuit stays closed until enough calls have failed.
+    """
+    breaker.record_success()
+    breaker.record_failure()
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+    assert breaker.allow() is False
+    assert breaker.retry_in() == 30
+
+
+def test_breaker_forgets_old_outcomes(breaker, clock):
+    """
+    Test that failures outside the window do not count.
+    """
+    breaker.record_failure()
+    breaker.record_failure()
+    clock.now = 11
+    breaker.record_success()
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == STATE_CLOSED
+
+
+def test_half_open_probe_closes_or_reopens(breaker, clock):
+    """
+    Test that only one probe is allowed after the cool-down and that its outcome decides the state.
+    """
+    for _ in range(4):
+        breaker.record_failure()
+    clock.now = 30
+    assert breaker.allow() is True
+    assert breaker.state == STATE_HALF_OPEN
+    assert breaker.allow() is False
+    breaker.record_failure()
+    assert breaker.state == STATE_OPEN
+
+    clock.now = 60
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == STATE_CLOSED
+    assert breaker.allow() is True
+
+
+def test_registry_keeps_one_breaker_per_endpoint():
+    """
+    Test that each endpoint gets its own breaker.
+    """
+    breakers = CircuitBreakers()
+    assert breakers.get("quote-order") is breakers.get("quote-order")
+    assert breakers.get("quote-order") is not breakers.get("profile")
+
+
+def test_client_fails_fast_while_open(mocker):
+    """
+    Test that 5xx answers open the endpoint's circuit and later calls are not sent.
+    """
+    breakers = CircuitBreakers(lambda: CircuitBreaker(min_calls=2, open_seconds=30))
+    client = FMPClient(base_url="https://fmp.test/api/v3", breakers=breakers)
+    get = mocker.patch.object(client.session, "get", return_value=mocker.Mock(status_code=503, content=b"[]"))
+
+    client.get_json("quote-order/AAPL", SecretStr("test_key"))
+    client.get_json("quote-order/MSFT", SecretStr("test_key"))
+    with pytest.raises(CircuitOpenError) as error:
+        client.get_json("quote-order/NVDA", SecretStr("test_key"))
+
+    assert isinstance(error.value, requests.RequestException)
+    assert get.call_count == 2
+    assert breakers.get("profile").allow() is True
+
+
+def test_node_reports_degraded_service(mocker):
+    """
+    Test that the node explains the outage instead of returning nothing when the circuit is open.
+    """
+    client = mocker.Mock()
+    client.get_json.side_effect = CircuitOpenError(FMP_ENDPOINT_QUOTE, 12.5)
+    mocker.patch("classes.stock_price.get_fmp_client", return_value=client)
+    breaker = get_fmp_circuit_breakers().get(FMP_ENDPOINT_QUOTE)
+    for _ in range(breaker.min_calls):
+        breaker.record_failure()
+    config = {"configurable": {"fmp_api_key": SecretStr("test_key")}}
+
+    result = get_stock_price_node({"symbol": "AAPL"}, config)[KEY_STOCK_PRICE]
+
+    assert get_stock_price("AAPL", SecretStr("test_key")) is None
+    assert "not responding" in result
+
+
+def test_latency_tracker_needs_samples():
+    """
+    Test that no hedging delay is returned until enough latencies were recorded.
+    """
+    tracker = LatencyTracker(percentile=90, min_samples=10, min_delay=0.01)
+    for i in range(9):
+        tracker.record(i / 100)
+    assert tracker.delay() is None
+    tracker.record(0.09)
+    assert tracker.delay() == pytest.approx(0.081)
+
+
+def test_hedged_call_returns_first_result():
+    """
+    Test that a slow call is hedged and the faster duplicate wins.
+    """
+    calls = []
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            calls.append(None)
+            slow = len(calls) == 1
+        time.sleep(0.5 if slow else 0.01)
+        return "slow" if slow else "fast"
+
+    with ThreadPoolExecutor(2) as executor:
+        assert hedged_call(call, 0.05, executor) == ("fast", True)
+        assert hedged_call(lambda: "quick", 0.05, executor) == ("quick", False)
+    assert hedged_call(lambda: "unhedged", None, None) == ("unhedged", False)
+
+
+def test_hedged_call_keeps_the_priority_floor():
+    """
+    Test that both the primary and the hedged attempt run at the caller's priority floor.
+    """
+    seen = []
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            seen.append(effective_priority(PRIORITY_INTERACTIVE))
+            slow = len(seen) == 1
+        time.sleep(0.3 if slow else 0.01)
+        return "done"
+
+    with ThreadPoolExecutor(2) as executor, priority_floor(PRIORITY_BACKGROUND):
+        assert hedged_call(call, 0.05, executor) == ("done", True)
+    assert seen == [PRIORITY_BACKGROUND, PRIORITY_BACKGROUND]
+
+
+def test_ahedged_call_cancels_the_slower_request():
+    """
+    Test that the async hedge wins and the original request is cancelled.
+    """
+    started = []
+    cancelled = []
+
+    async def call():
+        started.append(None)
+        try:
+            await asyncio.sleep(0.5 if len(started) == 1 else 0.01)
+        except asyncio.CancelledError:
+            cancelled.append(None)
+            raise
+        return len(started)
+
+    async def run():
+        result = await ahedged_call(call, 0.05)
+        await asyncio.sleep(0)
+        return result
+
+    assert asyncio.run(run()) == (2, True)
+    assert len(cancelled) == 1
@@ -0,0 +1,95 @@
+"""
+Unit tests for the rule-based fast path ahead of the LLM router.
+"""
+
+import pytest
+from chains.route_chain import RouterResult
+from graph.nodes.router_node import create_get_route_node
+from methods.fast_router import FastRouter
+from methods.memory_manager import MemoryManager
+
+
+@pytest.mark.parametrize("request_text, route", [
+    ("AAPL stock price", "stock_price"),
+    ("Show me the latest price for Microsoft.", "stock_price"),
+    ("What is $PLTR trading at?", "stock_price"),
+    ("How has Apple performed over the last 6 months?", "price_history"),
+    ("What was Tesla's return over the past two years?", "price_history"),
+    ("income statement of Tesla", "income_statement"),
+    ("Give me the gross profit of Tesla for last year.", "income_statement"),
+    ("What are the financials for Google?", "company_financials"),
+    ("Show me Apple's financial position.", "company_financials"),
+    ("Can you provide an overview of Amazon?", "report"),
+    ("Generate a report for MSFT", "report"),
+    ("What do you think of Apple?", "chat"),
+    ("hello", "chat"),
+])
+def test_unmistakable_requests_are_routed_locally(request_text, route):
+    """
+    Test that requests naming what they want are routed without the LLM.
+    """
+    assert FastRouter().classify(request_text) == route
+
+
+@pytest.mark.parametrize("request_text", [
+    "What about them?",
+    "What about their stock price?",
+    "Is Apple's revenue growth a good sign for its stock price?",
+    "",
+    None,
+])
+def test_ambiguous_requests_go_to_the_llm(request_text):
+    """
+    Test that requests without a clear winner are left to the LLM.
+    """
+    assert FastRouter().classify(request_text) is None
+
+
+@pytest.mark.parametrize("request_text", [
+    "What is EBITDA?",
+    "What is a market cap?",
+    "how is the stock market performing over the last year?",
+    "Write me a report on the tech sector",
+    "What is the price of gold?",
+])
+def test_data_keywords_without_a_company_go_to_the_llm(request_text):
+    """
+    Test that finance questions naming no company are not sent down a data route locally.
+    """
+    assert FastRouter().classify(request_text) is None
+
+
+def test_stats_report_local_fraction():
+    """
+    Test that the decisions on both paths are counted.
+    """
+    router = FastRouter()
+    router.classify("AAPL stock price")
+    router.classify("income statement of Tesla")
+    router.classify("What about them?")
+    router.record_llm_route("chat")
+
+    stats = router.stats()
+    assert stats["local"] == 2
+    assert stats["llm"] == 1
+    assert stats["local_fraction"] == pytest.approx(2 / 3)
+    assert stats["route:stock_price"] == 1
+    assert stats["route:llm:chat"] == 1
+    assert FastRouter(enabled=False).classify("AAPL stock price") is None
+
+
+def test_router_node_skips_llm_on_fast_path(mocker):
+    """
+    Test that the router node answers unmistakable requests without invoking the route chain.
+    """
+    chain = mocker.Mock()
+    chain.invoke.return_value = RouterResult(route="chat")
+    mocker.patch("graph.nodes.router_node.create_route_chain", return_value=chain)
+    mocker.patch("graph.nodes.router_node.get_fast_router", return_value=FastRouter())
+    node = create_get_route_node(mocker.Mock())
+    config = {"configurable": {"user_id": "test_user"}}
+
+    assert node({"request": "AAPL stock price"}, config, MemoryManager()) == {"request_category": "stock_price"}
+    chain.invoke.assert_not_called()
+    assert node({"request": "What about them?"}, config, MemoryManager()) == {"request_category": "chat"}
+    chain.invoke.assert_called_once()
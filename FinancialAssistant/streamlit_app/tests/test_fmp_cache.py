@@ -0,0 +1,305 @@
+"""
+Unit tests for the FMP response cache.
+"""
+
+import asyncio
+import sqlite3
+import threading
+import pytest
+from pydantic import SecretStr
+from consts.consts import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+from methods.cache_refresher import CacheRefresher
+from methods.fmp_cache import FMPCache
+from methods.rate_limiter import effective_priority
+from methods.fmp_disk_cache import FMPDiskCache
+from classes.stock_price import get_stock_price
+
+QUOTE = {
+    "symbol": "AAPL", "price": 222.5, "volume": 35396922, "priceAvg50": 223.07,
+    "priceAvg200": 195.38, "eps": 6.57, "pe": 33.87,
+    "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+}
+PROFILE = {"symbol": "AAPL", "companyName": "Apple Inc."}
+
+
+class FakeClock:
+    """
+    Manually advanced clock for expiry tests.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a fake clock starting at zero.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    """
+    Creates a small cache with short per-endpoint TTLs.
+    """
+    return FMPCache(ttls={"quote-order": 10, "profile": 100}, max_size=2, clock=clock)
+
+
+def test_entries_expire_per_endpoint(cache, clock):
+    """
+    Test that each endpoint uses its own time to live.
+    """
+    cache.set("quote-order", "AAPL", [QUOTE])
+    cache.set("profile", "AAPL", [{"symbol": "AAPL"}])
+
+    clock.now = 50
+    assert cache.get("quote-order", "AAPL") is None
+    assert cache.get("profile", "aapl") == [{"symbol": "AAPL"}]
+
+
+def test_least_recently_used_entry_is_evicted(cache):
+    """
+    Test that the cache is bounded and evicts the least recently used entry.
+    """
+    cache.set("profile", "AAPL", [1])
+    cache.set("profile", "MSFT", [2])
+    cache.get("profile", "AAPL")
+    cache.set("profile", "TSLA", [3])
+
+    assert cache.get("profile", "MSFT") is None
+    assert cache.get("profile", "AAPL") == [1]
+    assert cache.get("profile", "TSLA") == [3]
+
+
+def test_period_is_part_of_the_key(cache):
+    """
+    Test that different periods for the same symbol are cached separately.
+    """
+    cache.set("profile", "AAPL", [1], period="annual")
+
+    assert cache.get("profile", "AAPL") is None
+    assert cache.get("profile", "AAPL", period="annual") == [1]
+
+
+def test_error_payloads_are_not_cached(cache):
+    """
+    Test that FMP error objects and empty results are never cached.
+    """
+    cache.set("profile", "AAPL", {"Error Message": "Limit Reach"})
+    cache.set("profile", "MSFT", [])
+
+    assert cache.stats()["size"] == 0
+
+
+def test_get_or_fetch_counts_hits_and_misses(mocker, cache):
+    """
+    Test that get_or_fetch only calls the fetcher on a miss and tracks counters.
+    """
+    fetch = mocker.Mock(return_value=[QUOTE])
+
+    cache.get_or_fetch("quote-order", "AAPL", fetch)
+    cache.get_or_fetch("quote-order", "AAPL", fetch)
+
+    fetch.assert_called_once()
+    assert cache.stats() == {
+        "hits": 1, "disk_hits": 0, "stale_hits": 0, "misses": 1, "size": 1, "hit_rate": 0.5
+    }
+
+
+def test_fetcher_is_served_from_shared_cache(mocker):
+    """
+    Test that repeated fetcher calls for a symbol only reach FMP once.
+    """
+    client = mocker.Mock()
+    client.get_json.return_value = [QUOTE]
+    mocker.patch("classes.stock_price.get_fmp_client", return_value=client)
+
+    first = get_stock_price("AAPL", SecretStr("test_key"))
+    second = get_stock_price("AAPL", SecretStr("test_key"))
+
+    assert first == second
+    client.get_json.assert_called_once()
+
+
+def test_disk_tier_survives_restart(tmp_path, clock):
+    """
+    Test that a new cache instance serves payloads persisted by a previous one.
+    """
+    path = str(tmp_path / "fmp_cache.sqlite3")
+    wall_clock = FakeClock()
+    ttls = {"profile": 100}
+    FMPCache(ttls=ttls, clock=clock, disk=FMPDiskCache(path, clock=wall_clock)).set("profile", "AAPL", [PROFILE])
+
+    restarted = FMPCache(ttls=ttls, clock=clock, disk=FMPDiskCache(path, clock=wall_clock))
+    fetch = lambda: pytest.fail("a fresh disk entry must not hit the network")
+
+    assert restarted.get_or_fetch("profile", "AAPL", fetch) == [PROFILE]
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_disk_tier_honours_endpoint_freshness(tmp_path, clock):
+    """
+    Test that disk entries older than the endpoint TTL are ignored.
+    """
+    path = str(tmp_path / "fmp_cache.sqlite3")
+    wall_clock = FakeClock()
+    disk = FMPDiskCache(path, clock=wall_clock)
+    FMPCache(ttls={"profile": 100}, clock=clock, disk=disk).set("profile", "AAPL", [PROFILE])
+
+    wall_clock.now = 150
+    restarted = FMPCache(ttls={"profile": 100}, clock=clock, disk=FMPDiskCache(path, clock=wall_clock))
+
+    assert restarted.get("profile", "AAPL") is None
+
+
+def test_disk_tier_uses_wal_mode(tmp_path):
+    """
+    Test that the database is opened in WAL mode so processes can share it.
+    """
+    disk = FMPDiskCache(str(tmp_path / "fmp_cache.sqlite3"))
+
+    mode = disk._connection().execute("PRAGMA journal_mode").fetchone()[0]
+
+    assert mode == "wal"
+
+
+def test_unwritable_disk_path_falls_back_to_memory(monkeypatch):
+    """
+    Test that a disk tier that cannot be created leaves a working memory-only cache.
+    """
+    monkeypatch.setenv("FMP_CACHE_PATH", "/proc/nope/fmp_cache.sqlite3")
+
+    cache = FMPCache.from_env()
+    cache.set("profile", "AAPL", [PROFILE])
+
+    assert cache.disk is None
+    assert cache.get("profile", "AAPL") == [PROFILE]
+
+
+def test_disk_errors_count_as_misses(mocker, tmp_path, clock):
+    """
+    Test that a locked database is a miss on read and skipped on write instead of failing the request.
+    """
+    disk = FMPDiskCache(str(tmp_path / "fmp_cache.sqlite3"))
+    mocker.patch.object(disk, "_connection", side_effect=sqlite3.OperationalError("database is locked"))
+    cache = FMPCache(ttls={"profile": 100}, clock=clock, disk=disk)
+
+    assert cache.get_or_fetch("profile", "AAPL", lambda: [PROFILE]) == [PROFILE]
+    assert cache.get("profile", "AAPL") == [PROFILE]
+    assert disk.prune(100) == 0
+
+
+@pytest.fixture
+def swr_cache(clock):
+    """
+    Creates a stale-while-revalidate cache whose refreshes run inline.
+    """
+    return FMPCache(
+        ttls={"quote-order": 10}, clock=clock, max_staleness={"quote-order": 20},
+        refresher=CacheRefresher(workers=0, interval=0), hot_min_hits=3,
+    )
+
+
+def test_stale_entry_is_served_and_refreshed(mocker, swr_cache, clock):
+    """
+    Test that an expired entry within the max staleness is returned at once and refreshed.
+    """
+    swr_cache.set("quote-order", "AAPL", [{"price": 1}])
+    fetch = mocker.Mock(return_value=[{"price": 2}])
+
+    clock.now = 15
+    assert swr_cache.get("quote-order", "AAPL") is None
+    assert swr_cache.get_or_fetch("quote-order", "AAPL", fetch) == [{"price": 1}]
+
+    fetch.assert_called_once()
+    assert swr_cache.get("quote-order", "AAPL") == [{"price": 2}]
+    assert swr_cache.stats()["stale_hits"] == 1
+
+
+def test_entry_past_max_staleness_is_fetched(mocker, swr_cache, clock):
+    """
+    Test that entries older than the max staleness are not served.
+    """
+    swr_cache.set("quote-order", "AAPL", [{"price": 1}])
+    fetch = mocker.Mock(return_value=[{"price": 2}])
+
+    clock.now = 31
+    assert swr_cache.get_or_fetch("quote-order", "AAPL", fetch) == [{"price": 2}]
+
+
+def test_hot_entries_are_refreshed_before_expiry(mocker, swr_cache, clock):
+    """
+    Test that only keys read often are refreshed ahead of expiry, at background priority.
+    """
+    priorities = []
+
+    def fetch():
+        priorities.append(effective_priority(PRIORITY_INTERACTIVE))
+        return [{"price": 2}]
+
+    for _ in range(3):
+        swr_cache.get_or_fetch("quote-order", "AAPL", fetch)
+    swr_cache.get_or_fetch("quote-order", "MSFT", fetch)
+    priorities.clear()
+
+    clock.now = 5
+    assert swr_cache.refresh_hot() == 0
+    clock.now = 9
+    assert swr_cache.refresh_hot() == 1
+    assert priorities == [PRIORITY_BACKGROUND]
+    clock.now = 12
+    assert swr_cache.get("quote-order", "AAPL") == [{"price": 2}]
+    assert swr_cache.get("quote-order", "MSFT") is None
+
+
+def test_miss_does_not_wait_behind_a_background_refresh(clock):
+    """
+    Test that a miss during a background refresh of the same key fetches at its own priority.
+    """
+    cache = FMPCache(
+        ttls={"quote-order": 10}, clock=clock, max_staleness={"quote-order": 20},
+        refresher=CacheRefresher(workers=1, interval=0),
+    )
+    cache.set("quote-order", "AAPL", [{"price": 1}])
+    started, release = threading.Event(), threading.Event()
+
+    def refresh():
+        started.set()
+        release.wait(5)
+        return [{"price": 2}]
+
+    def fetch():
+        return [{"price": effective_priority(PRIORITY_INTERACTIVE)}]
+
+    clock.now = 15
+    assert cache.get_or_fetch("quote-order", "AAPL", refresh) == [{"price": 1}]
+    assert started.wait(5)
+    clock.now = 31
+    try:
+        assert cache.get_or_fetch("quote-order", "AAPL", fetch) == [{"price": PRIORITY_INTERACTIVE}]
+        assert not release.is_set()
+    finally:
+        release.set()
+        cache.refresher.stop()
+
+
+def test_async_stale_entry_is_refreshed_in_background(swr_cache, clock):
+    """
+    Test that aget_or_fetch serves a stale entry and refreshes it on the event loop.
+    """
+    swr_cache.set("quote-order", "AAPL", [{"price": 1}])
+    clock.now = 15
+
+    async def fetch():
+        return [{"price": 2}]
+
+    async def read_twice():
+        first = await swr_cache.aget_or_fetch("quote-order", "AAPL", fetch)
+        await asyncio.sleep(0.01)
+        return first, swr_cache.get("quote-order", "AAPL")
+
+    assert asyncio.run(read_twice()) == ([{"price": 1}], [{"price": 2}])
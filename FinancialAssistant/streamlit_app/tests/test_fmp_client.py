@@ -0,0 +1,130 @@
+"""
+Unit tests for the pooled FMP client and the fetchers that use it.
+"""
+
+import pytest
+import requests
+from pydantic import SecretStr
+from methods.fmp_client import FMPClient
+from classes.stock_price import get_stock_price, QUOTE_FIELDS
+from classes.income_statement import get_income_statement, INCOME_STATEMENT_FIELDS
+from classes.company_financials import get_company_financials
+
+
+@pytest.fixture
+def api_key():
+    """
+    Returns a test FMP API key.
+    """
+    return SecretStr("test_key")
+
+
+@pytest.fixture
+def client():
+    """
+    Creates a client with short timeouts for testing.
+    """
+    return FMPClient(base_url="https://fmp.test/api/v3/", connect_timeout=1, read_timeout=2, pool_maxsize=4)
+
+
+@pytest.fixture
+def mock_client(mocker):
+    """
+    Replaces the shared FMP client used by the fetchers.
+    """
+    client = mocker.Mock(spec=FMPClient)
+    for module in ("classes.stock_price", "classes.income_statement", "classes.company_financials"):
+        mocker.patch(f"{module}.get_fmp_client", return_value=client)
+    return client
+
+
+def test_client_pool_configuration(client):
+    """
+    Test that the session mounts a blocking pooled adapter with retries.
+    """
+    adapter = client.session.get_adapter("https://fmp.test/api/v3/profile/AAPL")
+    assert adapter._pool_maxsize == 4
+    assert adapter._pool_block is True
+    assert adapter.max_retries.total == 2
+
+
+def test_get_json_uses_timeout_and_api_key(mocker, client, api_key):
+    """
+    Test that get_json builds the URL, adds the API key and passes the timeouts.
+    """
+    response = mocker.Mock(status_code=200, content=b'[{"symbol": "AAPL"}]')
+    get = mocker.patch.object(client.session, "get", return_value=response)
+
+    data = client.get_json("profile/AAPL", api_key, params={"period": "annual"})
+
+    assert data == [{"symbol": "AAPL"}]
+    get.assert_called_once_with(
+        "https://fmp.test/api/v3/profile/AAPL",
+        params={"period": "annual", "apikey": "test_key"},
+        timeout=(1, 2),
+    )
+
+
+def test_get_stock_price_uses_shared_client(mock_client, api_key):
+    """
+    Test that the stock price fetcher routes through the shared client.
+    """
+    mock_client.get_json.return_value = [{
+        "symbol": "AAPL", "price": 222.5, "volume": 35396922, "priceAvg50": 223.07,
+        "priceAvg200": 195.38, "eps": 6.57, "pe": 33.87,
+        "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+    }]
+
+    stock_price = get_stock_price("AAPL", api_key)
+
+    assert stock_price.price == 222.5
+    mock_client.get_json.assert_called_once_with("quote-order/AAPL", api_key, priority=0, fields=QUOTE_FIELDS)
+
+
+def test_get_income_statement_requests_annual_period(mock_client, api_key):
+    """
+    Test that the income statement fetcher asks for the annual period.
+    """
+    mock_client.get_json.return_value = [{
+        "date": "2023-09-30", "revenue": 383285000000, "grossProfit": 169148000000,
+        "netIncome": 96995000000, "ebitda": 125820000000, "eps": 6.16, "epsdiluted": 6.13,
+    }]
+
+    income_statement = get_income_statement("AAPL", api_key)
+
+    assert income_statement.net_income == 96995000000
+    mock_client.get_json.assert_called_once_with(
+        "income-statement/AAPL", api_key, params={"period": "annual"}, priority=0,
+        fields=INCOME_STATEMENT_FIELDS,
+    )
+
+
+def test_get_json_projects_fields(mocker, client, api_key):
+    """
+    Test that only the requested fields of each payload row are kept.
+    """
+    response = mocker.Mock(status_code=200, content=b'[{"symbol": "AAPL", "description": "long text", "price": 1.5}]')
+    mocker.patch.object(client.session, "get", return_value=response)
+
+    data = client.get_json("profile/AAPL", api_key, fields=("symbol", "price", "beta"))
+
+    assert data == [{"symbol": "AAPL", "price": 1.5}]
+
+
+def test_get_json_reports_invalid_json_as_request_error(mocker, client, api_key):
+    """
+    Test that a non-JSON body surfaces as a requests exception the fetchers already handle.
+    """
+    mocker.patch.object(client.session, "get", return_value=mocker.Mock(status_code=200, content=b"<html>"))
+
+    with pytest.raises(requests.RequestException):
+        client.get_json("profile/AAPL", api_key)
+
+
+def test_fetcher_returns_none_on_timeout(mock_client, api_key):
+    """
+    Test that network errors are reported as a missing result instead of raising.
+    """
+    mock_client.get_json.side_effect = requests.Timeout()
+
+    assert get_company_financials("AAPL", api_key) is None
@@ -0,0 +1,80 @@
+"""
+Unit tests for the local FMP emulator, exercised through the real fetchers.
+"""
+
+import pytest
+from pydantic import SecretStr
+from fmp_emulator import FixtureStore, FMPEmulator, FaultConfig
+from methods.fmp_client import FMPClient
+from classes.company_financials import get_company_financials
+from classes.income_statement_history import get_income_statement_history
+from classes.stock_price import get_stock_prices
+
+
+@pytest.fixture
+def emulator():
+    """
+    Starts an emulator on a free port.
+    """
+    with FMPEmulator() as emulator:
+        yield emulator
+
+
+@pytest.fixture
+def fetchers(mocker, emulator):
+    """
+    Points the fetchers at the emulator.
+    """
+    client = FMPClient(base_url=emulator.base_url, retry_backoff=0)
+    for module in ("classes.stock_price", "classes.income_statement", "classes.company_financials"):
+        mocker.patch(f"{module}.get_fmp_client", return_value=client)
+    yield client
+    client.close()
+
+
+def test_recorded_fixture_is_served(fetchers):
+    """
+    Test that the recorded AAPL profile is served through the profile fetcher.
+    """
+    financials = get_company_financials("AAPL", SecretStr("test_key"))
+
+    assert financials.companyName == "Apple Inc."
+    assert financials.marketCap == 3382912250000
+
+
+def test_missing_symbols_are_synthesized(fetchers):
+    """
+    Test that unrecorded symbols get stable payloads, with a multi-year income statement.
+    """
+    prices = get_stock_prices(["MSFT", "NVDA", "AAPL"], SecretStr("test_key"))
+    history = get_income_statement_history("MSFT", SecretStr("test_key"))
+
+    assert sorted(prices) == ["AAPL", "MSFT", "NVDA"]
+    assert prices["MSFT"].price != prices["NVDA"].price
+    assert FixtureStore().get("quote-order", "MSFT")[0]["price"] == prices["MSFT"].price
+    assert len(history) == 10
+
+
+def test_recorded_only_store_returns_empty_list(emulator):
+    """
+    Test that unknown symbols answer an empty list like FMP does.
+    """
+    emulator.store = FixtureStore(synthesize=False)
+
+    assert emulator.respond("/api/v3/profile/NOPE", {"apikey": ["k"]}) == (200, {}, [])
+    assert emulator.respond("/api/v3/profile/AAPL", {})[0] == 401
+
+
+def test_faults_are_injected():
+    """
+    Test that throttling and errors are injected at the configured rates.
+    """
+    emulator = FMPEmulator(faults=FaultConfig(throttle_rate=0.3, error_rate=0.2, retry_after=2, seed=7))
+    try:
+        statuses = [emulator.respond("/api/v3/quote-order/AAPL", {"apikey": ["k"]})[0] for _ in range(1000)]
+    finally:
+        emulator.stop()
+
+    assert 250 < statuses.count(429) < 350
+    assert 150 < statuses.count(500) < 250
+    assert emulator.requests["429"] == statuses.count(429)
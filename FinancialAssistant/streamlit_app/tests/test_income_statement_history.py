@@ -0,0 +1,98 @@
+"""
+Unit tests for the columnar income statement history and its analytics.
+"""
+
+import math
+import numpy as np
+import pytest
+from pydantic import SecretStr
+from classes.income_statement_history import (
+    IncomeStatementHistory, describe_trend, get_income_statement_history
+)
+from graph.nodes.financial_data_nodes import get_income_statement_node
+from consts.consts import KEY_INCOME_STATEMENT
+
+# FMP returns the most recent period first
+ROWS = [
+    {"date": "2023-09-30", "revenue": 121.0, "grossProfit": 60.5, "netIncome": 24.2,
+     "ebitda": 36.3, "eps": 2.42, "epsdiluted": 2.40},
+    {"date": "2022-09-30", "revenue": 110.0, "grossProfit": 50.0, "netIncome": 22.0,
+     "ebitda": 33.0, "eps": 2.20, "epsdiluted": 2.00},
+    {"date": "2021-09-30", "revenue": 100.0, "grossProfit": 40.0, "netIncome": -5.0,
+     "ebitda": 30.0, "eps": -0.50, "epsdiluted": None},
+]
+
+
+@pytest.fixture
+def history():
+    """
+    Creates a three year history from an FMP payload.
+    """
+    return IncomeStatementHistory.from_payload("AAPL", ROWS)
+
+
+def test_history_is_sorted_ascending(history):
+    """
+    Test that periods are stored oldest first and missing values become NaN.
+    """
+    assert len(history) == 3
+    assert str(history.dates[0]) == "2021-09-30"
+    np.testing.assert_array_equal(history["revenue"], [100.0, 110.0, 121.0])
+    assert math.isnan(history["eps_diluted"][0])
+
+
+def test_latest_returns_most_recent_income_statement(history):
+    """
+    Test that the latest period is exposed as an IncomeStatement.
+    """
+    latest = history.latest()
+    assert str(latest.date_field) == "2023-09-30"
+    assert latest.net_income == 24.2
+
+
+def test_yoy_growth_and_margins(history):
+    """
+    Test period-over-period growth, including the undefined growth from a negative base.
+    """
+    growth = history.yoy_growth("revenue")
+    assert math.isnan(growth[0])
+    np.testing.assert_allclose(growth[1:], [0.1, 0.1])
+    assert math.isnan(history.yoy_growth("net_income")[1])
+    np.testing.assert_allclose(history.margin("gross_profit"), [0.4, 50 / 110, 0.5])
+
+
+def test_cagr_and_trend(history):
+    """
+    Test that steady 10% growth is reported by both the CAGR and the log-linear trend.
+    """
+    assert history.cagr("revenue") == pytest.approx(0.1, abs=1e-3)
+    assert history.trend("revenue") == pytest.approx(0.1, abs=1e-3)
+    assert math.isnan(history.cagr("net_income"))
+    assert describe_trend(history.trend("revenue")) == "rising (10.0% per year)"
+    assert describe_trend(0.001) == "flat"
+    assert describe_trend(float("nan")) == "n/a"
+
+
+def test_summary_needs_two_periods():
+    """
+    Test that a single period has no summary.
+    """
+    assert IncomeStatementHistory.from_payload("AAPL", ROWS[:1]).summary() is None
+
+
+def test_history_shares_cached_payload(mocker):
+    """
+    Test that the latest statement and the history are served by one FMP call.
+    """
+    client = mocker.Mock()
+    client.get_json.return_value = ROWS
+    mocker.patch("classes.income_statement.get_fmp_client", return_value=client)
+    config = {"configurable": {"fmp_api_key": SecretStr("test_key")}}
+
+    result = get_income_statement_node({"symbol": "AAPL"}, config)[KEY_INCOME_STATEMENT]
+    history = get_income_statement_history("AAPL", SecretStr("test_key"))
+
+    assert "2023-09-30" in result
+    assert "Revenue CAGR**: 10.0%" in result
+    assert len(history) == 3
+    client.get_json.assert_called_once()
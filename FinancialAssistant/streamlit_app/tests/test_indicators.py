@@ -0,0 +1,125 @@
+"""
+Unit tests for the vectorized technical indicators and their incremental engine.
+"""
+
+import math
+import numpy as np
+import pytest
+from pydantic import SecretStr
+from methods.indicators import IndicatorEngine, drawdown, ema, macd, rsi, sma, volatility
+from methods.price_store import PriceStore
+from graph.nodes.financial_data_nodes import get_stock_price_node
+from consts.consts import KEY_STOCK_PRICE
+
+
+@pytest.fixture
+def close():
+    """
+    Creates a reproducible random walk of daily closes.
+    """
+    rng = np.random.default_rng(7)
+    return 100.0 * np.exp(np.cumsum(rng.normal(0.0, 0.02, 1200)))
+
+
+def reference_ema(values, alpha, initial):
+    """
+    Computes an EMA with the plain recursion.
+    """
+    result, previous = [], initial
+    for value in values:
+        previous = alpha * value + (1 - alpha) * previous
+        result.append(previous)
+    return np.array(result)
+
+
+def test_sma_matches_rolling_mean(close):
+    """
+    Test the moving average against a direct mean of every window.
+    """
+    result = sma(close, 20)
+    assert np.isnan(result[:19]).all()
+    np.testing.assert_allclose(result[19:], [close[i - 19:i + 1].mean() for i in range(19, len(close))])
+
+
+@pytest.mark.parametrize("span", [1, 2, 12, 200])
+def test_blocked_ema_matches_recursion(close, span):
+    """
+    Test that the blocked EMA equals the recursion, including spans short enough to need many blocks.
+    """
+    alpha = 2 / (span + 1)
+    expected = np.concatenate([close[:1], reference_ema(close[1:], alpha, close[0])])
+    np.testing.assert_allclose(ema(close, span), expected, rtol=1e-12)
+    np.testing.assert_allclose(ema(close, span, initial=50.0), reference_ema(close, alpha, 50.0), rtol=1e-12)
+
+
+def test_rsi_bounds_and_extremes():
+    """
+    Test that RSI is 100 after only gains and lies between 0 and 100 otherwise.
+    """
+    assert rsi(np.arange(1.0, 31.0))[-1] == 100.0
+    values = rsi(np.array([1.0, 2.0, 1.5, 2.5, 2.0] * 10), period=4)
+    assert np.isnan(values[:4]).all()
+    assert ((values[4:] > 0) & (values[4:] < 100)).all()
+
+
+def test_volatility_and_drawdown():
+    """
+    Test the rolling volatility of constant returns and the drawdown from the running peak.
+    """
+    np.testing.assert_allclose(volatility(np.exp(np.arange(30) * 0.01), 20)[20:], 0.0, atol=1e-12)
+    np.testing.assert_allclose(drawdown(np.array([10.0, 12.0, 9.0, 15.0])), [0.0, 0.0, -0.25, 0.0])
+
+
+def test_engine_incremental_updates_match_full_computation(close):
+    """
+    Test that feeding the series in pieces gives the same values as computing it in one go.
+    """
+    full = IndicatorEngine().update("AAPL", close)
+    engine = IndicatorEngine()
+    for end in (10, 300, 301, 900, len(close)):
+        incremental = engine.update("aapl", close[:end])
+
+    line, signal, _ = macd(close)
+    assert engine.processed_bars == len(close)
+    assert full["rsi"] == pytest.approx(rsi(close)[-1])
+    assert full["macd"] == pytest.approx(line[-1])
+    assert full["macd_signal"] == pytest.approx(signal[-1])
+    assert full["ema_20"] == pytest.approx(ema(close, 20)[-1])
+    assert full["max_drawdown"] == pytest.approx(drawdown(close).min())
+    for name, value in full.items():
+        assert incremental[name] == pytest.approx(value, rel=1e-9), name
+
+
+def test_engine_skips_unchanged_series(close):
+    """
+    Test that a repeated update processes no bars.
+    """
+    engine = IndicatorEngine()
+    engine.update("AAPL", close)
+    engine.update("AAPL", close)
+    assert engine.processed_bars == len(close)
+    assert math.isnan(IndicatorEngine().update("MSFT", close[:5])["sma_20"])
+
+
+def test_stock_price_node_includes_stored_indicators(mocker, tmp_path, close):
+    """
+    Test that the stock price answer includes indicators from the stored bars without another FMP call.
+    """
+    store = PriceStore(str(tmp_path))
+    dates = np.datetime64("2020-01-01") + np.arange(len(close))
+    store.append("AAPL", dates, {"open": close, "high": close, "low": close, "close": close, "volume": close})
+    mocker.patch("classes.price_history.get_price_store", return_value=store)
+    client = mocker.Mock()
+    client.get_json.return_value = [{
+        "symbol": "AAPL", "price": 222.5, "volume": 35396922, "priceAvg50": 223.07, "priceAvg200": 195.38,
+        "eps": 6.57, "pe": 33.87, "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+    }]
+    mocker.patch("classes.stock_price.get_fmp_client", return_value=client)
+    config = {"configurable": {"fmp_api_key": SecretStr("test_key")}}
+
+    result = get_stock_price_node({"symbol": "AAPL"}, config)[KEY_STOCK_PRICE]
+
+    assert "Technical Indicators" in result
+    assert "SMA (200-day)" in result
+    assert "RSI (14)" in result
+    client.get_json.assert_called_once()
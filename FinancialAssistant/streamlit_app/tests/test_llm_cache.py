@@ -0,0 +1,196 @@
+"""
+Unit tests for the exact-match LLM result cache.
+"""
+
+import asyncio
+import sqlite3
+import pytest
+from langchain_core.runnables import RunnableLambda
+from chains.route_chain import RouterResult, route_prompt
+from chains.extraction_chain import Extraction, extraction_prompt
+from methods.fmp_disk_cache import FMPDiskCache
+from methods.llm_cache import LLMCache, cached_chain
+
+
+class FakeClock:
+    """
+    Manually advanced clock for expiry tests.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLLM:
+    """
+    Chat model stand-in whose structured output counts the prompts it is sent.
+    """
+    def __init__(self, model_name: str = "test-model", route: str = "stock_price"):
+        self.model_name = model_name
+        self.temperature = 0
+        self.prompts = []
+        self.route = route
+
+    def with_structured_output(self, schema):
+        def answer(prompt_value):
+            self.prompts.append(prompt_value)
+            return schema(route=self.route) if schema is RouterResult else schema(symbol="AAPL")
+
+        async def aanswer(prompt_value):
+            return answer(prompt_value)
+
+        return RunnableLambda(answer, afunc=aanswer)
+
+
+INPUT = {"request": "What is the stock price of apple", "conversation_summary": ""}
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a manually advanced clock.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    """
+    Creates a memory-only cache for the route and extraction chains.
+    """
+    return LLMCache(chains=["route", "extraction"], ttl=60, clock=clock)
+
+
+def test_repeated_prompt_is_served_from_cache(cache):
+    """
+    Test that an identical prompt reaches the model once and later calls get an equal, separate result.
+    """
+    llm = FakeLLM()
+    chain = cached_chain("route", route_prompt, llm, RouterResult, cache)
+
+    first = chain.invoke(INPUT)
+    second = chain.invoke(INPUT)
+
+    assert len(llm.prompts) == 1
+    assert second == first == RouterResult(route="stock_price")
+    assert second is not first
+    assert cache.stats()["route:hits"] == 1
+    assert cache.stats()["route:misses"] == 1
+
+
+def test_key_covers_prompt_model_and_schema(cache):
+    """
+    Test that a different request, summary, model or output schema is not served the cached result.
+    """
+    llm, other_llm = FakeLLM(), FakeLLM(model_name="other-model", route="chat")
+    chain = cached_chain("route", route_prompt, llm, RouterResult, cache)
+    chain.invoke(INPUT)
+    chain.invoke(dict(INPUT, conversation_summary="User asked about Tesla"))
+    chain.invoke(dict(INPUT, request="What is the stock price of tesla"))
+
+    assert cached_chain("route", route_prompt, other_llm, RouterResult, cache).invoke(INPUT).route == "chat"
+    assert len(llm.prompts) == 3
+    assert cache.make_key(("A", "m", "0"), [], "{}") != cache.make_key(("A", "m", "0"), [], '{"x": 1}')
+
+
+def test_disabled_chain_is_not_cached(cache):
+    """
+    Test that chains outside the cache's chain set always call the model.
+    """
+    llm = FakeLLM()
+    chain = cached_chain("chat", route_prompt, llm, RouterResult, cache)
+
+    chain.invoke(INPUT)
+    chain.invoke(INPUT)
+
+    assert len(llm.prompts) == 2
+    assert cache.stats()["hits"] == 0
+
+
+def test_entries_expire(cache, clock):
+    """
+    Test that an entry is only served for the time to live.
+    """
+    llm = FakeLLM()
+    chain = cached_chain("extraction", extraction_prompt, llm, Extraction, cache)
+
+    chain.invoke("Apple")
+    clock.now = 59
+    chain.invoke("Apple")
+    clock.now = 61
+    chain.invoke("Apple")
+
+    assert len(llm.prompts) == 2
+
+
+def test_unparsed_results_are_not_cached(cache, mocker):
+    """
+    Test that a call that did not produce the schema, such as a failed parse, is retried next time.
+    """
+    llm = mocker.Mock()
+    llm.with_structured_output.return_value = RunnableLambda(lambda prompt_value: None)
+    chain = cached_chain("route", route_prompt, llm, RouterResult, cache)
+
+    assert chain.invoke(INPUT) is None
+    assert chain.invoke(INPUT) is None
+    assert cache.stats()["size"] == 0
+
+
+def test_async_chain_shares_entries(cache):
+    """
+    Test that ainvoke reads and writes the same entries as invoke.
+    """
+    llm = FakeLLM()
+    chain = cached_chain("route", route_prompt, llm, RouterResult, cache)
+
+    chain.invoke(INPUT)
+    result = asyncio.run(chain.ainvoke(INPUT))
+    asyncio.run(chain.ainvoke(dict(INPUT, request="Tesla price")))
+
+    assert result.route == "stock_price"
+    assert len(llm.prompts) == 2
+
+
+def test_disk_tier_survives_restart(tmp_path, clock):
+    """
+    Test that a new cache on the same file serves results stored by the previous one.
+    """
+    path = str(tmp_path / "llm_cache.sqlite3")
+    llm = FakeLLM()
+    cached_chain("route", route_prompt, llm, RouterResult, LLMCache(chains=["route"], disk=FMPDiskCache(path))).invoke(INPUT)
+
+    restarted = LLMCache(chains=["route"], disk=FMPDiskCache(path))
+    result = cached_chain("route", route_prompt, llm, RouterResult, restarted).invoke(INPUT)
+
+    assert result.route == "stock_price"
+    assert len(llm.prompts) == 1
+    assert restarted.stats()["disk_hits"] == 1
+
+
+def test_from_env(monkeypatch):
+    """
+    Test that LLM_CACHE_CHAINS selects the cached chains and an empty value disables caching.
+    """
+    monkeypatch.setenv("LLM_CACHE_CHAINS", "route, chat")
+    assert LLMCache.from_env().chains == {"route", "chat"}
+
+    monkeypatch.setenv("LLM_CACHE_CHAINS", "")
+    assert not LLMCache.from_env().enabled("route")
+
+
+def test_unusable_disk_tier_keeps_the_memory_cache(mocker, monkeypatch, tmp_path):
+    """
+    Test that a disk tier that cannot be opened or read still leaves chains cached in memory.
+    """
+    monkeypatch.setenv("LLM_CACHE_PATH", "/proc/nope/llm_cache.sqlite3")
+    assert LLMCache.from_env().disk is None
+
+    disk = FMPDiskCache(str(tmp_path / "llm_cache.sqlite3"))
+    mocker.patch.object(disk, "_connection", side_effect=sqlite3.OperationalError("database is locked"))
+    llm = FakeLLM()
+    chain = cached_chain("route", route_prompt, llm, RouterResult, LLMCache(chains=["route"], disk=disk))
+
+    assert chain.invoke(INPUT).route == chain.invoke(INPUT).route == "stock_price"
+    assert len(llm.prompts) == 1
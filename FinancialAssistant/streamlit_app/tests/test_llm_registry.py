@@ -0,0 +1,118 @@
+"""
+Unit tests for the process-wide LLM registry.
+"""
+
+import gc
+import pytest
+from pydantic import SecretStr
+from classes.config import Config
+from methods.llm_registry import LLMRegistry
+
+
+class FakeClock:
+    """
+    Manually advanced clock for idle tests.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeLLM:
+    """
+    Chat model stand-in remembering the httpx client it was built with.
+    """
+    def __init__(self, config, http_client):
+        self.config = config
+        self.http_client = http_client
+
+
+def config(provider: str = "Groq", api_key: str = "key1") -> Config:
+    return Config(SecretStr(api_key), SecretStr("fmp_key"), provider)
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a manually advanced clock.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def registry(clock):
+    """
+    Creates a registry building fake models.
+    """
+    return LLMRegistry(factory=FakeLLM, idle_timeout=60, clock=clock)
+
+
+def test_sessions_share_one_model(registry):
+    """
+    Test that the same provider and key get the same model, and a different key or provider its own.
+    """
+    llm = registry.get(config())
+
+    assert registry.get(config()) is llm
+    assert registry.get(config(api_key="key2")) is not llm
+    assert registry.get(config(provider="Anthropic")).http_client is None
+    assert llm.http_client is not None
+    assert registry.stats() == {"created": 3, "reused": 1, "alive": 3, "pinned": 3}
+
+
+def test_key_hashes_api_key():
+    """
+    Test that the registry key never contains the API key itself.
+    """
+    key = LLMRegistry.make_key(config(api_key="secret-key"))
+
+    assert key[:2] == ("Groq", "llama-3.3-70b-versatile")
+    assert "secret-key" not in "".join(key)
+
+
+def test_idle_model_is_freed_and_its_pool_closed(registry, clock):
+    """
+    Test that an idle model no graph holds is freed with its connection pool.
+    """
+    http_client = registry.get(config()).http_client
+    clock.now = 61
+
+    assert registry.release_idle() == 1
+    gc.collect()
+    assert registry.stats()["alive"] == 0
+    assert http_client.is_closed
+    assert registry.get(config()).http_client is not http_client
+
+
+def test_idle_model_still_in_use_is_returned(registry, clock):
+    """
+    Test that a model a session still holds is handed out again after it went idle.
+    """
+    llm = registry.get(config())
+    clock.now = 61
+    registry.release_idle()
+
+    assert registry.get(config()) is llm
+    assert registry.stats()["pinned"] == 1
+    assert not llm.http_client.is_closed
+
+
+def test_unsupported_provider(clock):
+    """
+    Test that an unknown provider is rejected.
+    """
+    with pytest.raises(ValueError):
+        LLMRegistry(clock=clock).get(config(provider="Mistral"))
+
+
+def test_openai_model_uses_pooled_client(clock):
+    """
+    Test that a real OpenAI model sends its requests through the registry's keep-alive pool.
+    """
+    registry = LLMRegistry(clock=clock)
+    llm = registry.get(config(provider="OpenAI"))
+
+    assert llm.root_client._client is llm.http_client
+    assert registry.get(config(provider="OpenAI")) is llm
@@ -0,0 +1,76 @@
+"""
+Unit tests for the model builder used on the cached and batch paths.
+"""
+
+import pytest
+from pydantic import SecretStr, ValidationError
+from methods.model_builder import ModelBuilder
+from classes.stock_price import StockPrice, STOCK_PRICE_BUILDER, get_stock_price
+
+
+def make_quote(symbol: str = "AAPL") -> dict:
+    """
+    Builds a quote row for the given symbol.
+    """
+    return {
+        "symbol": symbol, "price": 222.5, "volume": 35396922, "priceAvg50": 223.07,
+        "priceAvg200": 195.38, "eps": 6.57, "pe": 33.87,
+        "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+    }
+
+
+def test_build_reuses_model_for_same_row():
+    """
+    Test that the model is rebuilt only when the cached row object changes.
+    """
+    builder = ModelBuilder(StockPrice)
+    row = make_quote()
+
+    first = builder.build("AAPL", row)
+    assert builder.build("AAPL", row) is first
+    rebuilt = builder.build("AAPL", make_quote())
+
+    assert rebuilt is not first and rebuilt == first
+    assert builder.stats() == {"built": 2, "reused": 1, "size": 1}
+
+
+def test_build_validates_untrusted_rows():
+    """
+    Test that a row is validated before it is remembered.
+    """
+    builder = ModelBuilder(StockPrice)
+    row = dict(make_quote(), price="not a price")
+
+    with pytest.raises(ValidationError):
+        builder.build("AAPL", row)
+    assert builder.stats()["size"] == 0
+
+
+def test_build_many_skips_invalid_rows():
+    """
+    Test that one bad row does not drop the rest of the batch.
+    """
+    builder = ModelBuilder(StockPrice, max_size=2)
+    rows = [make_quote("AAPL"), {"symbol": "BAD"}, make_quote("MSFT"), "junk"]
+
+    pairs = builder.build_many(rows)
+
+    assert [model.symbol for _, model in pairs] == ["AAPL", "MSFT"]
+    assert pairs[0][0] is rows[0]
+    assert builder.build_many([make_quote("IBM")])[0][1].price == 222.5
+
+
+def test_get_stock_price_reuses_model_on_cache_hit(mocker):
+    """
+    Test that a cache hit returns the model built on the first fetch.
+    """
+    client = mocker.Mock()
+    client.get_json.return_value = [make_quote()]
+    mocker.patch("classes.stock_price.get_fmp_client", return_value=client)
+    STOCK_PRICE_BUILDER.clear()
+
+    first = get_stock_price("aapl", SecretStr("test_key"))
+    second = get_stock_price("AAPL", SecretStr("test_key"))
+
+    assert second is first
+    assert STOCK_PRICE_BUILDER.stats()["reused"] == 1
@@ -0,0 +1,241 @@
+"""
+Unit tests for the memory-mapped price store and the price history built on it.
+"""
+
+import numpy as np
+import pytest
+import requests
+from pydantic import SecretStr
+from classes.price_history import (
+    PriceHistory, bars_from_payload, describe_period, get_price_history, months_from_request
+)
+from graph.nodes.financial_data_nodes import get_price_history_node
+from graph.nodes.utility_nodes import where_to_alone
+from methods.price_store import PriceStore
+from consts.consts import KEY_PRICE_HISTORY, KEY_REQUEST_CATEGORY, KEY_SYMBOL
+
+DAY = 24 * 60 * 60
+TODAY = np.datetime64("2024-10-18")
+
+
+class FakeClock:
+    """
+    Manually advanced wall clock so tests never sleep.
+    """
+    def __init__(self, today: np.datetime64 = TODAY):
+        self.now = float(today.astype("datetime64[s]").astype(np.int64)) + 12 * 60 * 60
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def bars(start: str, days: int, first_close: float = 100.0):
+    """
+    Builds consecutive daily bars whose close rises by one every day.
+    """
+    dates = np.datetime64(start) + np.arange(days)
+    close = first_close + np.arange(days, dtype=np.float64)
+    return dates, {"open": close - 0.5, "high": close + 1, "low": close - 1, "close": close, "volume": np.full(days, 1e6)}
+
+
+def payload(dates, columns):
+    """
+    Formats bars like the historical-price-full endpoint, newest first.
+    """
+    rows = [
+        {"date": str(date), **{name: float(values[i]) for name, values in columns.items()}}
+        for i, date in enumerate(dates)
+    ]
+    return {"symbol": "AAPL", "historical": rows[::-1]}
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a clock set to midday of TODAY.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    """
+    Creates an empty store in a temporary directory.
+    """
+    return PriceStore(str(tmp_path), refresh_interval=60, clock=clock)
+
+
+def test_append_keeps_only_new_bars(store):
+    """
+    Test that bars already stored or duplicated in the input are not appended again.
+    """
+    assert store.append("aapl", *bars("2024-10-01", 5)) == 5
+    dates, columns = bars("2024-10-03", 5, first_close=102.0)
+    assert store.append("AAPL", np.concatenate([dates, dates[-1:]]), {k: np.append(v, v[-1]) for k, v in columns.items()}) == 2
+
+    stored = store.columns("AAPL")
+    assert len(stored["date"]) == 7
+    assert str(store.last_date("AAPL")) == "2024-10-07"
+    np.testing.assert_array_equal(stored["close"], 100.0 + np.arange(7))
+
+
+def test_slice_returns_views_of_the_mapped_columns(store):
+    """
+    Test that a date range is served without copying the stored columns.
+    """
+    store.append("AAPL", *bars("2024-10-01", 10))
+    window = store.slice("AAPL", start=np.datetime64("2024-10-03"), end=np.datetime64("2024-10-05"))
+
+    assert [str(d) for d in window["date"]] == ["2024-10-03", "2024-10-04", "2024-10-05"]
+    assert isinstance(window["close"].base, np.memmap) or isinstance(window["close"], np.memmap)
+    assert np.shares_memory(window["close"], store.columns("AAPL")["close"])
+
+
+def test_interrupted_write_is_ignored_and_repaired(store, tmp_path):
+    """
+    Test that a bar without a date is not visible and is overwritten by the next append.
+    """
+    store.append("AAPL", *bars("2024-10-01", 3))
+    with open(tmp_path / "AAPL" / "close.bin", "ab") as file:
+        file.write(np.float64(999.0).tobytes())
+
+    assert len(store.columns("AAPL")["close"]) == 3
+    store.append("AAPL", *bars("2024-10-04", 1, first_close=103.0))
+    np.testing.assert_array_equal(store.columns("AAPL")["close"], [100.0, 101.0, 102.0, 103.0])
+
+
+def test_refresh_fetches_only_missing_bars(store, clock):
+    """
+    Test that the first refresh backfills, later ones start at the last stored bar,
+    and a symbol is not checked again within the refresh interval.
+    """
+    starts = []
+
+    def fetch(start):
+        starts.append(start)
+        return bars("2024-10-10", 6) if start is None else bars(str(start), 3, first_close=105.0)
+
+    assert store.refresh("AAPL", fetch) == 6
+    assert store.refresh("AAPL", fetch) == 0
+    clock.now += 61
+    assert store.refresh("AAPL", fetch) == 2
+    clock.now += 61
+    store.refresh("AAPL", fetch)
+
+    assert starts == [None, np.datetime64("2024-10-15")]
+    assert str(store.last_date("AAPL")) == "2024-10-17"
+
+
+def test_bars_of_today_are_not_stored_until_the_session_is_over(store, clock):
+    """
+    Test that the unfinished bar of today is left out and stored the next day.
+    """
+    store.append("AAPL", *bars("2024-10-16", 3))
+
+    assert str(store.last_date("AAPL")) == "2024-10-17"
+    assert store.due("AAPL") is False
+    clock.now += 24 * 60 * 60
+    assert store.due("AAPL") is True
+    assert store.append("AAPL", *bars("2024-10-16", 3, first_close=100.0)) == 1
+    assert store.columns("AAPL")["close"][-1] == 102.0
+
+
+def test_refresh_rebuilds_a_symbol_after_a_split(store, clock):
+    """
+    Test that a split, seen as another close for the last stored bar, replaces the stored history.
+    """
+    split = [False]
+
+    def fetch(start):
+        dates, columns = bars("2024-10-01", 17)
+        if split[0]:
+            columns = {name: values / 2 if name != "volume" else values for name, values in columns.items()}
+        return (dates[-3:], {name: values[-3:] for name, values in columns.items()}) if start else (dates, columns)
+
+    store.refresh("AAPL", fetch)
+    before = store.columns("AAPL")["close"]
+    split[0] = True
+    clock.now += 24 * 60 * 60
+
+    assert store.refresh("AAPL", fetch) == 17
+    np.testing.assert_array_equal(store.columns("AAPL")["close"], (100.0 + np.arange(17)) / 2)
+    np.testing.assert_array_equal(before, 100.0 + np.arange(17))
+
+
+def test_months_from_request():
+    """
+    Test that the period is read from the request in several phrasings.
+    """
+    assert months_from_request("How has AAPL done over the last 6 months?", TODAY) == 6
+    assert months_from_request("past two years", TODAY) == 24
+    assert months_from_request("performance this month", TODAY) == 1
+    assert months_from_request("YTD return of MSFT", TODAY) == pytest.approx(291 / 30.4375)
+    assert months_from_request("over 20 years", TODAY) == 60
+    assert months_from_request("How is Tesla doing?", TODAY) == 12
+    assert describe_period(24) == "2 years"
+    assert describe_period(0.25) == "1 week"
+    assert describe_period(6) == "6 months"
+
+
+def test_price_history_summary():
+    """
+    Test the headline figures of a period.
+    """
+    dates, columns = bars("2024-01-01", 366)
+    history = PriceHistory("AAPL", dates, columns, 12)
+    summary = history.summary()
+
+    assert summary["sessions"] == 366
+    assert summary["total_return"] == pytest.approx(3.65)
+    assert summary["high"] == 466.0
+    assert str(summary["low_date"]) == "2024-01-01"
+
+
+def test_bars_from_payload_skips_incomplete_rows():
+    """
+    Test that the FMP payload is converted into aligned columns.
+    """
+    dates, columns = bars_from_payload({"historical": [
+        {"date": "2024-10-02", "open": 1, "high": 2, "low": 0.5, "close": 1.5, "volume": 10},
+        {"date": "2024-10-01", "close": None},
+    ]})
+    assert [str(d) for d in dates] == ["2024-10-02"]
+    assert columns["close"].tolist() == [1.5]
+    assert bars_from_payload({})[0].size == 0
+
+
+def test_bars_from_payload_adjusts_prices():
+    """
+    Test that prices are taken split and dividend adjusted, and volume is kept as reported.
+    """
+    dates, columns = bars_from_payload({"historical": [
+        {"date": "2024-06-07", "open": 1200, "high": 1220, "low": 1180, "close": 1208, "adjClose": 120.8, "volume": 10},
+    ]})
+    assert columns["close"].tolist() == pytest.approx([120.8])
+    assert columns["open"].tolist() == pytest.approx([120.0])
+    assert columns["high"].tolist() == pytest.approx([122.0])
+    assert columns["volume"].tolist() == [10.0]
+
+
+def test_price_history_node_serves_stored_bars_when_fmp_fails(mocker, store):
+    """
+    Test that the node answers from the store and keeps serving it when a refresh fails.
+    """
+    client = mocker.Mock()
+    client.get_json.return_value = payload(*bars("2024-04-18", 184))
+    mocker.patch("classes.price_history.get_fmp_client", return_value=client)
+    mocker.patch("classes.price_history.get_price_store", return_value=store)
+    mocker.patch("graph.nodes.financial_data_nodes.get_price_store", return_value=store)
+    config = {"configurable": {"fmp_api_key": SecretStr("test_key")}}
+    state = {KEY_SYMBOL: "AAPL", "request": "How has Apple performed over the last 3 months?"}
+
+    result = get_price_history_node(state, config)[KEY_PRICE_HISTORY]
+
+    assert "Price Performance over 3 months" in result
+    assert "2024-10-17" in result and "2024-10-18" not in result
+    assert client.get_json.call_args.kwargs["params"] == {"from": "2019-10-19"}
+
+    store.clock.now += 2 * DAY
+    client.get_json.side_effect = requests.ConnectionError("down")
+    assert get_price_history("AAPL", SecretStr("test_key"), 3) is not None
+    assert where_to_alone({KEY_SYMBOL: "AAPL", KEY_REQUEST_CATEGORY: "price_history"}) == "price_history"
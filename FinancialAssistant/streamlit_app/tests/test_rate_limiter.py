@@ -0,0 +1,170 @@
+"""
+Unit tests for the FMP rate limiter and its use by the FMP client.
+"""
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from pydantic import SecretStr
+from methods.fmp_client import FMPClient
+from methods.rate_limiter import RateLimiter, parse_retry_after
+from consts.consts import PRIORITY_INTERACTIVE, PRIORITY_BACKGROUND
+
+
+class FakeClock:
+    """
+    Manually advanced clock so tests never sleep.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a fake clock starting at zero.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def limiter(clock):
+    """
+    Creates a limiter with one call per second and a burst of ten.
+    """
+    return RateLimiter(rate_per_minute=60, burst=10, interactive_reserve=0.2, clock=clock)
+
+
+def test_bucket_refills_at_the_configured_rate(limiter, clock):
+    """
+    Test that the burst is spent immediately and then one token arrives per second.
+    """
+    assert all(limiter.acquire(timeout=0) for _ in range(10))
+    assert limiter.acquire(timeout=0) is False
+
+    clock.now = 1.0
+    assert limiter.acquire(timeout=0) is True
+
+
+def test_background_calls_leave_a_reserve_for_interactive_calls(limiter):
+    """
+    Test that background calls cannot drain the part of the bucket kept for interactive calls.
+    """
+    background = [limiter.acquire(PRIORITY_BACKGROUND, timeout=0) for _ in range(10)]
+
+    assert background.count(True) == 8
+    assert limiter.acquire(PRIORITY_INTERACTIVE, timeout=0) is True
+    assert limiter.acquire(PRIORITY_INTERACTIVE, timeout=0) is True
+
+
+def test_small_burst_still_serves_background_calls(clock):
+    """
+    Test that a burst too small for the reserve does not starve lower priority calls.
+    """
+    limiter = RateLimiter(rate_per_minute=60, burst=1, interactive_reserve=0.2, clock=clock)
+
+    assert limiter.acquire(PRIORITY_BACKGROUND, timeout=0) is True
+    assert limiter.acquire(PRIORITY_BACKGROUND, timeout=0) is False
+    clock.now = 1.0
+    assert limiter.acquire(PRIORITY_BACKGROUND, timeout=0) is True
+    assert RateLimiter(rate_per_minute=6000, burst=2, interactive_reserve=0.8).reserve == 1.0
+
+
+@pytest.mark.parametrize("rate_per_minute, burst", [(60, 0.5), (60, 0), (0, 10), (-1, 10)])
+def test_limits_that_would_block_forever_are_rejected(rate_per_minute, burst):
+    """
+    Test that a bucket unable to ever hold or refill a whole token is refused.
+    """
+    with pytest.raises(ValueError):
+        RateLimiter(rate_per_minute=rate_per_minute, burst=burst)
+
+
+def test_waiting_interactive_calls_go_first(limiter):
+    """
+    Test that lower priority calls yield while an interactive call is queued.
+    """
+    limiter._waiting[PRIORITY_INTERACTIVE] += 1
+
+    assert limiter.acquire(PRIORITY_BACKGROUND, timeout=0) is False
+
+
+def test_throttling_pauses_and_slows_the_bucket(limiter, clock):
+    """
+    Test that a 429 pauses all calls for Retry-After and halves the rate until calls succeed.
+    """
+    limiter.on_throttled(retry_after=5)
+
+    assert limiter.acquire(timeout=0) is False
+    assert limiter.stats()["rate_per_minute"] == 30
+
+    clock.now = 7.0
+    assert limiter.acquire(timeout=0) is True
+    limiter.on_success()
+    assert limiter.stats()["rate_per_minute"] == 33
+
+
+def test_parse_retry_after():
+    """
+    Test that Retry-After is parsed from seconds and ignores garbage.
+    """
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+
+
+def test_client_retries_after_429(mocker):
+    """
+    Test that the client reports a 429 to the limiter and retries the request.
+    """
+    limiter = RateLimiter(rate_per_minute=6000, burst=5)
+    client = FMPClient(base_url="https://fmp.test/api/v3", limiter=limiter)
+    throttled = mocker.Mock(status_code=429, headers={"Retry-After": "0"})
+    ok = mocker.Mock(status_code=200, headers={}, content=b'[{"symbol": "AAPL"}]')
+    mocker.patch.object(client.session, "get", side_effect=[throttled, ok])
+
+    data = client.get_json("quote-order/AAPL", SecretStr("test_key"))
+
+    assert data == [{"symbol": "AAPL"}]
+    assert limiter.stats()["throttled"] == 1
+
+
+def test_client_reports_real_429_responses_to_the_limiter():
+    """
+    Test that 429 answers with Retry-After reach the limiter instead of being retried inside the HTTP adapter.
+    """
+    statuses = [429, 429, 200]
+    served = []
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            status = statuses[min(len(served), len(statuses) - 1)]
+            served.append(status)
+            body = b'[{"symbol": "AAPL"}]' if status == 200 else b'{"Error Message": "Limit Reach"}'
+            self.send_response(status)
+            if status == 429:
+                self.send_header("Retry-After", "0")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        limiter = RateLimiter(rate_per_minute=6000, burst=5)
+        client = FMPClient(base_url=f"http://127.0.0.1:{server.server_address[1]}/api/v3", limiter=limiter)
+
+        assert client.get_json("quote-order/AAPL", SecretStr("test_key")) == [{"symbol": "AAPL"}]
+        assert served == [429, 429, 200]
+        assert limiter.stats()["throttled"] == 2
+        client.close()
+    finally:
+        server.shutdown()
+        server.server_close()
@@ -0,0 +1,129 @@
+"""
+Unit tests for combined routing and symbol extraction.
+"""
+
+import pytest
+from chains.route_extraction_chain import RouteExtraction
+from graph.nodes.router_node import confident_symbol, create_get_route_node
+from graph.nodes.utility_nodes import where_to_combined
+from graph.work_flow import create_workflow
+from methods.fast_router import FastRouter
+from methods.memory_manager import MemoryManager
+from consts.consts import UNKNOWN
+
+CONFIG = {"configurable": {"user_id": "test_user", "thread_id": "1", "fmp_api_key": "test_key"}}
+
+
+@pytest.fixture
+def route_extraction_chain(mocker):
+    """
+    Replaces the combined chain and sends every request to it.
+    """
+    chain = mocker.Mock()
+    chain.invoke.return_value = RouteExtraction(route="stock_price", symbol="tsla", confidence=0.95)
+    mocker.patch("graph.nodes.router_node.create_route_extraction_chain", return_value=chain)
+    mocker.patch("graph.nodes.router_node.get_fast_router", return_value=FastRouter(enabled=False))
+    mocker.patch("graph.nodes.router_node.get_symbol_index").return_value.resolve.return_value = None
+    return chain
+
+
+@pytest.mark.parametrize("route, symbol, confidence, expected", [
+    ("stock_price", "aapl", 0.9, "AAPL"),
+    ("report", "BRK.B", 0.8, "BRK.B"),
+    ("stock_price", "AAPL", 0.5, UNKNOWN),
+    ("chat", "AAPL", 1.0, UNKNOWN),
+    ("income_statement", "Apple Inc.", 1.0, UNKNOWN),
+    ("income_statement", UNKNOWN, 1.0, UNKNOWN),
+])
+def test_confident_symbol(route, symbol, confidence, expected):
+    """
+    Test that only confident, well-formed symbols of data routes are kept.
+    """
+    assert confident_symbol(RouteExtraction(route=route, symbol=symbol, confidence=confidence)) == expected
+
+
+@pytest.mark.parametrize("state, expected", [
+    ({"request_category": "chat", "symbol": "AAPL"}, "chat"),
+    ({"request_category": "report", "symbol": UNKNOWN}, "report"),
+    ({"request_category": "report", "symbol": "AAPL"}, "report_ready"),
+    ({"request_category": "price_history", "symbol": UNKNOWN}, "alone"),
+    ({"request_category": "price_history", "symbol": "AAPL"}, "price_history"),
+])
+def test_where_to_combined(state, expected):
+    """
+    Test that requests with a symbol skip symbol extraction.
+    """
+    assert where_to_combined(state) == expected
+
+
+def test_router_node_returns_route_and_symbol(mocker, route_extraction_chain):
+    """
+    Test that the combined router makes one LLM call with the summary and writes both fields.
+    """
+    memory_manager = MemoryManager()
+    memory_manager.update_conversation_summary("test_user", "User asked about Tesla")
+    node = create_get_route_node(mocker.Mock(), combined=True)
+
+    result = node({"request": "And their price?", "symbol": "AAPL"}, CONFIG, memory_manager)
+
+    assert result == {"request_category": "stock_price", "symbol": "TSLA"}
+    route_extraction_chain.invoke.assert_called_once_with(
+        {"request": "And their price?", "conversation_summary": "User asked about Tesla"}
+    )
+
+
+def test_router_node_prefers_local_symbol(mocker, route_extraction_chain):
+    """
+    Test that a symbol resolved by the local index wins over the LLM's, and a fast route still gets it.
+    """
+    mocker.patch("graph.nodes.router_node.get_symbol_index").return_value.resolve.return_value = "AAPL"
+    node = create_get_route_node(mocker.Mock(), combined=True)
+    assert node({"request": "Apple price"}, CONFIG, MemoryManager())["symbol"] == "AAPL"
+
+    mocker.patch("graph.nodes.router_node.get_fast_router", return_value=FastRouter())
+    assert node({"request": "AAPL stock price"}, CONFIG, MemoryManager()) == {
+        "request_category": "stock_price", "symbol": "AAPL"
+    }
+    route_extraction_chain.invoke.assert_called_once()
+
+
+def test_combined_workflow_skips_extraction(mocker, route_extraction_chain):
+    """
+    Test that a confident combined result goes straight to the data node, and an unsure one
+    through the extraction chain.
+    """
+    extraction_chain = mocker.Mock()
+    extraction_chain.invoke.return_value.symbol = "TSLA"
+    mocker.patch("graph.nodes.extraction_node.create_extraction_chain", return_value=extraction_chain)
+    mocker.patch("graph.nodes.extraction_node.get_symbol_index").return_value.resolve.return_value = None
+    mocker.patch("graph.work_flow.create_summarization_node", return_value=lambda state: {})
+
+    def get_stock_price_node(state, config):
+        return {"stock_price": f"price of {state['symbol']}"}
+
+    mocker.patch("graph.work_flow.get_stock_price_node", get_stock_price_node)
+    graph = create_workflow(mocker.Mock(), combined_routing=True)
+
+    result = graph.invoke({"request": "How much is the carmaker?"}, CONFIG)
+    assert result["final_answer"] == "# Stock Price for (TSLA) \nprice of TSLA"
+    extraction_chain.invoke.assert_not_called()
+
+    route_extraction_chain.invoke.return_value = RouteExtraction(route="stock_price", symbol="TSLA", confidence=0.4)
+    config = {"configurable": dict(CONFIG["configurable"], thread_id="2")}
+    result = graph.invoke({"request": "How much is the carmaker?"}, config)
+    assert result["final_answer"] == "# Stock Price for (TSLA) \nprice of TSLA"
+    extraction_chain.invoke.assert_called_once()
+
+
+def test_workflow_mode_from_env(mocker, monkeypatch):
+    """
+    Test that COMBINED_ROUTING selects the router chain.
+    """
+    combined = mocker.patch("graph.nodes.router_node.create_route_extraction_chain")
+    monkeypatch.setenv("COMBINED_ROUTING", "1")
+    create_workflow(mocker.Mock())
+    combined.assert_called_once()
+
+    monkeypatch.setenv("COMBINED_ROUTING", "0")
+    create_workflow(mocker.Mock())
+    combined.assert_called_once()
@@ -0,0 +1,194 @@
+"""
+Unit tests for the semantic cache of chat answers.
+"""
+
+import pytest
+from graph.nodes.chat_node import create_chat_node
+from chains.chat_chain import ChatResult
+from methods.memory_manager import MemoryManager
+from methods.semantic_cache import SemanticCache, TextVectorizer, content_words, same_content
+
+
+class FakeClock:
+    """
+    Manually advanced clock for expiry tests.
+    """
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    """
+    Creates a manually advanced clock.
+    """
+    return FakeClock()
+
+
+@pytest.fixture
+def cache(clock):
+    """
+    Creates a small per-user cache.
+    """
+    return SemanticCache(ttl=60, max_size=3, clock=clock)
+
+
+def test_content_words():
+    """
+    Test that filler words, possessives and abbreviation punctuation are removed.
+    """
+    assert content_words("What's your opinion on the P/E ratio?") == ["pe", "ratio"]
+    assert same_content(["tech", "stocks"], ["tech", "stock"])
+    assert same_content(["semiconductor"], ["semiconducter"])
+    assert not same_content(["tech", "stocks"], ["bank", "stocks"])
+    assert not same_content(["dividend"], ["dividend", "yield"])
+
+
+def test_vectors_are_stable_and_normalized():
+    """
+    Test that the same words always give the same unit vector and unrelated words are orthogonal-ish.
+    """
+    vectorizer = TextVectorizer()
+    vector = vectorizer.vectorize(["tech", "market"])
+
+    assert vector == pytest.approx(vectorizer.vectorize(["tech", "market"]))
+    assert float(vector @ vector) == pytest.approx(1.0)
+    assert abs(float(vector @ vectorizer.vectorize(["inflation"]))) < 0.3
+    assert not vectorizer.vectorize([]).any()
+
+
+@pytest.mark.parametrize("question", [
+    "What do you think about the tech market",
+    "what's your opinion on the tech market?",
+    "Any thoughts on the tech markets?",
+])
+def test_paraphrase_is_served(cache, question):
+    """
+    Test that a question asked in other words gets the cached answer.
+    """
+    cache.set("What do you think of the tech market?", "Tech is volatile.", "user1")
+
+    assert cache.get(question, "user1") == "Tech is volatile."
+
+
+@pytest.mark.parametrize("question", [
+    "What do you think of the energy market?",
+    "What do you think of the tech market crash?",
+    "What do you think of their market?",
+])
+def test_different_or_contextual_question_is_not_served(cache, question):
+    """
+    Test that questions about something else, or referring back to the conversation, go to the LLM.
+    """
+    cache.set("What do you think of the tech market?", "Tech is volatile.", "user1")
+
+    assert cache.get(question, "user1") is None
+
+
+@pytest.mark.parametrize("cached, question", [
+    ("Why did AAPL fall?", "When did AAPL fall?"),
+    ("How do rate cuts affect bank stocks?", "Why do rate cuts affect bank stocks?"),
+    ("Should I buy index funds?", "Could I buy index funds?"),
+    ("Is the tech market overvalued?", "Is the tech market not overvalued?"),
+])
+def test_question_words_negations_and_modals_change_the_question(cache, cached, question):
+    """
+    Test that questions differing only in their question word, a negation or a modal are not served each other's answer.
+    """
+    cache.set(cached, "cached answer", "user1")
+
+    assert cache.get(question, "user1") is None
+    assert cache.get(cached, "user1") == "cached answer"
+
+
+def test_owner_numbers_are_bounded(cache, clock):
+    """
+    Test that users without live answers are forgotten and that lookups alone assign no owner number.
+    """
+    for user in range(10):
+        cache.get("What is EBITDA?", f"lookup{user}")
+    assert cache._owner_ids == {}
+
+    cache.set("What is EBITDA?", "ebitda", "user1")
+    clock.now = 100
+    for user in range(2, 10):
+        cache.set("What is EPS?", "eps", f"user{user}")
+
+    assert len(cache._owner_ids) <= cache.max_size + 1
+    assert "user1" not in cache._owner_ids
+    assert cache.get("What is EPS?", "user9") == "eps"
+    assert cache.get("What is EPS?", "user2") is None
+
+
+def test_scope(clock):
+    """
+    Test that user-scoped answers stay with their user and global ones are shared.
+    """
+    per_user = SemanticCache(clock=clock)
+    shared = SemanticCache(scope="global", clock=clock)
+    for cache in (per_user, shared):
+        cache.set("What is EBITDA?", "Earnings before interest...", "user1")
+
+    assert per_user.get("what does EBITDA mean?", "user2") is None
+    assert shared.get("what does EBITDA mean?", "user2") == "Earnings before interest..."
+    with pytest.raises(ValueError):
+        SemanticCache(scope="team")
+
+
+def test_expiry_and_eviction(cache, clock):
+    """
+    Test that answers expire, a repeated question replaces its answer and the least recently used is evicted.
+    """
+    cache.set("What is EBITDA?", "old", "user1")
+    cache.set("what is ebitda", "new", "user1")
+    assert cache.get("What is EBITDA?", "user1") == "new"
+    assert cache.stats()["size"] == 1
+
+    clock.now = 10
+    cache.set("What is EPS?", "eps", "user1")
+    cache.set("What is a dividend?", "dividend", "user1")
+    clock.now = 20
+    cache.get("What is EBITDA?", "user1")
+    cache.set("What is beta?", "beta", "user1")
+    assert cache.get("What is EPS?", "user1") is None
+    assert cache.get("What is EBITDA?", "user1") == "new"
+
+    clock.now = 100
+    assert cache.get("What is beta?", "user1") is None
+    assert cache.stats()["size"] == 0
+
+
+def test_stats_and_disabled_cache(cache):
+    """
+    Test the counters, and that a disabled cache stores nothing.
+    """
+    cache.set("What is beta?", "beta", "user1")
+    cache.get("What is beta?", "user1")
+    cache.get("What is alpha?", "user1")
+    cache.get("And their beta?", "user1")
+    assert cache.stats() == {"hits": 1, "misses": 1, "skipped": 1, "size": 1, "hit_rate": 0.5}
+
+    disabled = SemanticCache(enabled=False)
+    disabled.set("What is beta?", "beta", "user1")
+    assert disabled.get("What is beta?", "user1") is None
+
+
+def test_chat_node_skips_llm_for_paraphrase(mocker, cache):
+    """
+    Test that the chat node stores the LLM's answer and serves a paraphrase from the cache.
+    """
+    chain = mocker.Mock()
+    chain.invoke.return_value = ChatResult(response="Tech is volatile.")
+    mocker.patch("graph.nodes.chat_node.create_chat_chain", return_value=chain)
+    mocker.patch("graph.nodes.chat_node.get_semantic_cache", return_value=cache)
+    node = create_chat_node(mocker.Mock())
+    config = {"configurable": {"user_id": "user1"}}
+
+    node({"request": "What do you think of the tech market?"}, config, MemoryManager())
+    result = node({"request": "Your thoughts on the tech market?"}, config, MemoryManager())
+
+    assert result == {"chat_response": "Tech is volatile."}
+    chain.invoke.assert_called_once()
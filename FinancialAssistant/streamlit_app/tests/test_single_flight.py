@@ -0,0 +1,104 @@
+"""
+Unit tests for single-flight request coalescing.
+"""
+
+import asyncio
+import threading
+import time
+import pytest
+from methods.fmp_cache import FMPCache
+from methods.single_flight import SingleFlight, AsyncSingleFlight
+
+
+def test_concurrent_threads_share_one_call():
+    """
+    Test that threads asking for the same key wait on a single call.
+    """
+    flight = SingleFlight()
+    calls = []
+    results = []
+
+    def fetch():
+        calls.append(1)
+        time.sleep(0.05)
+        return ["payload"]
+
+    threads = [threading.Thread(target=lambda: results.append(flight.do("AAPL", fetch))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert results == [["payload"]] * 8
+    assert flight.in_flight() == 0
+
+
+def test_followers_receive_the_leaders_error():
+    """
+    Test that an exception raised by the leader is shared with the waiting threads.
+    """
+    flight = SingleFlight()
+    started = threading.Event()
+    errors = []
+
+    def fetch():
+        started.set()
+        time.sleep(0.05)
+        raise ValueError("FMP is down")
+
+    def call():
+        try:
+            flight.do("AAPL", fetch)
+        except ValueError as e:
+            errors.append(e)
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    started.wait()
+    follower = threading.Thread(target=call)
+    follower.start()
+    leader.join()
+    follower.join()
+
+    assert len(errors) == 2
+    assert errors[0] is errors[1]
+
+
+def test_concurrent_coroutines_share_one_call():
+    """
+    Test that coroutines asking for the same key await a single call.
+    """
+    flight = AsyncSingleFlight()
+    calls = []
+
+    async def fetch():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return ["payload"]
+
+    async def run():
+        return await asyncio.gather(*(flight.do("AAPL", fetch) for _ in range(8)))
+
+    assert asyncio.run(run()) == [["payload"]] * 8
+    assert len(calls) == 1
+
+
+def test_cache_coalesces_concurrent_misses(mocker):
+    """
+    Test that concurrent cache misses for one symbol reach FMP only once.
+    """
+    cache = FMPCache(ttls={"quote-order": 10})
+
+    def fetch():
+        time.sleep(0.05)
+        return [{"symbol": "AAPL"}]
+
+    fetch_mock = mocker.Mock(side_effect=fetch)
+    threads = [threading.Thread(target=cache.get_or_fetch, args=("quote-order", "AAPL", fetch_mock)) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    fetch_mock.assert_called_once()
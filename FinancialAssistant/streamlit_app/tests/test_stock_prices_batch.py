@@ -0,0 +1,96 @@
+"""
+Unit tests for batched multi-symbol quote fetching.
+"""
+
+import asyncio
+import pytest
+from pydantic import SecretStr
+from classes.stock_price import split_batches, get_stock_prices, aget_stock_prices, get_stock_price, QUOTE_FIELDS
+
+
+def make_quote(symbol: str) -> dict:
+    """
+    Builds a quote row for the given symbol.
+    """
+    return {
+        "symbol": symbol, "price": 100.0, "volume": 1000, "priceAvg50": 99.0,
+        "priceAvg200": 95.0, "eps": 5.0, "pe": 20.0,
+        "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+    }
+
+
+def quote_batch(path: str, api_key, params=None, priority=None, fields=None) -> list[dict]:
+    """
+    Answers a comma-separated quote request, omitting unknown symbols like FMP does.
+    """
+    symbols = path.split("/", 1)[1].split(",")
+    return [make_quote(symbol) for symbol in symbols if symbol != "NOPE"]
+
+
+@pytest.fixture
+def api_key():
+    """
+    Returns a test FMP API key.
+    """
+    return SecretStr("test_key")
+
+
+def test_split_batches_balances_sizes():
+    """
+    Test that symbols are split into the fewest, evenly sized batches.
+    """
+    batches = split_batches([str(i) for i in range(250)], batch_size=100)
+
+    assert [len(batch) for batch in batches] == [84, 84, 82]
+    assert split_batches([], batch_size=100) == []
+
+
+def test_get_stock_prices_batches_requests(mocker, api_key):
+    """
+    Test that 500 symbols are priced in a handful of requests.
+    """
+    client = mocker.Mock()
+    client.get_json.side_effect = quote_batch
+    mocker.patch("classes.stock_price.get_fmp_client", return_value=client)
+    symbols = [f"S{i}" for i in range(500)]
+
+    prices = get_stock_prices(symbols, api_key)
+
+    assert len(prices) == 500
+    assert client.get_json.call_count == 5
+
+
+def test_get_stock_prices_uses_and_fills_cache(mocker, api_key):
+    """
+    Test that cached quotes are not re-fetched and batch results feed single lookups.
+    """
+    client = mocker.Mock()
+    client.get_json.side_effect = quote_batch
+    mocker.patch("classes.stock_price.get_fmp_client", return_value=client)
+
+    get_stock_prices(["aapl", "MSFT", "AAPL", "NOPE"], api_key)
+    client.get_json.assert_called_once_with(
+        "quote-order/AAPL,MSFT,NOPE", api_key, priority=1, fields=QUOTE_FIELDS
+    )
+
+    prices = get_stock_prices(["AAPL", "MSFT"], api_key)
+    assert set(prices) == {"AAPL", "MSFT"}
+    assert get_stock_price("MSFT", api_key).symbol == "MSFT"
+    assert client.get_json.call_count == 1
+
+
+def test_aget_stock_prices(mocker, api_key):
+    """
+    Test that the async variant returns the same dictionary of quotes.
+    """
+    async def get_json(path, api_key, params=None, priority=None, fields=None):
+        return quote_batch(path, api_key)
+
+    client = mocker.Mock()
+    client.get_json = get_json
+    mocker.patch("classes.stock_price.get_async_fmp_client", return_value=client)
+
+    prices = asyncio.run(aget_stock_prices(["AAPL", "MSFT", "NOPE"], api_key, batch_size=2))
+
+    assert set(prices) == {"AAPL", "MSFT"}
+    assert prices["AAPL"].price == 100.0
@@ -0,0 +1,105 @@
+"""
+Unit tests for streaming answers out of the graph.
+"""
+
+import asyncio
+import pytest
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from chains.route_chain import RouterResult
+from graph.work_flow import create_workflow
+from methods.fast_router import FastRouter
+from methods.streaming import AnswerStream, streaming_from_env
+
+CONFIG = {"configurable": {"user_id": "test_user", "thread_id": "1", "fmp_api_key": "test_key"}}
+
+
+@pytest.fixture
+def graph_for(mocker):
+    """
+    Builds the graph around a streaming fake chat model, with the given route and mocked data nodes.
+    """
+    mocker.patch("graph.nodes.router_node.get_fast_router", return_value=FastRouter(enabled=False))
+    mocker.patch("graph.nodes.extraction_node.create_extraction_chain").return_value.invoke.return_value.symbol = "UNKNOWN"
+    mocker.patch("graph.work_flow.create_summarization_node", return_value=lambda state: {})
+
+    def income_statement_node(state, config):
+        return {"income_statement": "## Income Statement"}
+
+    def company_financials_node(state, config):
+        return {"company_financials": "## Company Overview"}
+
+    def stock_price_node(state, config):
+        return {"stock_price": "## Stock Price Information"}
+
+    mocker.patch("graph.work_flow.get_income_statement_node", income_statement_node)
+    mocker.patch("graph.work_flow.get_company_financials_node", company_financials_node)
+    mocker.patch("graph.work_flow.get_stock_price_node", stock_price_node)
+
+    def graph_for(route: str):
+        route_chain = mocker.Mock()
+        route_chain.invoke.return_value = RouterResult(route=route)
+        mocker.patch("graph.nodes.router_node.create_route_chain", return_value=route_chain)
+        llm = GenericFakeChatModel(messages=iter([AIMessage(content="Tech stocks are volatile right now.")]))
+        return create_workflow(llm, combined_routing=False)
+
+    return graph_for
+
+
+def test_chat_tokens_are_streamed(graph_for):
+    """
+    Test that the chat response arrives token by token and the final answer is kept.
+    """
+    stream = AnswerStream(graph_for("chat"), {"request": "What do you think of tech?"}, CONFIG)
+
+    pieces = list(stream)
+
+    assert len(pieces) > 3
+    assert "".join(pieces) == "Tech stocks are volatile right now."
+    assert stream.final_answer == "Tech stocks are volatile right now."
+
+
+def test_report_sections_are_streamed(graph_for):
+    """
+    Test that report sections are yielded as their nodes return, without repeating the final answer.
+    """
+    stream = AnswerStream(graph_for("report"), {"request": "Report on AAPL"}, CONFIG)
+
+    pieces = list(stream)
+
+    assert sorted(pieces) == ["## Company Overview", "## Income Statement", "## Stock Price Information"]
+    assert stream.final_answer.startswith("# Report for (AAPL)")
+
+
+def test_unstreamed_answer_is_yielded_whole(graph_for):
+    """
+    Test that an answer nothing was streamed for, such as an unknown symbol, is yielded at the end.
+    """
+    stream = AnswerStream(graph_for("stock_price"), {"request": "Price of the thing?"}, CONFIG)
+
+    pieces = list(stream)
+
+    assert pieces == [stream.final_answer]
+    assert "Unknown Symbol" in stream.final_answer
+
+
+def test_astream(graph_for):
+    """
+    Test that async iteration streams the same answer.
+    """
+    stream = AnswerStream(graph_for("chat"), {"request": "What do you think of tech?"}, CONFIG)
+
+    async def collect():
+        return [piece async for piece in stream]
+
+    assert "".join(asyncio.run(collect())) == "Tech stocks are volatile right now."
+
+
+def test_streaming_from_env(monkeypatch):
+    """
+    Test that STREAM_RESPONSES=0 turns streaming off.
+    """
+    monkeypatch.delenv("STREAM_RESPONSES", raising=False)
+    assert streaming_from_env()
+    monkeypatch.setenv("STREAM_RESPONSES", "0")
+    assert not streaming_from_env()
@@ -6,6 +6,7 @@ import pytest
 from graph.state.graph_state import GraphState
 from graph.nodes.summarization_node import create_summarization_node
 from chains.summarization_chain import SummarizationResult
+from methods.summary_policy import SummaryPolicy
 
 
 @pytest.fixture
@@ -88,7 +89,7 @@ def test_summarization_node_execution(mocker, mock_llm, memory_manager, test_sta
     mocker.patch('graph.nodes.summarization_node.create_summarization_chain', return_value=mock_summarization_chain)
 
     # Create the node
-    node = create_summarization_node(mock_llm)
+    node = create_summarization_node(mock_llm, policy=SummaryPolicy(every_n_turns=1))
 
     # Execute the node
     result = node(test_state, test_config, mock_store)
@@ -121,7 +122,7 @@ def test_summarization_node_without_symbol(mocker, mock_llm, memory_manager, tes
     mocker.patch('graph.nodes.summarization_node.create_summarization_chain', return_value=mock_summarization_chain)
 
     # Create the node
-    node = create_summarization_node(mock_llm)
+    node = create_summarization_node(mock_llm, policy=SummaryPolicy(every_n_turns=1))
 
     # Execute the node
     result = node(state_without_symbol, test_config, mock_store)
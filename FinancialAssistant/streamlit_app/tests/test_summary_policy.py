@@ -0,0 +1,212 @@
+"""
+Unit tests for the budget-aware conversation summary policy.
+"""
+
+import pytest
+from chains.chat_chain import ChatResult
+from chains.summarization_chain import SummarizationResult
+from graph.nodes.chat_node import create_chat_node
+from graph.nodes.summarization_node import create_summarization_node
+from methods.memory_manager import MemoryManager
+from methods.summary_policy import SummaryPolicy, compress_answer, estimate_tokens
+
+CONFIG = {"configurable": {"user_id": "test_user"}}
+REPORT = """
+    # Report for (AAPL)
+
+      ## Company Overview
+      - **Name**: Apple Inc.
+      - **Symbol**: AAPL
+      - **Website**: [https://www.apple.com](https://www.apple.com)
+
+    ## Income Statement (as of 2023-09-30)
+    - **Revenue**: $ 383285000000.00
+    - **Net Income**: $ 96995000000.00
+
+      ## Stock Price Information
+    - **Current Price**: $ 222.50
+    - **PE Ratio**:  33.87
+"""
+
+
+@pytest.fixture
+def chain(mocker):
+    """
+    Replaces the summarization chain with a mock numbering its summaries.
+    """
+    chain = mocker.Mock()
+    chain.invoke.side_effect = lambda inputs: SummarizationResult(summary=f"summary {chain.invoke.call_count}")
+    mocker.patch("graph.nodes.summarization_node.create_summarization_chain", return_value=chain)
+    return chain
+
+
+def test_compress_answer_turns_report_bullets_into_facts():
+    """
+    Test that a report becomes one line of facts per section, without markdown or links.
+    """
+    compressed = compress_answer(REPORT)
+
+    assert compressed.splitlines() == [
+        "Company Overview: Name Apple Inc.; Symbol AAPL; Website https://www.apple.com",
+        "Income Statement (as of 2023-09-30): Revenue $383285000000.00; Net Income $96995000000.00",
+        "Stock Price Information: Current Price $222.50; PE Ratio 33.87",
+    ]
+    assert len(compressed) < len(REPORT) * 0.6
+
+
+def test_compress_answer_cuts_at_a_boundary():
+    """
+    Test that long answers are cut between facts, and prose between sentences.
+    """
+    assert compress_answer(REPORT, max_chars=60) == "Company Overview: Name Apple Inc.; Symbol AAPL;…"
+    assert compress_answer("Tech is volatile. Rates matter. Earnings matter most.", max_chars=40) == (
+        "Tech is volatile. Rates matter.…"
+    )
+    assert compress_answer("Short answer.", max_chars=40) == "Short answer."
+
+
+def test_turns_are_due_every_n_turns():
+    """
+    Test that turns are due once N of them are unclaimed, and that claimed turns do not count.
+    """
+    policy = SummaryPolicy(every_n_turns=3, token_budget=10000)
+
+    assert [policy.add_turn("user1", f"turn {i}") for i in range(3)] == [False, False, True]
+    assert policy.add_turn("user2", "turn 0") is False
+    claim, turns = policy.claim("user1")
+    assert turns == ["turn 0", "turn 1", "turn 2"]
+    assert policy.add_turn("user1", "turn 3") is False
+    assert policy.pending("user1") == ["turn 0", "turn 1", "turn 2", "turn 3"]
+
+    policy.mark_summarized("user1", claim)
+
+    assert policy.pending("user1") == ["turn 3"]
+    assert policy.claim("user1")[1] == ["turn 3"]
+
+
+def test_released_turns_go_to_the_next_claim():
+    """
+    Test that the turns of a failed summary are claimed again, before newer ones, even after a later claim.
+    """
+    policy = SummaryPolicy(every_n_turns=1)
+    policy.add_turn("user1", "turn 0")
+    failed, _ = policy.claim("user1")
+    policy.add_turn("user1", "turn 1")
+    later, _ = policy.claim("user1")
+
+    policy.release("user1", failed)
+    policy.mark_summarized("user1", later)
+
+    assert policy.pending("user1") == ["turn 0"]
+    assert policy.add_turn("user1", "turn 2") is True
+    assert policy.claim("user1")[1] == ["turn 0", "turn 2"]
+
+
+def test_turns_are_due_when_over_the_token_budget():
+    """
+    Test that a long turn makes the turns due before N turns are collected.
+    """
+    policy = SummaryPolicy(every_n_turns=5, token_budget=100)
+
+    assert policy.add_turn("user1", "short turn") is False
+    assert policy.add_turn("user1", "x" * 400) is True
+    assert estimate_tokens("x" * 400) == 100
+
+
+def test_cap_summary():
+    """
+    Test that the stored summary is cut to the token cap at a sentence boundary.
+    """
+    policy = SummaryPolicy(max_summary_tokens=11)
+
+    assert policy.cap_summary("User asked about AAPL. Then about MSFT. Then NVDA.") == (
+        "User asked about AAPL. Then about MSFT.…"
+    )
+    assert policy.cap_summary("Short.") == "Short."
+    assert policy.max_summary_words == 6
+
+
+def test_context_includes_unsummarized_turns():
+    """
+    Test that the context is the summary followed by the turns it does not cover yet.
+    """
+    policy = SummaryPolicy(every_n_turns=3)
+
+    assert policy.context("user1", None) == ""
+    assert policy.context("user1", "Old summary") == "Old summary"
+    policy.add_turn("user1", "User: AAPL price\n")
+
+    assert policy.context("user1", "Old summary") == (
+        "Old summary\n\nRecent turns, not yet summarized:\nUser: AAPL price\n"
+    )
+    assert policy.context("user1", None) == "Recent turns, not yet summarized:\nUser: AAPL price\n"
+
+
+def test_node_summarizes_every_n_turns(chain):
+    """
+    Test that the node summarizes once per N turns, with all of them and the report compressed.
+    """
+    policy = SummaryPolicy(every_n_turns=3, token_budget=10000)
+    store = MemoryManager()
+    node = create_summarization_node(None, policy=policy)
+
+    node({"request": "AAPL report", "request_category": "report", "symbol": "AAPL", "final_answer": REPORT},
+         CONFIG, store)
+    node({"request": "MSFT price", "request_category": "stock_price", "symbol": "MSFT", "final_answer": "$410"},
+         CONFIG, store)
+
+    chain.invoke.assert_not_called()
+    assert store.get_conversation_summary("test_user") is None
+    assert store.get_last_symbol("test_user") == "MSFT"
+
+    node({"request": "Thoughts on tech?", "request_category": "chat", "final_answer": "Tech is volatile."},
+         CONFIG, store)
+
+    chain.invoke.assert_called_once()
+    conversation = chain.invoke.call_args[0][0]["conversation"]
+    assert "User: AAPL report" in conversation and "User: Thoughts on tech?" in conversation
+    assert "Stock Price Information: Current Price $222.50; PE Ratio 33.87" in conversation
+    assert "**" not in conversation
+    assert store.get_conversation_summary("test_user") == "summary 1"
+    assert policy.pending("test_user") == []
+
+
+def test_failed_summary_keeps_its_turns_for_the_next_one(chain):
+    """
+    Test that when the chain raises, the turns stay in the context and reach the next summary.
+    """
+    chain.invoke.side_effect = [RuntimeError("LLM unavailable"), SummarizationResult(summary="AAPL then MSFT")]
+    policy = SummaryPolicy(every_n_turns=1)
+    store = MemoryManager()
+    node = create_summarization_node(None, policy=policy)
+
+    node({"request": "AAPL price", "final_answer": "$222"}, CONFIG, store)
+
+    assert store.get_conversation_summary("test_user") is None
+    assert "User: AAPL price" in policy.context("test_user", None)
+
+    node({"request": "MSFT price", "final_answer": "$410"}, CONFIG, store)
+
+    conversation = chain.invoke.call_args[0][0]["conversation"]
+    assert conversation.index("User: AAPL price") < conversation.index("User: MSFT price")
+    assert store.get_conversation_summary("test_user") == "AAPL then MSFT"
+    assert policy.pending("test_user") == []
+
+
+def test_chat_node_sees_unsummarized_turns(mocker):
+    """
+    Test that the chat node passes the summary together with the turns not summarized yet.
+    """
+    chain = mocker.Mock()
+    chain.invoke.return_value = ChatResult(response="It is at $222.")
+    mocker.patch("graph.nodes.chat_node.create_chat_chain", return_value=chain)
+    policy = SummaryPolicy(every_n_turns=3)
+    mocker.patch("graph.nodes.chat_node.get_summary_policy", return_value=policy)
+    store = MemoryManager()
+    store.update_conversation_summary("test_user", "User follows Apple.")
+    policy.add_turn("test_user", "User: AAPL price\n")
+
+    create_chat_node(mocker.Mock())({"request": "Is that expensive?"}, CONFIG, store)
+
+    summary = chain.invoke.call_args[0][0]["conversation_summary"]
+    assert summary.startswith("User follows Apple.") and "User: AAPL price" in summary
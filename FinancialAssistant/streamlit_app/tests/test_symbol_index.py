@@ -0,0 +1,142 @@
+"""
+Unit tests for the local ticker and company-name resolver.
+"""
+
+import pytest
+from graph.nodes.extraction_node import create_symbol_extraction_node
+from methods.memory_manager import MemoryManager
+from consts.consts import SYMBOL_LIST_PATH
+from methods.symbol_index import APP_DIR, SymbolIndex, normalize_name
+
+SYMBOLS = """symbol,name,aliases
+AAPL,Apple Inc.,
+MSFT,Microsoft Corporation,
+GOOGL,Alphabet Inc.,Google
+GOOG,Alphabet Inc.,
+GM,General Motors Company,
+GIS,"General Mills, Inc.",
+PG,The Procter & Gamble Company,P&G
+APLE,"Apple Hospitality REIT, Inc."
+"""
+
+
+@pytest.fixture
+def index(tmp_path):
+    """
+    Creates an index over a small symbol list.
+    """
+    path = tmp_path / "symbols.csv"
+    path.write_text(SYMBOLS)
+    return SymbolIndex(str(path))
+
+
+def test_normalize_name():
+    """
+    Test that punctuation, accents and corporate suffixes are removed.
+    """
+    assert normalize_name("The Procter & Gamble Company") == "procter and gamble"
+    assert normalize_name("BP p.l.c.") == "bp"
+    assert normalize_name("The Estée Lauder Companies Inc.") == "estee lauder"
+
+
+@pytest.mark.parametrize("request_text, symbol", [
+    ("AAPL stock price", "AAPL"),
+    ("$msft quote", "MSFT"),
+    ("What's the income statement of Apple?", "AAPL"),
+    ("Apple's stock price", "AAPL"),
+    ("Show me the latest price for General Motors", "GM"),
+    ("What are the financials for Google?", "GOOGL"),
+    ("How has Alphabet performed?", "GOOGL"),
+    ("How has Microsft done this year?", "MSFT"),
+    ("P&G revenue", "PG"),
+])
+def test_resolves_tickers_names_and_typos(index, request_text, symbol):
+    """
+    Test exact tickers, names, aliases, the first listed of duplicate names and misspellings.
+    """
+    assert index.resolve(request_text) == symbol
+
+
+@pytest.mark.parametrize("request_text", [
+    "What is the stock price?",
+    "What about their income statement?",
+    "Compare Apple and Microsoft",
+    "General stock price",
+    "What is the EPS?",
+    None,
+])
+def test_leaves_unclear_requests_to_the_llm(index, request_text):
+    """
+    Test that requests naming no company, several companies or an ambiguous name are not resolved.
+    """
+    assert index.resolve(request_text) is None
+
+
+@pytest.mark.parametrize("request_text", [
+    "What is the price of gold?",
+    "home prices",
+    "health care stocks",
+    "best mobile plans",
+    "How is the S&P 500 doing?",
+    "WHAT IS THE PRICE NOW",
+    "Is it a good time to buy now?",
+])
+def test_common_words_are_not_companies(request_text):
+    """
+    Test that everyday and finance words sharing a word with a listed company do not resolve to it.
+    """
+    assert SymbolIndex(str(APP_DIR / SYMBOL_LIST_PATH)).resolve(request_text) is None
+
+
+@pytest.mark.parametrize("request_text, symbol", [
+    ("Home Depot revenue", "HD"),
+    ("CVS Health stock price", "CVS"),
+    ("T-Mobile price", "TMUS"),
+    ("What is NOW trading at?", "NOW"),
+    ("Goldman stock price", "GS"),
+    ("How has Netflx done?", "NFLX"),
+])
+def test_bundled_list_resolves_full_names(request_text, symbol):
+    """
+    Test that the bundled list still resolves the companies behind those words when they are named.
+    """
+    assert SymbolIndex(str(APP_DIR / SYMBOL_LIST_PATH)).resolve(request_text) == symbol
+
+
+def test_index_loads_lazily(index):
+    """
+    Test that the symbol list is only read on the first lookup.
+    """
+    assert index.symbols == []
+    assert index.lookup_ticker("aapl") == "AAPL"
+    assert len(index) == 8
+    assert index.lookup_name("apple") == {"AAPL"}
+    assert index.lookup_name("general") == {"GM", "GIS"}
+    assert index.lookup_name("general", prefix=False) == set()
+
+
+def test_stats_count_outcomes(index):
+    """
+    Test that resolved, ambiguous and unresolved requests are counted.
+    """
+    index.resolve("AAPL price")
+    index.resolve("Apple or Microsoft?")
+    index.resolve("What is the stock price?")
+    assert index.stats() == {"resolved": 1, "ambiguous": 1, "unresolved": 1, "resolved_fraction": pytest.approx(1 / 3)}
+
+
+def test_extraction_node_skips_llm_for_known_company(mocker, index):
+    """
+    Test that the extraction chain is only invoked when the index cannot resolve the request.
+    """
+    chain = mocker.Mock()
+    mocker.patch("graph.nodes.extraction_node.create_extraction_chain", return_value=chain)
+    mocker.patch("graph.nodes.extraction_node.get_symbol_index", return_value=index)
+    node = create_symbol_extraction_node(mocker.Mock())
+    config = {"configurable": {"user_id": "test_user"}}
+
+    assert node({"request": "Apple's income statement"}, config, MemoryManager()) == {"symbol": "AAPL"}
+    chain.invoke.assert_not_called()
+    chain.invoke.return_value.symbol = "TSLA"
+    assert node({"request": "What about the carmaker Elon runs?"}, config, MemoryManager()) == {"symbol": "TSLA"}
+    chain.invoke.assert_called_once()
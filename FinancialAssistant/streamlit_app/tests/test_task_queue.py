@@ -0,0 +1,99 @@
+"""
+Unit tests for the per-key background task queue and background summarization.
+"""
+
+import threading
+import time
+from chains.summarization_chain import SummarizationResult
+from graph.nodes.summarization_node import create_summarization_node
+from methods.memory_manager import MemoryManager
+from methods.summary_policy import SummaryPolicy
+from methods.task_queue import KeyedTaskQueue
+
+CONFIG = {"configurable": {"user_id": "test_user"}}
+
+
+def test_tasks_of_a_key_run_in_order():
+    """
+    Test that tasks under one key never overlap and run in submission order.
+    """
+    queue = KeyedTaskQueue(workers=4)
+    order, running = [], []
+
+    def task(i):
+        def run():
+            running.append(i)
+            assert len(running) == 1
+            time.sleep(0.002)
+            order.append(i)
+            running.remove(i)
+        return run
+
+    for i in range(20):
+        queue.submit("user1", task(i))
+
+    assert queue.wait("user1", timeout=5)
+    assert order == list(range(20))
+    assert queue.stats() == {"submitted": 20, "completed": 20, "failed": 0, "pending": 0}
+
+
+def test_keys_run_in_parallel():
+    """
+    Test that a slow task of one user does not hold up another user's tasks.
+    """
+    queue = KeyedTaskQueue(workers=2)
+    release = threading.Event()
+    done = threading.Event()
+
+    queue.submit("user1", release.wait)
+    queue.submit("user2", done.set)
+
+    assert done.wait(timeout=5)
+    assert queue.pending("user1") == 1
+    release.set()
+    assert queue.wait(timeout=5)
+
+
+def test_failed_task_does_not_stop_the_queue():
+    """
+    Test that a failing task is counted and the next task of the key still runs.
+    """
+    queue = KeyedTaskQueue(workers=0)
+    results = []
+
+    queue.submit("user1", lambda: 1 / 0)
+    queue.submit("user1", lambda: results.append("ran"))
+
+    assert results == ["ran"]
+    assert queue.stats()["failed"] == 1
+    assert queue.stats()["completed"] == 1
+
+
+def test_summarization_runs_after_the_node_returns(mocker):
+    """
+    Test that the node returns before the summary is written, and that turns are summarized in order.
+    """
+    release = threading.Event()
+    seen = []
+
+    def summarize(inputs):
+        release.wait(timeout=5)
+        seen.append(inputs["existing_summary"])
+        return SummarizationResult(summary=f"summary {len(seen)}")
+
+    chain = mocker.Mock()
+    chain.invoke.side_effect = summarize
+    mocker.patch("graph.nodes.summarization_node.create_summarization_chain", return_value=chain)
+    queue = KeyedTaskQueue(workers=2)
+    store = MemoryManager()
+    node = create_summarization_node(mocker.Mock(), queue, SummaryPolicy(every_n_turns=1))
+
+    node({"request": "AAPL price", "final_answer": "$222", "symbol": "AAPL"}, CONFIG, store)
+    node({"request": "MSFT price", "final_answer": "$410", "symbol": "MSFT"}, CONFIG, store)
+
+    assert store.get_conversation_summary("test_user") is None
+    assert store.get_last_symbol("test_user") == "MSFT"
+    release.set()
+    assert queue.wait("test_user", timeout=5)
+    assert seen == ["No previous summary available.", "summary 1"]
+    assert store.get_conversation_summary("test_user") == "summary 2"
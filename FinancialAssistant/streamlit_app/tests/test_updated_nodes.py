@@ -11,6 +11,7 @@ from chains.route_chain import RouterResult
 from chains.extraction_chain import Extraction
 from chains.chat_chain import ChatResult
 from consts.consts import UNKNOWN
+from methods.fast_router import FastRouter
 
 
 @pytest.fixture
@@ -69,8 +70,9 @@ def test_router_node_with_summary(mocker, mock_llm, memory_manager, test_state_w
     """
     Test that the router node uses the conversation summary.
     """
-    # Patch the create_route_chain function
+    # Patch the create_route_chain function and send every request to it
     mocker.patch('graph.nodes.router_node.create_route_chain', return_value=mock_route_chain)
+    mocker.patch('graph.nodes.router_node.get_fast_router', return_value=FastRouter(enabled=False))
 
     # Create the node
     node = create_get_route_node(mock_llm)
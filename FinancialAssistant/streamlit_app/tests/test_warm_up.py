@@ -0,0 +1,131 @@
+"""
+Unit tests for the startup warm-up.
+"""
+
+import sqlite3
+import pytest
+import requests
+from pydantic import SecretStr
+from methods import warm_up
+from methods.warm_up import load_watchlist, warm_fmp_cache, warm_up_connections
+from classes.stock_price import get_stock_price
+from classes.company_financials import get_company_financials
+from classes.price_history import get_stored_indicators
+from methods.price_store import PriceStore
+
+QUOTE = {
+    "symbol": "AAPL", "price": 222.5, "volume": 35396922, "priceAvg50": 223.07,
+    "priceAvg200": 195.38, "eps": 6.57, "pe": 33.87,
+    "earningsAnnouncement": "2024-10-31T00:00:00.000+0000",
+}
+PROFILE = {
+    "symbol": "AAPL", "companyName": "Apple Inc.", "mktCap": 3382912250000,
+    "industry": "Consumer Electronics", "sector": "Technology",
+    "website": "https://www.apple.com", "beta": 1.24, "price": 222.5,
+}
+INCOME_STATEMENT = {
+    "date": "2023-09-30", "revenue": 383285000000, "grossProfit": 169148000000,
+    "netIncome": 96995000000, "ebitda": 125820000000, "eps": 6.16, "epsdiluted": 6.13,
+}
+BARS = [
+    {"date": f"2024-10-{day:02d}", "open": 220.0, "high": 224.0, "low": 219.0, "close": 220.0 + day, "volume": 4e7}
+    for day in range(18, 0, -1)
+]
+
+
+@pytest.fixture
+def client(mocker, tmp_path):
+    """
+    Replaces the shared FMP client with one that answers every endpoint for any symbol,
+    and the price store with an empty one.
+    """
+    def get_json(path, api_key, params=None, priority=None, fields=None):
+        endpoint, symbols = path.split("/", 1)
+        if endpoint == "historical-price-full":
+            return {"symbol": symbols, "historical": BARS}
+        rows = {"quote-order": QUOTE, "profile": PROFILE, "income-statement": INCOME_STATEMENT}[endpoint]
+        return [dict(rows, symbol=symbol) for symbol in symbols.split(",")]
+
+    client = mocker.Mock()
+    client.get_json.side_effect = get_json
+    for module in ("classes.stock_price", "classes.income_statement", "classes.company_financials",
+                   "classes.price_history", "methods.warm_up"):
+        mocker.patch(f"{module}.get_fmp_client", return_value=client)
+    store = PriceStore(str(tmp_path))
+    for module in ("classes.price_history", "methods.warm_up"):
+        mocker.patch(f"{module}.get_price_store", return_value=store)
+    return client
+
+
+def test_load_watchlist_from_env(monkeypatch):
+    """
+    Test that the environment watchlist is normalized and de-duplicated.
+    """
+    monkeypatch.delenv("FMP_WATCHLIST_FILE", raising=False)
+    monkeypatch.setenv("FMP_WATCHLIST", "aapl, MSFT,,AAPL ")
+
+    assert load_watchlist() == ["AAPL", "MSFT"]
+
+
+def test_load_watchlist_from_file(tmp_path, monkeypatch):
+    """
+    Test that the watchlist file takes one symbol per line and ignores comments.
+    """
+    path = tmp_path / "watchlist.txt"
+    path.write_text("# mega caps\naapl\nmsft  # software\n\nnvda,tsla\n")
+    monkeypatch.setenv("FMP_WATCHLIST_FILE", str(path))
+
+    assert load_watchlist() == ["AAPL", "MSFT", "NVDA", "TSLA"]
+    assert load_watchlist(str(tmp_path / "missing.txt")) == []
+
+
+def test_warm_fmp_cache_serves_first_requests(client):
+    """
+    Test that warmed symbols are answered from the cache, fetched at background priority.
+    """
+    counts = warm_fmp_cache(["AAPL", "MSFT"], SecretStr("test_key"))
+    calls = client.get_json.call_count
+
+    assert counts == {"quotes": 2, "profiles": 2, "income_statements": 2, "price_histories": 2}
+    assert {call.kwargs["priority"] for call in client.get_json.call_args_list} == {2}
+    assert get_stock_price("MSFT", SecretStr("test_key")).symbol == "MSFT"
+    assert get_company_financials("AAPL", SecretStr("test_key")).companyName == "Apple Inc."
+    assert get_stored_indicators("MSFT")["close"] == 238.0
+    assert client.get_json.call_count == calls
+
+
+def test_warm_up_connections_ignores_failures(client):
+    """
+    Test that an unreachable FMP does not break startup.
+    """
+    client.warm_up.side_effect = requests.ConnectionError()
+
+    warm_up_connections()
+
+    client.warm_up.assert_called_once()
+
+
+def test_failing_symbol_does_not_stop_the_warm_up(client, mocker):
+    """
+    Test that a symbol whose data cannot be loaded is skipped and the others are still warmed.
+    """
+    get_json = client.get_json.side_effect
+
+    def fail_for_msft(path, api_key, params=None, priority=None, fields=None):
+        if path.endswith("/MSFT") and not path.startswith("historical-price-full"):
+            raise sqlite3.OperationalError("database is locked")
+        return get_json(path, api_key, params, priority, fields)
+
+    def refresh(symbol, fetch):
+        if symbol == "MSFT":
+            raise OSError("disk full")
+        return store_refresh(symbol, fetch)
+
+    client.get_json.side_effect = fail_for_msft
+    store = warm_up.get_price_store()
+    store_refresh = store.refresh
+    mocker.patch.object(store, "refresh", side_effect=refresh)
+
+    counts = warm_fmp_cache(["AAPL", "MSFT"], SecretStr("test_key"))
+
+    assert counts == {"quotes": 2, "profiles": 1, "income_statements": 1, "price_histories": 1}
@@ -1,6 +1,8 @@
 from pydantic import BaseModel, Field
 import requests
 from typing import Union
+from methods.consts import FMP_ENDPOINT_PROFILE
+from methods.fmp_client import get_fmp_client
 
 class CompanyFinancials(BaseModel):
     """
@@ -20,12 +22,10 @@ def get_company_financials(symbol, api_key: str) -> Union[CompanyFinancials, Non
     Fetch basic financial information for the given company symbol such as the industry, the sector, the name of the company, and the market capitalization.
     """
     try:
-      url = f"https://financialmodelingprep.com/api/v3/profile/{symbol}?apikey={api_key}"
-      response = requests.get(url)
-      data = response.json()
+      data = get_fmp_client().get_json(f"{FMP_ENDPOINT_PROFILE}/{symbol}", api_key)
       financials = CompanyFinancials(**data[0])
       return financials
-    except (IndexError, KeyError):
+    except (IndexError, KeyError, requests.RequestException):
         print ("Error:",f"Could not fetch financials for symbol: {symbol}")
         return None
 
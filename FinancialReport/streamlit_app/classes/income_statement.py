@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from datetime import date
 import requests
 from typing import Union
+from methods.consts import FMP_ENDPOINT_INCOME_STATEMENT
+from methods.fmp_client import get_fmp_client
 class IncomeStatement(BaseModel):
     date_field: date = Field(alias='date', description="The date of the income statement")
     revenue:float = Field(description="The revenue of the company")
@@ -17,12 +19,10 @@ def get_income_statement(symbol:str, api_key: str) -> Union[IncomeStatement, Non
     Fetch last income statement for the given company symbol such as revenue, gross profit, net income, EBITDA, EPS.
     """
     try:
-      url = f"https://financialmodelingprep.com/api/v3/income-statement/{symbol}?period=annual&apikey={api_key}"
-      response = requests.get(url)
-      data = response.json()
+      data = get_fmp_client().get_json(f"{FMP_ENDPOINT_INCOME_STATEMENT}/{symbol}", api_key, params={"period": "annual"})
       financials = IncomeStatement(**data[0])
       return financials
-    except (IndexError, KeyError):
+    except (IndexError, KeyError, requests.RequestException):
         print ("Error:",f"Could not fetch financials for symbol: {symbol}")
         return None
 
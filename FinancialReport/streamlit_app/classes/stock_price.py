@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 import requests
 from datetime import datetime
 from typing import Union
+from methods.consts import FMP_ENDPOINT_QUOTE
+from methods.fmp_client import get_fmp_client
 
 class StockPrice(BaseModel):
     symbol:str = Field(description="The symbol of the company")
@@ -18,12 +20,10 @@ def get_stock_price(symbol:str, api_key: str) -> Union[StockPrice, None]:
     Fetch the current stock price for the given symbol, the current volume, the average price 50d and 200d, EPS, PE and the next earnings Announcement.
     """
     try:
-      url = f"https://financialmodelingprep.com/api/v3/quote-order/{symbol}?apikey={api_key}"
-      response = requests.get(url)
-      data = response.json()
+      data = get_fmp_client().get_json(f"{FMP_ENDPOINT_QUOTE}/{symbol}", api_key)
       stock_price = StockPrice(**data[0])
       return stock_price
-    except (IndexError, KeyError):
+    except (IndexError, KeyError, requests.RequestException):
         print ("Error:",f"Could not fetch price for symbol: {symbol}")
         return None
 
@@ -15,6 +15,17 @@ MODEL_GROQ = "mixtral-8x7b-32768"
 MODEL_OPENAI = "gpt-4o-mini"
 MODEL_ANTHROPIC = "claude-3-sonnet-20240229"
 
+# Financial Modeling Prep API
+FMP_BASE_URL = "https://financialmodelingprep.com/api/v3"
+FMP_ENDPOINT_PROFILE = "profile"
+FMP_ENDPOINT_INCOME_STATEMENT = "income-statement"
+FMP_ENDPOINT_QUOTE = "quote-order"
+FMP_CONNECT_TIMEOUT = 3.05  # seconds
+FMP_READ_TIMEOUT = 10.0  # seconds
+FMP_MAX_RETRIES = 2
+FMP_RETRY_BACKOFF = 0.3  # seconds, doubled on every retry
+FMP_POOL_MAXSIZE = 20  # connections kept alive per host
+
 # Node names
 NODE_EXTRACTION = 'Extraction'
 NODE_STOCK_PRICE = 'StockPrice'
@@ -0,0 +1,117 @@
+"""
+Pooled HTTP client for the Financial Modeling Prep (FMP) API.
+
+All FMP fetchers share a single requests.Session so that connections are kept
+alive and reused instead of paying a new TCP+TLS handshake on every call.
+Timeouts, retries and the per-host connection limit can be tuned through
+environment variables (see FMPClient.from_env).
+"""
+
+import os
+import threading
+from typing import Any, Optional
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from methods.consts import (
+    FMP_BASE_URL, FMP_CONNECT_TIMEOUT, FMP_READ_TIMEOUT,
+    FMP_MAX_RETRIES, FMP_RETRY_BACKOFF, FMP_POOL_MAXSIZE
+)
+
+
+class FMPClient:
+    """
+    Thread-safe FMP client backed by a pooled keep-alive session.
+
+    Args:
+        base_url: Root URL of the FMP API
+        connect_timeout: Seconds to wait for a connection to be established
+        read_timeout: Seconds to wait for the server to send a response
+        max_retries: Retries for connection errors and 5xx responses
+        retry_backoff: Backoff factor between retries
+        pool_maxsize: Maximum number of connections kept open per host
+    """
+
+    def __init__(
+        self,
+        base_url: str = FMP_BASE_URL,
+        connect_timeout: float = FMP_CONNECT_TIMEOUT,
+        read_timeout: float = FMP_READ_TIMEOUT,
+        max_retries: int = FMP_MAX_RETRIES,
+        retry_backoff: float = FMP_RETRY_BACKOFF,
+        pool_maxsize: int = FMP_POOL_MAXSIZE,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.timeout = (connect_timeout, read_timeout)
+
+        retry = Retry(
+            total=max_retries,
+            backoff_factor=retry_backoff,
+            status_forcelist=(500, 502, 503, 504),
+            allowed_methods=frozenset(["GET"]),
+            raise_on_status=False,
+        )
+        # pool_block turns pool_maxsize into a hard per-host connection limit
+        adapter = HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=pool_maxsize,
+            pool_block=True,
+            max_retries=retry,
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @classmethod
+    def from_env(cls) -> "FMPClient":
+        """
+        Create a client, overriding the defaults with FMP_* environment variables.
+        """
+        return cls(
+            base_url=os.environ.get("FMP_BASE_URL", FMP_BASE_URL),
+            connect_timeout=float(os.environ.get("FMP_CONNECT_TIMEOUT", FMP_CONNECT_TIMEOUT)),
+            read_timeout=float(os.environ.get("FMP_READ_TIMEOUT", FMP_READ_TIMEOUT)),
+            max_retries=int(os.environ.get("FMP_MAX_RETRIES", FMP_MAX_RETRIES)),
+            retry_backoff=float(os.environ.get("FMP_RETRY_BACKOFF", FMP_RETRY_BACKOFF)),
+            pool_maxsize=int(os.environ.get("FMP_POOL_MAXSIZE", FMP_POOL_MAXSIZE)),
+        )
+
+    def get_json(self, path: str, api_key: str, params: Optional[dict[str, Any]] = None) -> Any:
+        """
+        Perform a GET request against the FMP API and return the decoded JSON.
+
+        Args:
+            path: Endpoint path relative to the base URL, e.g. "profile/AAPL"
+            api_key: The FMP API key
+            params: Additional query parameters
+
+        Returns:
+            The decoded JSON payload
+
+        Raises:
+            requests.RequestException: On connection errors, timeouts or invalid JSON
+        """
+        query = dict(params or {})
+        query["apikey"] = api_key
+        response = self.session.get(f"{self.base_url}/{path}", params=query, timeout=self.timeout)
+        return response.json()
+
+    def close(self) -> None:
+        """Close all pooled connections."""
+        self.session.close()
+
+
+_client: Optional[FMPClient] = None
+_client_lock = threading.Lock()
+
+
+def get_fmp_client() -> FMPClient:
+    """
+    Return the process-wide FMP client, creating it on first use.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = FMPClient.from_env()
+    return _client